@@ -0,0 +1,102 @@
+"""
+Micro-benchmark: per-keystroke cost of the app browser search, AppSearchIndex
+vs the previous filter (rebuild a casefolded haystack per app, substring test).
+
+    python -m benchmarks.app_search_bench [--apps 5000] [--repeat 20]
+
+Apps are synthetic DesktopApp stand-ins; queries are typed one character at
+a time, as the search entry sees them.
+"""
+
+import argparse
+import random
+import time
+from types import SimpleNamespace
+from typing import Callable, List
+
+from widgets.dockstation.core.application_browser.search_index import AppSearchIndex
+
+WORDS = (
+    "fire fox web browser text editor studio visual code terminal kitty "
+    "office writer calc image viewer music player video mail chat settings "
+    "system monitor files manager network sound audio disk backup game steam "
+    "photo paint draw note calendar clock weather map archive torrent remote"
+).split()
+
+QUERIES = ("firefox", "vsc", "terminal", "text ed", "steam", "zzz", "mus pl")
+
+
+def synthetic_apps(count: int, seed: int = 1) -> List[SimpleNamespace]:
+    rng = random.Random(seed)
+    apps = []
+    for i in range(count):
+        words = rng.sample(WORDS, rng.randint(1, 3))
+        name = " ".join(w.capitalize() for w in words)
+        apps.append(
+            SimpleNamespace(
+                display_name=name,
+                name=f"{name} {i}",
+                generic_name=" ".join(rng.sample(WORDS, 2)),
+                executable=f"{''.join(words)}{i}",
+            )
+        )
+    return apps
+
+
+def legacy_filter(apps: List[SimpleNamespace], query: str) -> List[int]:
+    q = query.strip().casefold()
+    matches = []
+    for index, app in enumerate(apps):
+        parts = []
+        for attr in ("display_name", "name", "generic_name", "executable"):
+            val = getattr(app, attr, None)
+            if val:
+                parts.append(str(val))
+        if q in " ".join(parts).casefold():
+            matches.append(index)
+    return matches
+
+
+def keystrokes(run: Callable[[str], object], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        for query in QUERIES:
+            for n in range(1, len(query) + 1):
+                start = time.perf_counter()
+                run(query[:n])
+                samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(label: str, samples: List[float]) -> None:
+    ordered = sorted(samples)
+    p50 = ordered[len(ordered) // 2] * 1000
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000
+    top = ordered[-1] * 1000
+    print(f"{label:10} p50 {p50:7.3f} ms   p99 {p99:7.3f} ms   max {top:7.3f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--apps", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    apps = synthetic_apps(args.apps)
+
+    start = time.perf_counter()
+    index = AppSearchIndex(apps)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"apps      : {len(apps)} (index built in {build_ms:.1f} ms)")
+
+    report("legacy", keystrokes(lambda q: legacy_filter(apps, q), args.repeat))
+    report("index", keystrokes(index.search, args.repeat))
+
+    for query in QUERIES:
+        ranked = index.search(query) or []
+        top = ", ".join(index.titles[i] for i in ranked[:3])
+        print(f"  {query!r:10} {len(ranked):5} matches  {top}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+Replay a Hyprland trace against the dock items, window title and workspaces
+widgets, and report handler CPU time and main-loop latency per consumer.
+
+    python -m benchmarks.hyprland_bench session.jsonl [--speed 0] [--json]
+        [--only dock,title,workspaces]
+
+The fake compositor from benchmarks.hyprland_trace stands in for Hyprland;
+GTK still needs a display (any session, or a headless/nested compositor).
+Widgets are built from the user config and packed into an offscreen window,
+so they are mapped and tick on a real frame clock.
+
+Latency is measured from the moment the fake server wrote an event to the
+moment the consumer's handler started ("wait") and returned ("done").
+"""
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+
+from benchmarks.hyprland_trace import FakeHyprland
+
+# wait this long after the last event for coalesced handlers to drain
+DRAIN_MS = 300
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        index = min(len(ordered) - 1, int(q * len(ordered)))
+        return round(ordered[index] * 1000, 3)
+
+    return {
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": round(ordered[-1] * 1000, 3),
+    }
+
+
+class Probe:
+    """Per-consumer CPU time and event latency, fed by patched hub internals"""
+
+    def __init__(self, server: FakeHyprland) -> None:
+        self.server = server
+        self.seq_of: Dict[int, int] = {}
+        self.received = 0
+        self.last_activity = time.monotonic()
+        self.consumers: Dict[str, Dict[str, Any]] = {}
+
+    def consumer(self, name: str) -> Dict[str, Any]:
+        entry = self.consumers.get(name)
+        if entry is None:
+            entry = self.consumers[name] = {
+                "events": 0,
+                "runs": 0,
+                "cpu_s": 0.0,
+                "wait": [],
+                "done": [],
+            }
+        return entry
+
+    def on_event(self, _connection, event) -> None:
+        # connected before any hub subscriber: numbers events in arrival order
+        self.seq_of[id(event)] = self.received
+        self.received += 1
+        self.last_activity = time.monotonic()
+
+    def measure(self, name: str, events: list, run: Callable[[], Any]) -> Any:
+        started = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            return run()
+        finally:
+            finished = time.perf_counter()
+            entry = self.consumer(name)
+            entry["runs"] += 1
+            entry["events"] += len(events)
+            entry["cpu_s"] += time.thread_time() - cpu
+            for event in events:
+                seq = self.seq_of.get(id(event))
+                if seq is None or seq >= len(self.server.sent_at):
+                    continue
+                sent = self.server.sent_at[seq]
+                entry["wait"].append(started - sent)
+                entry["done"].append(finished - sent)
+            self.last_activity = time.monotonic()
+
+    def report(self) -> Dict[str, Any]:
+        result = {}
+        for name, entry in sorted(self.consumers.items()):
+            runs = entry["runs"]
+            cpu_ms = entry["cpu_s"] * 1000
+            result[name] = {
+                "events": entry["events"],
+                "runs": runs,
+                "cpu_ms": round(cpu_ms, 3),
+                "cpu_ms_per_run": round(cpu_ms / runs, 3) if runs else 0.0,
+                "wait_ms": percentiles(entry["wait"]),
+                "done_ms": percentiles(entry["done"]),
+            }
+        return result
+
+
+def instrument(probe: Probe) -> None:
+    from services.hyprland_events import CoalescedSubscription, HyprlandEventHub
+
+    hub = HyprlandEventHub()
+    hub.connection.connect("event", probe.on_event)
+
+    flush = CoalescedSubscription._flush
+
+    def timed_flush(self) -> bool:
+        events = list(self._pending)
+        return probe.measure(self.name, events, lambda: flush(self))
+
+    CoalescedSubscription._flush = timed_flush  # type: ignore[method-assign]
+
+    dispatch = HyprlandEventHub._dispatch
+
+    def timed_dispatch(self, connection, event) -> None:
+        name = f"direct:{event.name.lower()}"
+        probe.measure(name, [event], lambda: dispatch(self, connection, event))
+
+    # the hub binds _dispatch when a name gets its first subscriber
+    HyprlandEventHub._dispatch = timed_dispatch  # type: ignore[method-assign]
+
+
+# ---------------------------------------------------------------------
+# Targets
+# ---------------------------------------------------------------------
+def build_dock():
+    from fabric.widgets.eventbox import EventBox
+
+    from widgets.dockstation.config import ConfigHandlerDockStation
+    from widgets.dockstation.core.dock_items.items import DockStationItems
+    from widgets.dockstation.servises.hypr import Hypr
+
+    # the slice of DockStation that DockStationItems reaches into
+    host = SimpleNamespace(
+        confh=ConfigHandlerDockStation(),
+        main_event=EventBox(),
+        tools=SimpleNamespace(hover_enter=lambda *_: False),
+    )
+    host.hypr = Hypr(host)  # type: ignore[arg-type]
+    return DockStationItems(host)  # type: ignore[arg-type]
+
+
+def build_title():
+    from widgets.statusbar.config import ConfigHandlerStatusBar
+    from widgets.statusbar.modules.windowtitle import WindowTitleWidget
+
+    host = SimpleNamespace(confh=ConfigHandlerStatusBar())
+    return WindowTitleWidget(host)  # type: ignore[arg-type]
+
+
+def build_workspaces():
+    from fabric.widgets.box import Box
+
+    from widgets.statusbar.modules.workspaces.core.buttons_factory import (
+        ButtonsFactory,
+    )
+
+    factory = ButtonsFactory(
+        orientation="h",
+        max_visible=10,
+        numbering_enabled=True,
+        numbering=[],
+        enable_factory=True,
+        magic_enabled=True,
+        magic_icon="*",
+    )
+    return Box(children=[factory.magic_button, *factory.initial_buttons()])
+
+
+TARGETS: Dict[str, Callable[[], Any]] = {
+    "dock": build_dock,
+    "title": build_title,
+    "workspaces": build_workspaces,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("trace", type=Path)
+    parser.add_argument(
+        "--speed", type=float, default=0.0, help="0 = as fast as possible (default)"
+    )
+    parser.add_argument("--only", default=",".join(TARGETS))
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    server = FakeHyprland(args.trace)
+    server.start()
+    # fabric resolves the sockets from the environment when it connects
+    os.environ.update(server.env)
+
+    try:
+        import gi
+
+        gi.require_version("Gtk", "3.0")
+        from gi.repository import GLib, Gtk  # type: ignore
+
+        from services.hyprland_metrics import HyprlandMetrics
+
+        HyprlandMetrics().install()
+        probe = Probe(server)
+        instrument(probe)
+
+        window = Gtk.OffscreenWindow()
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+        for name in filter(None, args.only.split(",")):
+            box.add(TARGETS[name]())
+        window.add(box)
+        window.show_all()
+
+        started = time.perf_counter()
+        server.replay_in_background(args.speed)
+
+        def check_done() -> bool:
+            idle_ms = (time.monotonic() - probe.last_activity) * 1000
+            if server.done.is_set() and idle_ms >= DRAIN_MS:
+                Gtk.main_quit()
+                return False
+            return True
+
+        GLib.timeout_add(50, check_done)
+        Gtk.main()
+        elapsed = time.perf_counter() - started - DRAIN_MS / 1000
+    finally:
+        server.stop()
+
+    report = {
+        "trace": str(args.trace),
+        "events_sent": len(server.sent_at),
+        "events_received": probe.received,
+        "replay_s": round(elapsed, 3),
+        "consumers": probe.report(),
+        "ipc": HyprlandMetrics().snapshot()["commands"],
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    sent = report["events_sent"]
+    print(f"trace    : {args.trace} ({sent} events, {elapsed:.2f} s)")
+    header = f"{'consumer':34} {'events':>7} {'runs':>6} {'cpu ms':>9} "
+    header += f"{'ms/run':>7} {'wait p50/p95/p99 ms':>22} {'done p99':>9}"
+    print(header)
+    for name, row in report["consumers"].items():
+        wait = row["wait_ms"]
+        print(
+            f"{name:34} {row['events']:7} {row['runs']:6} {row['cpu_ms']:9.2f} "
+            f"{row['cpu_ms_per_run']:7.3f} "
+            f"{wait['p50']:>6.2f}/{wait['p95']:>6.2f}/{wait['p99']:>7.2f} "
+            f"{row['done_ms']['p99']:9.2f}"
+        )
+    header = f"{'ipc command':34} {'count':>7} {'shared':>6} {'total ms':>9} "
+    print(header + f"{'p99 ms':>7}")
+    for command, stats in report["ipc"].items():
+        shared = stats["coalesced"] + stats["cached"]
+        print(
+            f"{command:34} {stats['count']:7} {shared:6} "
+            f"{stats['total_ms']:9.2f} {stats['p99_ms']:7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
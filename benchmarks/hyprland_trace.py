@@ -0,0 +1,367 @@
+"""
+Record Hyprland socket traffic into a trace file and replay it from a fake
+compositor, so event handling can be measured without a live session.
+
+    # capture 60 s of events (+ j/clients, j/monitors... as they change)
+    python -m benchmarks.hyprland_trace record -o session.jsonl --duration 60
+
+    # serve it on $XDG_RUNTIME_DIR/hypr/<sig>/.socket{,2}.sock at 1x speed,
+    # then start the bar with the printed HYPRLAND_INSTANCE_SIGNATURE
+    python -m benchmarks.hyprland_trace serve session.jsonl --speed 1
+
+Trace format (JSON lines): a `meta` header, then `event` ({"t", "line"}, the
+raw socket2 line) and `reply` ({"t", "command", "reply"}) records in time
+order. Replies are re-captured after events, only when they changed.
+Standard library only: recording and serving need neither GTK nor fabric.
+"""
+
+import argparse
+import json
+import os
+import select
+import socket
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+# replies the fake server can answer from recorded state
+SNAPSHOT_COMMANDS = (
+    "j/clients",
+    "j/workspaces",
+    "j/monitors",
+    "j/activewindow",
+    "j/activeworkspace",
+    "j/devices",
+)
+# replies worth re-capturing after a burst of events
+VOLATILE_COMMANDS = (
+    "j/clients",
+    "j/workspaces",
+    "j/activewindow",
+    "j/activeworkspace",
+)
+MONITOR_EVENTS = (
+    "monitoradded",
+    "monitoraddedv2",
+    "monitorremoved",
+    "configreloaded",
+)
+SNAPSHOT_INTERVAL_S = 0.05
+
+# commands that change compositor state; the fake server just acknowledges them
+ACK_COMMANDS = ("dispatch", "keyword", "switchxkblayout", "reload", "setcursor")
+# unrecorded requests get an empty object instead of an empty list
+OBJECT_REPLIES = ("j/activewindow", "j/activeworkspace", "j/devices", "j/version")
+
+
+def socket_dir(signature: str, runtime_dir: Optional[str] = None) -> Path:
+    runtime = runtime_dir or os.environ.get(
+        "XDG_RUNTIME_DIR", f"/run/user/{os.getuid()}"
+    )
+    return Path(runtime) / "hypr" / signature
+
+
+def read_trace(path: Path) -> Iterator[dict]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+# ---------------------------------------------------------------------
+# Recorder
+# ---------------------------------------------------------------------
+def request(path: Path, command: str, timeout: float = 2.0) -> str:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(path))
+        sock.sendall(command.encode("utf-8"))
+        chunks = []
+        while True:
+            data = sock.recv(65536)
+            if not data:
+                break
+            chunks.append(data)
+    return b"".join(chunks).decode("utf-8", errors="replace")
+
+
+def record(output: Path, duration: float) -> int:
+    signature = os.environ.get("HYPRLAND_INSTANCE_SIGNATURE")
+    if not signature:
+        raise SystemExit("HYPRLAND_INSTANCE_SIGNATURE is not set (no Hyprland session)")
+    sockets = socket_dir(signature)
+    command_socket = sockets / ".socket.sock"
+    last: Dict[str, str] = {}
+    start = time.monotonic()
+    events = 0
+
+    with open(output, "w", encoding="utf-8") as out:
+
+        def write(record: dict) -> None:
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        def snapshot(commands) -> None:
+            t = round(time.monotonic() - start, 6)
+            for command in commands:
+                try:
+                    reply = request(command_socket, command)
+                except OSError as e:
+                    print(f"{command}: {e}")
+                    continue
+                if last.get(command) != reply:
+                    last[command] = reply
+                    write(
+                        {"type": "reply", "t": t, "command": command, "reply": reply}
+                    )
+
+        write({"type": "meta", "version": 1, "created": time.time()})
+        snapshot(SNAPSHOT_COMMANDS)
+
+        events_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        events_sock.connect(str(sockets / ".socket2.sock"))
+        buffer = b""
+        pending: set = set()
+        last_snapshot = 0.0
+        try:
+            while time.monotonic() - start < duration:
+                ready, _, _ = select.select(
+                    [events_sock], [], [], SNAPSHOT_INTERVAL_S
+                )
+                if ready:
+                    data = events_sock.recv(65536)
+                    if not data:
+                        break
+                    buffer += data
+                    *lines, buffer = buffer.split(b"\n")
+                    t = round(time.monotonic() - start, 6)
+                    for raw in lines:
+                        line = raw.decode("utf-8", errors="replace")
+                        write({"type": "event", "t": t, "line": line})
+                        events += 1
+                        pending.update(VOLATILE_COMMANDS)
+                        if line.split(">>", 1)[0] in MONITOR_EVENTS:
+                            pending.add("j/monitors")
+                now = time.monotonic()
+                if pending and now - last_snapshot >= SNAPSHOT_INTERVAL_S:
+                    snapshot(sorted(pending))
+                    pending.clear()
+                    last_snapshot = now
+        finally:
+            events_sock.close()
+    return events
+
+
+# ---------------------------------------------------------------------
+# Fake compositor
+# ---------------------------------------------------------------------
+class FakeHyprland:
+    """
+    Serves a trace on a private `hypr/<signature>/` directory: `.socket.sock`
+    answers requests from the replies recorded up to the current replay
+    position, `.socket2.sock` streams the recorded events to every listener.
+
+    `sent_at[i]` is the time.perf_counter() at which event `i` was written,
+    for latency measurements on the receiving side.
+    """
+
+    def __init__(
+        self,
+        trace: Path,
+        signature: Optional[str] = None,
+        runtime_dir: Optional[str] = None,
+    ) -> None:
+        self.records = list(read_trace(Path(trace)))
+        self.signature = signature or f"moonlight-replay-{os.getpid()}"
+        self.runtime_dir = runtime_dir or tempfile.mkdtemp(prefix="hypr-replay-")
+        self.dir = socket_dir(self.signature, self.runtime_dir)
+        self.state: Dict[str, str] = {}
+        self.sent_at: List[float] = []
+        self.requests: Dict[str, int] = {}
+        self.done = threading.Event()
+
+        self._listeners: List[socket.socket] = []
+        self._listener_added = threading.Condition()
+        self._servers: List[socket.socket] = []
+        self._closed = False
+
+        # state before the first event: the initial snapshot
+        self._initial: Dict[str, str] = {}
+        for rec in self.records:
+            if rec.get("type") == "event":
+                break
+            if rec.get("type") == "reply":
+                self._initial[rec["command"]] = rec["reply"]
+        self.reset()
+
+    @property
+    def env(self) -> Dict[str, str]:
+        return {
+            "HYPRLAND_INSTANCE_SIGNATURE": self.signature,
+            "XDG_RUNTIME_DIR": self.runtime_dir,
+        }
+
+    @property
+    def event_count(self) -> int:
+        return sum(1 for rec in self.records if rec.get("type") == "event")
+
+    def reset(self) -> None:
+        """Back to the initial snapshot, with no events sent or requests counted"""
+        self.state = dict(self._initial)
+        self.sent_at = []
+        self.requests = {}
+        self.done.clear()
+
+    def start(self) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        requests = self._listen(self.dir / ".socket.sock")
+        events = self._listen(self.dir / ".socket2.sock")
+        for target, server in (
+            (self._serve_requests, requests),
+            (self._accept_listeners, events),
+        ):
+            threading.Thread(target=target, args=(server,), daemon=True).start()
+
+    def stop(self) -> None:
+        self._closed = True
+        for sock in self._servers + self._listeners:
+            try:
+                sock.close()
+            except OSError:
+                pass
+        for name in (".socket.sock", ".socket2.sock"):
+            try:
+                (self.dir / name).unlink()
+            except OSError:
+                pass
+
+    def _listen(self, path: Path) -> socket.socket:
+        if path.exists():
+            path.unlink()
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(path))
+        server.listen(64)
+        self._servers.append(server)
+        return server
+
+    # ----------------------------
+    # .socket.sock
+    # ----------------------------
+    def _serve_requests(self, server: socket.socket) -> None:
+        while not self._closed:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with conn:
+                try:
+                    command = conn.recv(65536).decode("utf-8", errors="replace")
+                    conn.sendall(self.answer(command).encode("utf-8"))
+                except OSError:
+                    continue
+
+    def answer(self, command: str) -> str:
+        if command.startswith("[[BATCH]]"):
+            return "".join(self.answer(c) for c in command[9:].split(";") if c)
+        self.requests[command] = self.requests.get(command, 0) + 1
+        if command.split(" ", 1)[0] in ACK_COMMANDS:
+            return "ok"
+        if command in self.state:
+            return self.state[command]
+        if command.startswith("j/"):
+            return "{}" if command in OBJECT_REPLIES else "[]"
+        return ""
+
+    # ----------------------------
+    # .socket2.sock
+    # ----------------------------
+    def _accept_listeners(self, server: socket.socket) -> None:
+        while not self._closed:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with self._listener_added:
+                self._listeners.append(conn)
+                self._listener_added.notify_all()
+
+    def _broadcast(self, line: str) -> None:
+        data = (line + "\n").encode("utf-8")
+        for conn in list(self._listeners):
+            try:
+                conn.sendall(data)
+            except OSError:
+                self._listeners.remove(conn)
+
+    def replay(
+        self, speed: float = 1.0, wait_for_listener: Optional[float] = 10.0
+    ) -> None:
+        """Play the trace; speed 0 sends events back to back"""
+        with self._listener_added:
+            self._listener_added.wait_for(lambda: self._listeners, wait_for_listener)
+        start = time.monotonic()
+        for rec in self.records:
+            if self._closed:
+                break
+            kind = rec.get("type")
+            if speed > 0:
+                delay = rec.get("t", 0.0) / speed - (time.monotonic() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            if kind == "reply":
+                self.state[rec["command"]] = rec["reply"]
+            elif kind == "event":
+                self.sent_at.append(time.perf_counter())
+                self._broadcast(rec["line"])
+        self.done.set()
+
+    def replay_in_background(self, speed: float = 1.0) -> threading.Thread:
+        thread = threading.Thread(target=self.replay, args=(speed,), daemon=True)
+        thread.start()
+        return thread
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    rec = sub.add_parser("record", help="capture the running compositor")
+    rec.add_argument("-o", "--output", type=Path, required=True)
+    rec.add_argument("--duration", type=float, default=30.0)
+
+    serve = sub.add_parser("serve", help="replay a trace from a fake compositor")
+    serve.add_argument("trace", type=Path)
+    serve.add_argument(
+        "--speed", type=float, default=1.0, help="0 = as fast as possible"
+    )
+    serve.add_argument("--signature", default=None)
+    serve.add_argument("--loop", action="store_true", help="restart at the end")
+    args = parser.parse_args()
+
+    if args.mode == "record":
+        count = record(args.output, args.duration)
+        print(f"recorded {count} events -> {args.output}")
+        return
+
+    server = FakeHyprland(args.trace, signature=args.signature)
+    server.start()
+    for key, value in server.env.items():
+        print(f"export {key}={value}")
+    print(f"serving {server.event_count} events from {server.dir} ...")
+    try:
+        while True:
+            server.reset()
+            server.replay(args.speed, wait_for_listener=None)
+            print(f"replayed {len(server.sent_at)} events")
+            if not args.loop:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
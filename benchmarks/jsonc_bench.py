@@ -0,0 +1,145 @@
+"""
+Micro-benchmark: single-scan `jsonc.read` vs the previous multi-pass chain
+(strip comments -> regex trailing commas -> json.loads -> \\u fixup walk).
+
+    python -m benchmarks.jsonc_bench [--size-mb 4] [--repeat 5]
+"""
+
+import argparse
+import io
+import json
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from utils.jsonc import jsonc
+
+
+# ---------------------------------------------------------------------
+# Previous implementation, kept verbatim as the reference path
+# ---------------------------------------------------------------------
+_surrogate_pair_re = re.compile(
+    r"\\u(d[89ab][0-9a-fA-F]{2})\\u(d[cdef][0-9a-fA-F]{2})", re.IGNORECASE
+)
+_single_esc_re = re.compile(r"\\u([0-9a-fA-F]{4})")
+
+
+def _legacy_decode_str(s: str) -> str:
+    def repl_pair(m):
+        hi = int(m.group(1), 16)
+        lo = int(m.group(2), 16)
+        return chr(0x10000 + ((hi - 0xD800) << 10) + (lo - 0xDC00))
+
+    def repl_single(m):
+        return chr(int(m.group(1), 16))
+
+    if "\\u" not in s:
+        return s
+    s = _surrogate_pair_re.sub(repl_pair, s)
+    return _single_esc_re.sub(repl_single, s)
+
+
+def _legacy_decode_any(obj: Any) -> Any:
+    if isinstance(obj, str):
+        return _legacy_decode_str(obj)
+    if isinstance(obj, list):
+        return [_legacy_decode_any(x) for x in obj]
+    if isinstance(obj, dict):
+        return {k: _legacy_decode_any(v) for k, v in obj.items()}
+    return obj
+
+
+def _legacy_strip_comments(raw: str) -> str:
+    output = io.StringIO()
+    inside_str = False
+    prev_char = ""
+    for line in raw.splitlines():
+        new_line = ""
+        i = 0
+        while i < len(line):
+            ch = line[i]
+            if ch == '"' and prev_char != "\\":
+                inside_str = not inside_str
+            if not inside_str and ch == "/" and i + 1 < len(line) and line[i + 1] == "/":
+                break
+            new_line += ch
+            prev_char = ch
+            i += 1
+        output.write(new_line + "\n")
+    return output.getvalue()
+
+
+def legacy_read(path: Path) -> dict:
+    raw = path.read_text(encoding="utf-8")
+    if not raw.strip():
+        return {}
+    clean = _legacy_strip_comments(raw)
+    clean = re.sub(r",(\s*[\]\}])", r"\1", clean)
+    data = json.loads(clean)
+    return _legacy_decode_any(data) if isinstance(data, dict) else {}
+
+
+# ---------------------------------------------------------------------
+# Input generation
+# ---------------------------------------------------------------------
+def make_document(size_mb: float) -> str:
+    """Build a config-shaped JSONC document of roughly `size_mb` megabytes."""
+    target = int(size_mb * 1024 * 1024)
+    out = io.StringIO()
+    out.write("{\n  // generated benchmark input\n")
+    i = 0
+    while out.tell() < target:
+        out.write(
+            f'  "widget-{i}": {{\n'
+            f"    // options for widget {i}\n"
+            f'    "enabled": {"true" if i % 2 else "false"},\n'
+            f'    "margin": "{i}px 0px 0px 0px",\n'
+            f'    "size": {i % 97},\n'
+            f'    "ratio": {i / 7:.5f},\n'
+            f'    "icon": "\\u2728 \\"quoted\\" \\\\ path",\n'
+            f'    "layout": ["clock", "battery", "network", ],\n'
+            f'    "nested": {{ "a": null, "b": [1, 2, 3], }},\n'
+            f"  }},\n"
+        )
+        i += 1
+    out.write('  "end": true\n}\n')
+    return out.getvalue()
+
+
+def bench(fn: Callable[[Path], dict], path: Path, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(path)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=4.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.jsonc"
+        path.write_text(make_document(args.size_mb), encoding="utf-8")
+        size = path.stat().st_size
+
+        if legacy_read(path) != jsonc.read(path):
+            raise SystemExit("legacy and single-pass readers disagree")
+
+        old = bench(legacy_read, path, args.repeat)
+        new = bench(jsonc.read, path, args.repeat)
+
+    mb = size / (1024 * 1024)
+    print(f"input       : {mb:.2f} MiB")
+    print(f"legacy read : {old * 1000:8.1f} ms  ({mb / old:6.1f} MiB/s)")
+    print(f"single-scan : {new * 1000:8.1f} ms  ({mb / new:6.1f} MiB/s)")
+    print(f"speedup     : {old / new:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -27,8 +27,12 @@ import atexit
 from loguru import logger
 from widgets.core.widgets_handler import WidgetsHandler
 from fabric.utils.helpers import idle_add
+from services.hyprland_metrics import HyprlandMetrics
 # from modules.cavalade.utils import kill_all_cava_pids
 
+# time every Hyprland request from the start, fabric's own widgets included
+HyprlandMetrics().install()
+
 Handler = WidgetsHandler()
 
 
@@ -51,8 +55,22 @@ def handle_sighup(*_):
     idle_add(restart)
 
 
+def dump_ipc_stats() -> bool:
+    HyprlandMetrics().dump()
+    return False
+
+
+def handle_sigusr1(*_):
+    # `pkill -USR1 -f moonlight` -> ~/.cache/moonlight/hyprland-ipc.json
+    idle_add(dump_ipc_stats)
+
+
 def main():
     signal.signal(signal.SIGHUP, handle_sighup)
+    signal.signal(signal.SIGUSR1, handle_sigusr1)
+    # config edits are applied live; restart only for what can't be (e.g. `enabled`)
+    Handler.reloader.on_restart_required = lambda: idle_add(restart)
+    Handler.reloader.start()
     Handler.app.run()
 
 
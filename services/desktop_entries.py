@@ -0,0 +1,296 @@
+import re
+import shlex
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set
+
+from fabric import Service, Signal
+from fabric.utils import GLib
+from gi.repository import Gio  # type: ignore
+from loguru import logger
+
+from utils.app_resolution_cache import AppResolutionCache, application_dirs
+
+# package managers touch many files in a row; re-parse them in one go
+RESCAN_DELAY_MS = 200
+
+_FIELD_CODE_RE = re.compile(r"\s+%[fFuUdDnNickvm]")
+
+REPARSE_EVENTS = {
+    Gio.FileMonitorEvent.CHANGES_DONE_HINT,
+    Gio.FileMonitorEvent.CREATED,
+    Gio.FileMonitorEvent.DELETED,
+    Gio.FileMonitorEvent.MOVED_IN,
+    Gio.FileMonitorEvent.MOVED_OUT,
+    Gio.FileMonitorEvent.RENAMED,
+}
+
+
+def normalize(s: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "", (s or "").casefold())
+
+
+def token_set(s: str) -> Set[str]:
+    return set(p for p in re.split(r"[^a-z0-9]+", (s or "").casefold()) if p)
+
+
+def parse_desktop_file(path: str) -> Dict[str, str]:
+    """Keys of the [Desktop Entry] group (unlocalized and localized alike)"""
+    data: Dict[str, str] = {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            in_entry = False
+            for raw in f:
+                line = raw.strip()
+                if not line or line.startswith("#"):
+                    continue
+                if line.startswith("["):
+                    in_entry = line.lower().startswith("[desktop entry")
+                    continue
+                if not in_entry:
+                    continue
+                if "=" in line:
+                    k, v = line.split("=", 1)
+                    data[k.strip()] = v.strip()
+    except Exception:
+        pass
+    return data
+
+
+class DesktopEntry:
+    """One parsed .desktop file, with the normalized forms resolvers match on"""
+
+    __slots__ = (
+        "id",
+        "path",
+        "stem",
+        "name",
+        "generic_name",
+        "comment",
+        "keywords",
+        "icon",
+        "wm_class",
+        "exec_line",
+        "exec_cmd",
+        "exec_bin",
+        "name_norm",
+        "wm_norm",
+        "stem_norm",
+        "exec_norm",
+        "icon_norm",
+        "name_tokens",
+        "wm_tokens",
+        "tokens",
+    )
+
+    def __init__(self, path: Path, data: Dict[str, str]) -> None:
+        self.id = path.name
+        self.path = str(path)
+        self.stem = path.stem
+        self.name = data.get("Name", "")
+        self.generic_name = data.get("GenericName", "")
+        self.comment = data.get("Comment", "")
+        self.keywords = data.get("Keywords", "")
+        self.icon = "".join(data.get("Icon", "").split())
+        self.wm_class = data.get("StartupWMClass", "")
+        self.exec_line = data.get("Exec", "")
+
+        exec_cmd = _FIELD_CODE_RE.sub("", self.exec_line).strip()
+        try:
+            argv = shlex.split(exec_cmd)
+        except ValueError:
+            argv = exec_cmd.split()
+        self.exec_cmd = argv[0] if argv else ""
+        self.exec_bin = Path(self.exec_cmd).name if self.exec_cmd else ""
+
+        self.name_norm = normalize(self.name)
+        self.wm_norm = normalize(self.wm_class)
+        self.stem_norm = normalize(self.stem)
+        self.exec_norm = normalize(self.exec_bin)
+        self.icon_norm = normalize(self.icon)
+        self.name_tokens: FrozenSet[str] = frozenset(token_set(self.name))
+        self.wm_tokens: FrozenSet[str] = frozenset(token_set(self.wm_class))
+        self.tokens: FrozenSet[str] = frozenset(
+            token_set(
+                " ".join(
+                    (
+                        self.name,
+                        self.generic_name,
+                        self.keywords,
+                        self.comment,
+                        self.icon,
+                    )
+                )
+            )
+        )
+
+
+class DesktopEntryIndex(Service):
+    """
+    Every .desktop file of the XDG applications dirs, parsed once.
+
+    Built lazily on first use, then kept current by Gio directory monitors
+    that re-parse only the files that changed. Lookup tables by normalized
+    StartupWMClass, file stem, Exec basename and Icon give exact matches in
+    one dict hit (`match()` tries them all); `entries()` is there for the
+    resolvers' fuzzy fallback when none matches. A user entry hides
+    a system one with the same desktop id, as in XDG.
+    """
+
+    @Signal
+    def changed(self) -> None:
+        """Signal emitted after desktop entries were added, changed or removed."""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, **kwargs):
+        if getattr(self, "_initialized", False):
+            return
+        super().__init__(**kwargs)
+        self._initialized = True
+
+        self._dirs: List[Path] = []
+        # desktop id -> entry for every dir, in dir precedence order
+        self._by_dir: List[Dict[str, DesktopEntry]] = []
+        self._entries: Dict[str, DesktopEntry] = {}
+        self._by_wm_class: Dict[str, List[DesktopEntry]] = {}
+        self._by_stem: Dict[str, List[DesktopEntry]] = {}
+        self._by_exec: Dict[str, List[DesktopEntry]] = {}
+        self._by_icon: Dict[str, List[DesktopEntry]] = {}
+
+        self._monitors: List[Gio.FileMonitor] = []
+        self._pending: Set[Path] = set()
+        self._pending_id: Optional[int] = None
+        self._built = False
+
+    # ----------------------------
+    # Queries
+    # ----------------------------
+    def entries(self) -> Iterable[DesktopEntry]:
+        self._ensure_built()
+        return self._entries.values()
+
+    def by_wm_class(self, value: str) -> List[DesktopEntry]:
+        self._ensure_built()
+        return self._by_wm_class.get(normalize(value), [])
+
+    def by_stem(self, value: str) -> List[DesktopEntry]:
+        self._ensure_built()
+        return self._by_stem.get((value or "").casefold(), [])
+
+    def by_exec(self, value: str) -> List[DesktopEntry]:
+        self._ensure_built()
+        return self._by_exec.get(normalize(value), [])
+
+    def by_icon(self, value: str) -> List[DesktopEntry]:
+        self._ensure_built()
+        return self._by_icon.get(normalize(value), [])
+
+    def match(
+        self, value: str, accept: Callable[[DesktopEntry], bool] = bool
+    ) -> Optional[DesktopEntry]:
+        """
+        First entry `accept` takes among the exact matches of `value` by
+        StartupWMClass, file stem, Icon and Exec basename, in that order.
+        """
+        for table in (self.by_wm_class, self.by_stem, self.by_icon, self.by_exec):
+            for entry in table(value):
+                if accept(entry):
+                    return entry
+        return None
+
+    # ----------------------------
+    # Building
+    # ----------------------------
+    def _ensure_built(self) -> None:
+        if self._built:
+            return
+        self._built = True
+        self._dirs = application_dirs()
+        self._by_dir = [self._scan_dir(d) for d in self._dirs]
+        self._rebuild_tables()
+        self._watch()
+        logger.debug(f"[DesktopEntryIndex] Indexed {len(self._entries)} entries")
+
+    @staticmethod
+    def _scan_dir(directory: Path) -> Dict[str, DesktopEntry]:
+        entries: Dict[str, DesktopEntry] = {}
+        try:
+            files = [f for f in directory.iterdir() if f.suffix == ".desktop"]
+        except OSError:
+            return entries
+        for f in files:
+            if f.is_file():
+                entries[f.name] = DesktopEntry(f, parse_desktop_file(str(f)))
+        return entries
+
+    def _rebuild_tables(self) -> None:
+        merged: Dict[str, DesktopEntry] = {}
+        for per_dir in self._by_dir:
+            for desktop_id, entry in per_dir.items():
+                merged.setdefault(desktop_id, entry)
+        self._entries = merged
+        tables = (
+            (self._by_wm_class, "wm_norm"),
+            (self._by_stem, "stem"),
+            (self._by_exec, "exec_norm"),
+            (self._by_icon, "icon_norm"),
+        )
+        for table, attr in tables:
+            table.clear()
+            for entry in merged.values():
+                key = getattr(entry, attr)
+                if attr == "stem":
+                    key = key.casefold()
+                if key:
+                    table.setdefault(key, []).append(entry)
+
+    # ----------------------------
+    # Monitoring
+    # ----------------------------
+    def _watch(self) -> None:
+        for directory in self._dirs:
+            if not directory.is_dir():
+                continue
+            try:
+                monitor = Gio.File.new_for_path(str(directory)).monitor_directory(
+                    Gio.FileMonitorFlags.WATCH_MOVES, None
+                )
+            except Exception as e:
+                logger.warning(f"[DesktopEntryIndex] Cannot watch {directory}: {e}")
+                continue
+            monitor.connect("changed", self._on_dir_changed)
+            self._monitors.append(monitor)
+
+    def _on_dir_changed(self, _monitor, file, other, event) -> None:
+        if event not in REPARSE_EVENTS:
+            return
+        for f in (file, other):
+            path = f.get_path() if f is not None else None
+            if path and path.endswith(".desktop"):
+                self._pending.add(Path(path))
+        if self._pending and self._pending_id is None:
+            self._pending_id = GLib.timeout_add(RESCAN_DELAY_MS, self._apply_pending)
+
+    def _apply_pending(self) -> bool:
+        self._pending_id = None
+        paths, self._pending = self._pending, set()
+        for path in paths:
+            try:
+                slot = self._dirs.index(path.parent)
+            except ValueError:
+                continue
+            per_dir = self._by_dir[slot]
+            if path.is_file():
+                per_dir[path.name] = DesktopEntry(path, parse_desktop_file(str(path)))
+            else:
+                per_dir.pop(path.name, None)
+        self._rebuild_tables()
+        # persisted class resolutions may point at what just changed
+        AppResolutionCache().invalidate()
+        self.emit("changed")
+        return False
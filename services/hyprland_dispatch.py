@@ -0,0 +1,32 @@
+from typing import Iterable
+
+from fabric.hyprland.service import Hyprland
+from loguru import logger
+
+
+def batch(commands: Iterable[str]) -> bool:
+    """
+    Send raw commands over the Hyprland command socket in one round trip
+    (`[[BATCH]]a;b;c`), applied by the compositor back to back.
+    Returns True when every command replied "ok".
+    """
+    commands = [c for c in commands if c]
+    if not commands:
+        return True
+    payload = commands[0] if len(commands) == 1 else "[[BATCH]]" + ";".join(commands)
+    try:
+        reply = Hyprland.send_command(payload).reply
+    except Exception as e:
+        logger.error(f"[HyprlandDispatch] {payload!r} failed: {e}")
+        return False
+    text = (reply or b"").decode("utf-8", errors="ignore")
+    # batch replies are the per-command replies concatenated ("okok...")
+    if text.replace("ok", "").strip():
+        logger.warning(f"[HyprlandDispatch] {payload!r} -> {text.strip()!r}")
+        return False
+    return True
+
+
+def dispatch(*dispatchers: str) -> bool:
+    """`dispatch("focuswindow address:0x1", "movetoworkspace 2")` in a single round trip"""
+    return batch(f"dispatch {d}" for d in dispatchers)
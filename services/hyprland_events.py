@@ -0,0 +1,197 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from fabric.hyprland.service import Hyprland, HyprlandEvent
+from fabric.hyprland.widgets import get_hyprland_connection
+from fabric.utils import GLib
+from loguru import logger
+
+EventCallback = Callable[[HyprlandEvent], None]
+BatchCallback = Callable[[List[HyprlandEvent]], None]
+
+
+class CoalescedSubscription:
+    """
+    One consumer's coalesced view of a set of events.
+
+    Events are queued as they arrive and the handler runs at most once per
+    frame of `widget` (its frame clock tick; an idle callback while the widget
+    is not mapped or when there is none) with every event queued since the
+    last run, in arrival order. `received` and `runs` count events queued and
+    handler runs. Destroying `widget` cancels the subscription.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: BatchCallback,
+        widget: Optional[Any] = None,
+    ) -> None:
+        self.name = name
+        self.handler = handler
+        self.widget = widget
+        self.received = 0
+        self.runs = 0
+        self._pending: List[HyprlandEvent] = []
+        self._scheduled = False
+        self._tick_id: Optional[int] = None
+        self._idle_id: Optional[int] = None
+        self._unsubscribe: Optional[Callable[[], None]] = None
+        if widget is not None:
+            # GTK drops tick callbacks of an unrealized widget without a word
+            widget.connect("unrealize", self._on_unrealize)
+
+    def push(self, event: HyprlandEvent) -> None:
+        self.received += 1
+        self._pending.append(event)
+        if self._scheduled:
+            return
+        self._scheduled = True
+        widget = self.widget
+        if widget is not None and widget.get_mapped():
+            self._tick_id = widget.add_tick_callback(self._on_tick)
+        else:
+            self._idle_id = GLib.idle_add(self._flush)
+
+    def _on_tick(self, *_) -> bool:
+        self._tick_id = None
+        return self._flush()
+
+    def _on_unrealize(self, *_) -> None:
+        if self._tick_id is None:
+            return
+        try:
+            self.widget.remove_tick_callback(self._tick_id)
+        except Exception:
+            pass
+        self._tick_id = None
+        self._idle_id = GLib.idle_add(self._flush)
+
+    def _flush(self) -> bool:
+        self._scheduled = False
+        self._idle_id = None
+        if not self._pending:
+            return False
+        batch, self._pending = self._pending, []
+        self.runs += 1
+        try:
+            self.handler(batch)
+        except Exception:
+            logger.exception(
+                f"[HyprlandEventHub] Coalesced handler '{self.name}' failed"
+            )
+        return False
+
+    def cancel(self) -> None:
+        """Stop receiving events and drop whatever is still queued"""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        if self._tick_id is not None:
+            try:
+                self.widget.remove_tick_callback(self._tick_id)
+            except Exception:
+                pass
+            self._tick_id = None
+        if self._idle_id is not None:
+            GLib.source_remove(self._idle_id)
+            self._idle_id = None
+        self._scheduled = False
+        self._pending.clear()
+
+
+class HyprlandEventHub:
+    """
+    Process-wide Hyprland event hub.
+
+    Holds the single `.socket2` connection (the same one fabric's Hyprland
+    widgets use), so every event line is read and parsed once, then fanned
+    out to the subscribers of that event name. Event names are matched
+    lowercase, the way Hyprland sends them ("openwindow", "activewindowv2"...).
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        if getattr(self, "_initialized", False):
+            return
+        self._initialized = True
+        self.connection: Hyprland = get_hyprland_connection()
+        self._subscribers: Dict[str, List[EventCallback]] = {}
+        self._coalesced: List[CoalescedSubscription] = []
+
+    def subscribe(self, event: str, callback: EventCallback) -> Callable[[], None]:
+        """Call `callback(event)` for every `event`; returns an unsubscribe function"""
+        name = event.lower()
+        subscribers = self._subscribers.get(name)
+        if subscribers is None:
+            subscribers = self._subscribers[name] = []
+            self.connection.connect(f"event::{name}", self._dispatch)
+        subscribers.append(callback)
+        return lambda: self.unsubscribe(name, callback)
+
+    def subscribe_many(
+        self, events: Iterable[str], callback: EventCallback
+    ) -> Callable[[], None]:
+        unsubscribers = [self.subscribe(e, callback) for e in events]
+
+        def unsubscribe() -> None:
+            for fn in unsubscribers:
+                fn()
+
+        return unsubscribe
+
+    def subscribe_coalesced(
+        self,
+        events: Iterable[str],
+        handler: BatchCallback,
+        widget: Optional[Any] = None,
+        name: Optional[str] = None,
+    ) -> CoalescedSubscription:
+        """
+        Call `handler(events)` at most once per frame of `widget` with the
+        events of a burst merged; see CoalescedSubscription
+        """
+        subscription = CoalescedSubscription(
+            name or getattr(handler, "__qualname__", repr(handler)), handler, widget
+        )
+        unsubscribe = self.subscribe_many(events, subscription.push)
+
+        def release() -> None:
+            unsubscribe()
+            if subscription in self._coalesced:
+                self._coalesced.remove(subscription)
+
+        subscription._unsubscribe = release
+        self._coalesced.append(subscription)
+        if widget is not None:
+            widget.connect("destroy", lambda *_: subscription.cancel())
+        return subscription
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Events received vs handler runs per coalesced subscription"""
+        result: Dict[str, Dict[str, int]] = {}
+        for sub in self._coalesced:
+            entry = result.setdefault(sub.name, {"received": 0, "runs": 0})
+            entry["received"] += sub.received
+            entry["runs"] += sub.runs
+        return result
+
+    def unsubscribe(self, event: str, callback: EventCallback) -> None:
+        subscribers = self._subscribers.get(event.lower())
+        if subscribers and callback in subscribers:
+            subscribers.remove(callback)
+
+    def _dispatch(self, _connection: Hyprland, event: HyprlandEvent) -> None:
+        # the signal handler stays connected; an empty list is just a no-op
+        for callback in tuple(self._subscribers.get(event.name.lower(), ())):
+            try:
+                callback(event)
+            except Exception:
+                logger.exception(
+                    f"[HyprlandEventHub] Subscriber for '{event.name}' failed"
+                )
@@ -0,0 +1,177 @@
+import re
+from typing import Any, Dict, List, Optional
+
+from fabric import Service, Signal
+from fabric.hyprland.service import HyprlandEvent
+from loguru import logger
+
+from services.hyprland_dispatch import batch
+from services.hyprland_events import HyprlandEventHub
+from services.hyprland_query import HyprlandQuery
+
+# events after which the keyboard list or its layouts may differ
+RELOAD_EVENTS = ("configreloaded",)
+
+
+def norm(text: Optional[str]) -> str:
+    if not text:
+        return ""
+    return re.sub(r"\W", "", text).lower()
+
+
+class KeyboardState(Service):
+    """
+    Keyboards and xkb layouts, kept current from Hyprland events.
+
+    Seeded with one (non-blocking) `j/devices`, then `activelayout` events
+    update the active keymap in memory and `configreloaded` triggers a fresh
+    `j/devices`. Readers (`layouts()`, `active_keymap()`, `fullname_map()`)
+    never touch the socket.
+    """
+
+    @Signal
+    def changed(self) -> None:
+        """Signal emitted after the keyboard list or the layouts were reloaded."""
+
+    @Signal
+    def layout_changed(self, keymap: str) -> None:
+        """Signal emitted with the new active keymap name."""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, **kwargs):
+        if getattr(self, "_initialized", False):
+            return
+        super().__init__(**kwargs)
+        self._initialized = True
+
+        self._keyboards: List[Dict[str, Any]] = []
+        self._active_keymap: str = ""
+        self._fullnames: Dict[tuple, Dict[str, str]] = {}
+        self.ready = False
+
+        hub = HyprlandEventHub()
+        hub.subscribe("activelayout", self._on_activelayout)
+        hub.subscribe_many(RELOAD_EVENTS, lambda _event: self.reload())
+        self.reload()
+
+    # ----------------------------
+    # Queries
+    # ----------------------------
+    def keyboards(self) -> List[Dict[str, Any]]:
+        return list(self._keyboards)
+
+    def keyboard_names(self) -> List[str]:
+        return [kb["name"] for kb in self._keyboards if kb.get("name")]
+
+    def main_keyboard(self) -> Dict[str, Any]:
+        for kb in self._keyboards:
+            if kb.get("main"):
+                return kb
+        return self._keyboards[0] if self._keyboards else {}
+
+    def layouts(self) -> List[str]:
+        layout = self.main_keyboard().get("layout", [])
+        if isinstance(layout, list):
+            return [str(x) for x in layout]
+        return [s for s in str(layout).split(",") if s]
+
+    def active_keymap(self) -> str:
+        return self._active_keymap
+
+    def fullname_map(self, default_fullnames: Dict[str, str]) -> Dict[str, str]:
+        """Normalized layout code -> display name, cached until layouts change"""
+        key = (
+            tuple(self.layouts()),
+            self._active_keymap,
+            tuple(default_fullnames.items()),
+        )
+        cached = self._fullnames.get(key)
+        if cached is None:
+            cached = self._build_fullname_map(self.layouts(), default_fullnames)
+            self._fullnames = {key: cached}
+        return cached
+
+    def _build_fullname_map(
+        self, short_raw_list: List[str], default_fullnames: Dict[str, str]
+    ) -> Dict[str, str]:
+        kb = self.main_keyboard()
+        short_norm = [norm(s) for s in short_raw_list]
+        result: Dict[str, str] = {}
+        active_full = self._active_keymap
+        active_norm = norm(active_full)
+        for idx, code in enumerate(short_norm):
+            if code in default_fullnames:
+                result[code] = default_fullnames[code]
+                continue
+            full_list = None
+            for field in [
+                "layout_names",
+                "keymap_names",
+                "variant_names",
+                "options_names",
+            ]:
+                val = kb.get(field)
+                if isinstance(val, list) and len(val) == len(short_norm):
+                    full_list = val
+                    break
+            if full_list:
+                result[code] = str(full_list[idx])
+                continue
+            if (
+                code == active_norm
+                or active_norm.startswith(code)
+                or code in active_norm
+            ):
+                result[code] = active_full
+                continue
+            raw = short_raw_list[idx] if idx < len(short_raw_list) else code
+            result[code] = raw.strip().replace("_", " ").title()
+        return result
+
+    # ----------------------------
+    # Actions
+    # ----------------------------
+    def switch_next(self) -> bool:
+        """Cycle every keyboard to its next layout in a single socket round trip"""
+        return batch(f"switchxkblayout {name} next" for name in self.keyboard_names())
+
+    # ----------------------------
+    # Updates
+    # ----------------------------
+    def reload(self) -> None:
+        HyprlandQuery().query("j/devices", self._on_devices)
+
+    def _on_devices(self, data: Any) -> None:
+        if not isinstance(data, dict):
+            logger.warning("[KeyboardState] Could not read keyboard devices.")
+            return
+        self._keyboards = [
+            kb for kb in data.get("keyboards", []) if isinstance(kb, dict)
+        ]
+        self._fullnames = {}
+        keymap = self.main_keyboard().get("active_keymap", "") or ""
+        seeded, self.ready = self.ready, True
+        self.emit("changed")
+        if keymap != self._active_keymap:
+            self._active_keymap = keymap
+            # the initial seed is not a layout switch
+            if seeded:
+                self.emit("layout-changed", keymap)
+
+    def _on_activelayout(self, event: HyprlandEvent) -> None:
+        # activelayout>>KEYBOARDNAME,LAYOUTNAME
+        if len(event.data) < 2:
+            return
+        keyboard = event.data[0]
+        keymap = ",".join(event.data[1:])
+        for kb in self._keyboards:
+            if kb.get("name") == keyboard:
+                kb["active_keymap"] = keymap
+        self._active_keymap = keymap
+        self.emit("layout-changed", keymap)
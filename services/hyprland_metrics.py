@@ -0,0 +1,249 @@
+import json
+import math
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fabric.hyprland.service import Hyprland
+from loguru import logger
+
+from utils.constants import Const
+
+DUMP_PATH = Const.APP_CACHE_DIR / "hyprland-ipc.json"
+
+# log-spaced latency buckets: 10 us * 2^(i/4), i.e. ~19% wide
+_BUCKET_BASE_S = 1e-5
+_BUCKETS_PER_OCTAVE = 4
+_BUCKET_COUNT = 96
+
+# frames in these files are transport, not the caller worth blaming
+_TRANSPORT_FILES = {
+    "hyprland_metrics.py",
+    "hyprland_query.py",
+    "hyprland_dispatch.py",
+}
+
+
+def _bucket(seconds: float) -> int:
+    if seconds <= _BUCKET_BASE_S:
+        return 0
+    index = int(math.log2(seconds / _BUCKET_BASE_S) * _BUCKETS_PER_OCTAVE) + 1
+    return min(index, _BUCKET_COUNT - 1)
+
+
+def _bucket_upper_ms(index: int) -> float:
+    return _BUCKET_BASE_S * 2 ** (index / _BUCKETS_PER_OCTAVE) * 1000
+
+
+def command_key(command: str) -> str:
+    """Group requests by what they ask for, not by their arguments"""
+    if command.startswith("[[BATCH]]"):
+        return "[[BATCH]]"
+    parts = command.split()
+    if not parts:
+        return ""
+    if parts[0] == "dispatch" and len(parts) > 1:
+        return f"dispatch {parts[1]}"
+    return parts[0]
+
+
+def caller_name(skip: int = 1) -> str:
+    """First frame above the IPC plumbing: `Class.method` or `module:function`"""
+    frame = sys._getframe(skip + 1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        base = os.path.basename(filename)
+        in_fabric = f"{os.sep}fabric{os.sep}hyprland" in filename
+        if base not in _TRANSPORT_FILES and not in_fabric:
+            owner = frame.f_locals.get("self")
+            if owner is not None:
+                return f"{type(owner).__name__}.{frame.f_code.co_name}"
+            return f"{Path(base).stem}:{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+class _CommandStats:
+    __slots__ = (
+        "count",
+        "coalesced",
+        "cached",
+        "failed",
+        "bytes_out",
+        "bytes_in",
+        "total_s",
+        "max_s",
+        "buckets",
+        "callers",
+    )
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.coalesced = 0
+        self.cached = 0
+        self.failed = 0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.buckets: List[int] = [0] * _BUCKET_COUNT
+        self.callers: Dict[str, int] = {}
+
+    def percentile_ms(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                return round(min(_bucket_upper_ms(index), self.max_s * 1000), 3)
+        return round(self.max_s * 1000, 3)
+
+    def as_dict(self) -> Dict[str, Any]:
+        mean_ms = self.total_s * 1000 / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "coalesced": self.coalesced,
+            "cached": self.cached,
+            "failed": self.failed,
+            "bytes_out": self.bytes_out,
+            "bytes_in": self.bytes_in,
+            "total_ms": round(self.total_s * 1000, 3),
+            "mean_ms": round(mean_ms, 3),
+            "p50_ms": self.percentile_ms(0.50),
+            "p95_ms": self.percentile_ms(0.95),
+            "p99_ms": self.percentile_ms(0.99),
+            "max_ms": round(self.max_s * 1000, 3),
+            "histogram_ms": {
+                f"{_bucket_upper_ms(i):.3f}": n
+                for i, n in enumerate(self.buckets)
+                if n
+            },
+            "callers": dict(sorted(self.callers.items(), key=lambda kv: -kv[1])),
+        }
+
+
+class HyprlandMetrics:
+    """
+    Per-command counters and latency histograms for Hyprland IPC.
+
+    Every request going through `Hyprland.send_command` (once `install()`ed,
+    which also covers fabric's own widgets) or HyprlandQuery is recorded with
+    its payload sizes, round-trip time and the widget that asked for it.
+    Requests answered from an in-flight or cached reply count as `coalesced`
+    / `cached` without a latency sample. `dump()` writes everything as JSON.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        if getattr(self, "_initialized", False):
+            return
+        self._initialized = True
+        self.started = time.time()
+        self._commands: Dict[str, _CommandStats] = {}
+        self._callers: Dict[str, Dict[str, float]] = {}
+        self._original_send = None
+
+    # ----------------------------
+    # Recording
+    # ----------------------------
+    def _stats(self, command: str) -> _CommandStats:
+        key = command_key(command)
+        stats = self._commands.get(key)
+        if stats is None:
+            stats = self._commands[key] = _CommandStats()
+        return stats
+
+    def record(
+        self,
+        command: str,
+        caller: str,
+        seconds: float,
+        bytes_in: int,
+        failed: bool = False,
+    ) -> None:
+        stats = self._stats(command)
+        stats.count += 1
+        stats.failed += failed
+        stats.bytes_out += len(command)
+        stats.bytes_in += bytes_in
+        stats.total_s += seconds
+        stats.max_s = max(stats.max_s, seconds)
+        stats.buckets[_bucket(seconds)] += 1
+        stats.callers[caller] = stats.callers.get(caller, 0) + 1
+
+        per_caller = self._callers.get(caller)
+        if per_caller is None:
+            per_caller = self._callers[caller] = {"count": 0, "total_ms": 0.0}
+        per_caller["count"] += 1
+        per_caller["total_ms"] += seconds * 1000
+
+    def record_shared(self, command: str, caller: str, cached: bool) -> None:
+        """A request answered without a round trip of its own"""
+        stats = self._stats(command)
+        if cached:
+            stats.cached += 1
+        else:
+            stats.coalesced += 1
+        stats.callers[caller] = stats.callers.get(caller, 0) + 1
+
+    # ----------------------------
+    # fabric hook
+    # ----------------------------
+    def install(self) -> None:
+        """Time every `Hyprland.send_command` (idempotent)"""
+        if self._original_send is not None:
+            return
+        original = self._original_send = Hyprland.send_command
+
+        def send_command(command: str, *args, **kwargs):
+            caller = caller_name()
+            start = time.perf_counter()
+            try:
+                reply = original(command, *args, **kwargs)
+            except Exception:
+                elapsed = time.perf_counter() - start
+                self.record(command, caller, elapsed, 0, failed=True)
+                raise
+            elapsed = time.perf_counter() - start
+            data = getattr(reply, "reply", b"") or b""
+            self.record(command, caller, elapsed, len(data))
+            return reply
+
+        Hyprland.send_command = staticmethod(send_command)  # type: ignore[assignment]
+
+    # ----------------------------
+    # Reports
+    # ----------------------------
+    def snapshot(self) -> Dict[str, Any]:
+        commands = sorted(self._commands.items(), key=lambda kv: -kv[1].total_s)
+        callers = sorted(self._callers.items(), key=lambda kv: -kv[1]["total_ms"])
+        return {
+            "since": self.started,
+            "uptime_s": round(time.time() - self.started, 1),
+            "commands": {key: stats.as_dict() for key, stats in commands},
+            "callers": {
+                name: {"count": int(v["count"]), "total_ms": round(v["total_ms"], 3)}
+                for name, v in callers
+            },
+        }
+
+    def dump(self, path: Optional[Path] = None) -> Path:
+        from services.hyprland_events import HyprlandEventHub
+
+        path = Path(path or DUMP_PATH)
+        data = self.snapshot()
+        data["events"] = HyprlandEventHub().stats()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        logger.info(f"[HyprlandMetrics] IPC stats written to {path}")
+        return path
@@ -0,0 +1,191 @@
+import json
+import os
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fabric.utils import GLib
+from gi.repository import Gio  # type: ignore
+from loguru import logger
+
+from services.hyprland_metrics import HyprlandMetrics, caller_name
+
+READ_CHUNK = 64 * 1024
+
+
+def command_socket_path() -> str:
+    """Hyprland request socket (`.socket.sock`) of the running instance"""
+    signature = os.environ.get("HYPRLAND_INSTANCE_SIGNATURE", "")
+    runtime = os.environ.get("XDG_RUNTIME_DIR", f"/run/user/{os.getuid()}")
+    path = Path(runtime) / "hypr" / signature / ".socket.sock"
+    if not path.exists():
+        legacy = Path("/tmp/hypr") / signature / ".socket.sock"
+        if legacy.exists():
+            return str(legacy)
+    return str(path)
+
+
+class HyprlandQuery:
+    """
+    Non-blocking Hyprland requests on the GTK main loop (Gio socket I/O).
+
+    `query("j/clients", callback)` returns a Future and calls `callback(result)`
+    on the main loop once the reply arrived (`j/` replies are decoded JSON,
+    anything else the reply text; None on failure). Identical requests already
+    in flight share one round trip, and `ttl` (seconds) lets a caller accept a
+    reply that is at most that old without asking the compositor again.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        if getattr(self, "_initialized", False):
+            return
+        self._initialized = True
+        self._client = Gio.SocketClient.new()
+        self._inflight: Dict[str, Future] = {}
+        # command -> (perf_counter at send, caller) of the request in flight
+        self._started: Dict[str, Tuple[float, str]] = {}
+        self.metrics = HyprlandMetrics()
+        # command -> (monotonic time of reply, decoded reply)
+        self._replies: Dict[str, Tuple[float, Any]] = {}
+
+    # ----------------------------
+    # API
+    # ----------------------------
+    def query(
+        self,
+        command: str,
+        callback: Optional[Callable[[Any], None]] = None,
+        ttl: float = 0.0,
+    ) -> Future:
+        future = self._request(command, ttl, caller_name())
+        if callback is not None:
+            future.add_done_callback(lambda f: self._deliver(command, f, callback))
+        return future
+
+    def cached(self, command: str, ttl: float) -> Any:
+        """Last reply to `command` if it is at most `ttl` seconds old, else None"""
+        entry = self._replies.get(command)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+        return None
+
+    @staticmethod
+    def _deliver(command: str, future: Future, callback: Callable[[Any], None]) -> None:
+        error = future.exception()
+        if error is not None:
+            logger.warning(f"[HyprlandQuery] {command} failed: {error}")
+        try:
+            callback(None if error is not None else future.result())
+        except Exception:
+            logger.exception(f"[HyprlandQuery] Callback for {command} failed")
+
+    # ----------------------------
+    # Request lifecycle
+    # ----------------------------
+    def _request(self, command: str, ttl: float, caller: str) -> Future:
+        if ttl > 0:
+            entry = self._replies.get(command)
+            if entry is not None and time.monotonic() - entry[0] < ttl:
+                self.metrics.record_shared(command, caller, cached=True)
+                future: Future = Future()
+                future.set_result(entry[1])
+                return future
+
+        future = self._inflight.get(command)  # type: ignore[assignment]
+        if future is not None:
+            self.metrics.record_shared(command, caller, cached=False)
+            return future
+
+        future = Future()
+        self._inflight[command] = future
+        self._started[command] = (time.perf_counter(), caller)
+        try:
+            address = Gio.UnixSocketAddress.new(command_socket_path())
+            self._client.connect_async(
+                address, None, self._on_connected, (command, future)
+            )
+        except Exception as e:
+            self._finish(command, future, error=e)
+        return future
+
+    def _on_connected(self, client, result, data) -> None:
+        command, future = data
+        try:
+            conn = client.connect_finish(result)
+            conn.get_output_stream().write_all_async(
+                command.encode("utf-8"),
+                GLib.PRIORITY_DEFAULT,
+                None,
+                self._on_written,
+                (conn, command, future),
+            )
+        except Exception as e:
+            self._finish(command, future, error=e)
+
+    def _on_written(self, stream, result, data) -> None:
+        conn, command, future = data
+        try:
+            stream.write_all_finish(result)
+            self._read_next(conn, command, future, [])
+        except Exception as e:
+            conn.close()
+            self._finish(command, future, error=e)
+
+    def _read_next(self, conn, command: str, future: Future, chunks: list) -> None:
+        conn.get_input_stream().read_bytes_async(
+            READ_CHUNK,
+            GLib.PRIORITY_DEFAULT,
+            None,
+            self._on_read,
+            (conn, command, future, chunks),
+        )
+
+    def _on_read(self, stream, result, data) -> None:
+        conn, command, future, chunks = data
+        try:
+            chunk = stream.read_bytes_finish(result)
+        except Exception as e:
+            conn.close()
+            self._finish(command, future, error=e)
+            return
+        if chunk.get_size() > 0:
+            chunks.append(chunk.get_data())
+            self._read_next(conn, command, future, chunks)
+            return
+        # the compositor closes the connection after the reply
+        conn.close()
+        self._finish(command, future, payload=b"".join(chunks))
+
+    def _finish(
+        self,
+        command: str,
+        future: Future,
+        payload: bytes = b"",
+        error: Optional[BaseException] = None,
+    ) -> None:
+        self._inflight.pop(command, None)
+        started = self._started.pop(command, None)
+        if started is not None:
+            elapsed = time.perf_counter() - started[0]
+            self.metrics.record(
+                command, started[1], elapsed, len(payload), failed=error is not None
+            )
+        if error is None:
+            try:
+                text = payload.decode("utf-8", errors="ignore")
+                value = json.loads(text) if command.startswith("j/") else text
+            except Exception as e:
+                error = e
+        if error is not None:
+            future.set_exception(error)
+            return
+        self._replies[command] = (time.monotonic(), value)
+        future.set_result(value)
@@ -0,0 +1,437 @@
+import json
+from typing import Any, Dict, List, Optional, Set
+
+from fabric import Service, Signal
+from fabric.hyprland.service import Hyprland, HyprlandEvent
+from fabric.utils import GLib
+from loguru import logger
+
+from services.hyprland_events import HyprlandEventHub
+from services.hyprland_query import HyprlandQuery
+
+# safety net for anything the event stream does not describe (geometry, pid...)
+RESYNC_INTERVAL_S = 30
+
+# events after which only a full query gives correct data
+RESYNC_EVENTS = (
+    "monitoradded",
+    "monitoraddedv2",
+    "monitorremoved",
+    "configreloaded",
+)
+
+# openwindow does not report geometry or floating: resync once a burst settles
+OPENWINDOW_RESYNC_MS = 250
+
+RESYNC_QUERIES = ("j/clients", "j/workspaces", "j/monitors", "j/activewindow")
+
+MONITOR_GEOMETRY_KEYS = ("x", "y", "width", "height", "scale", "transform")
+
+
+def _address(raw: str) -> str:
+    raw = raw.strip()
+    return raw if raw.startswith("0x") else f"0x{raw}"
+
+
+def _class_of(client: Dict[str, Any]) -> str:
+    return client.get("initialClass") or client.get("class") or ""
+
+
+class HyprlandState(Service):
+    """
+    In-memory mirror of Hyprland clients, workspaces and monitors.
+
+    Seeded with one `j/clients` + `j/workspaces` + `j/monitors` round, then kept
+    up to date from socket2 events (via HyprlandEventHub) with indexes by
+    address, class, workspace and monitor. Fields no event reports (window
+    geometry, pid...) are as of the last resync: every RESYNC_INTERVAL_S, on
+    monitor/config events, shortly after windows open, or on demand with
+    `resync()`. A window that opened since the last resync has `at`, `size`
+    and `floating` set to None: query Hyprland when those matter.
+
+    Returned dicts are shared with the mirror: treat them as read-only.
+    """
+
+    @Signal
+    def changed(self) -> None:
+        """Signal emitted after the mirror applied an event or a resync."""
+
+    @Signal
+    def monitors_changed(self) -> None:
+        """Signal emitted when a resync found different monitor geometry."""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, **kwargs):
+        if getattr(self, "_initialized", False):
+            return
+        super().__init__(**kwargs)
+        self._initialized = True
+
+        self._clients: Dict[str, Dict[str, Any]] = {}
+        self._by_class: Dict[str, Set[str]] = {}
+        self._by_workspace: Dict[int, Set[str]] = {}
+        self._by_monitor: Dict[int, Set[str]] = {}
+        self._class_counts: Dict[str, int] = {}
+
+        self._workspaces: Dict[int, Dict[str, Any]] = {}
+        self._monitors: Dict[int, Dict[str, Any]] = {}
+        self._active_address: Optional[str] = None
+        self._openwindow_resync_id: Optional[int] = None
+
+        self.resync()
+
+        handlers = {
+            "openwindow": self._on_openwindow,
+            "closewindow": self._on_closewindow,
+            "movewindowv2": self._on_movewindow,
+            "changefloatingmode": self._on_floating,
+            "windowtitlev2": self._on_title,
+            "activewindowv2": self._on_activewindow,
+            "workspacev2": self._on_workspace,
+            "focusedmon": self._on_focusedmon,
+            "createworkspacev2": self._on_createworkspace,
+            "destroyworkspacev2": self._on_destroyworkspace,
+            "moveworkspacev2": self._on_moveworkspace,
+            "renameworkspace": self._on_renameworkspace,
+        }
+        hub = HyprlandEventHub()
+        for name, handler in handlers.items():
+            hub.subscribe(name, self._applying(handler))
+        hub.subscribe_many(RESYNC_EVENTS, lambda _event: self.resync_async())
+
+        GLib.timeout_add_seconds(RESYNC_INTERVAL_S, self._periodic_resync)
+
+    # ----------------------------
+    # Queries
+    # ----------------------------
+    def clients(self) -> List[Dict[str, Any]]:
+        return list(self._clients.values())
+
+    def client(self, address: str) -> Optional[Dict[str, Any]]:
+        return self._clients.get(_address(address))
+
+    def clients_for_class(self, name: str) -> List[Dict[str, Any]]:
+        """Clients whose initialClass (or class) matches `name`, case-insensitive"""
+        return [self._clients[a] for a in self._by_class.get(name.lower(), ())]
+
+    def clients_on_workspace(self, workspace_id: int) -> List[Dict[str, Any]]:
+        return [self._clients[a] for a in self._by_workspace.get(workspace_id, ())]
+
+    def clients_on_monitor(self, monitor_id: int) -> List[Dict[str, Any]]:
+        return [self._clients[a] for a in self._by_monitor.get(monitor_id, ())]
+
+    def class_counts(self) -> Dict[str, int]:
+        """initialClass (or class) -> number of windows"""
+        return dict(self._class_counts)
+
+    def active_address(self) -> Optional[str]:
+        return self._active_address
+
+    def active_client(self) -> Optional[Dict[str, Any]]:
+        if self._active_address is None:
+            return None
+        return self._clients.get(self._active_address)
+
+    def workspaces(self) -> List[Dict[str, Any]]:
+        return list(self._workspaces.values())
+
+    def monitors(self) -> List[Dict[str, Any]]:
+        return list(self._monitors.values())
+
+    def focused_monitor(self) -> Optional[Dict[str, Any]]:
+        return next((m for m in self._monitors.values() if m.get("focused")), None)
+
+    def active_workspace_id(self) -> Optional[int]:
+        mon = self.focused_monitor() or {}
+        wid = (mon.get("activeWorkspace") or {}).get("id")
+        return int(wid) if wid is not None else None
+
+    # ----------------------------
+    # Full resync
+    # ----------------------------
+    @staticmethod
+    def _query(cmd: str) -> Any:
+        try:
+            reply = Hyprland.send_command(cmd)
+            if not reply.reply:
+                return None
+            return json.loads(reply.reply.decode())
+        except Exception as e:
+            logger.warning(f"[HyprlandState] {cmd} failed: {e}")
+            return None
+
+    def resync(self) -> None:
+        """Replace the mirror with a fresh `j/clients`, `j/workspaces` and `j/monitors`"""
+        self._apply_resync({cmd: self._query(cmd) for cmd in RESYNC_QUERIES})
+
+    def resync_async(self) -> None:
+        """`resync()` without blocking the main loop; concurrent calls share replies"""
+        replies: Dict[str, Any] = {}
+
+        def on_reply(cmd: str, data: Any) -> None:
+            replies[cmd] = data
+            if len(replies) == len(RESYNC_QUERIES):
+                self._apply_resync(replies)
+
+        query = HyprlandQuery()
+        for cmd in RESYNC_QUERIES:
+            query.query(cmd, lambda data, cmd=cmd: on_reply(cmd, data))
+
+    def _apply_resync(self, replies: Dict[str, Any]) -> None:
+        clients = replies.get("j/clients")
+        workspaces = replies.get("j/workspaces")
+        monitors = replies.get("j/monitors")
+
+        if isinstance(monitors, list):
+            previous = self._monitor_geometry()
+            self._monitors = {int(m.get("id", 0)): m for m in monitors}
+            monitors_changed = self._monitor_geometry() != previous
+        else:
+            monitors_changed = False
+        if isinstance(workspaces, list):
+            self._workspaces = {int(w.get("id", 0)): w for w in workspaces}
+        if isinstance(clients, list):
+            self._clients = {}
+            self._by_class.clear()
+            self._by_workspace.clear()
+            self._by_monitor.clear()
+            self._class_counts.clear()
+            for c in clients:
+                if c.get("address"):
+                    self._add(c)
+
+        active = replies.get("j/activewindow")
+        if isinstance(active, dict) and active.get("address"):
+            self._active_address = active["address"]
+        self.emit("changed")
+        if monitors_changed:
+            self.emit("monitors-changed")
+
+    def _monitor_geometry(self) -> Dict[int, tuple]:
+        return {
+            mid: tuple(m.get(k) for k in MONITOR_GEOMETRY_KEYS)
+            for mid, m in self._monitors.items()
+        }
+
+    def _schedule_openwindow_resync(self) -> None:
+        if self._openwindow_resync_id is None:
+            self._openwindow_resync_id = GLib.timeout_add(
+                OPENWINDOW_RESYNC_MS, self._openwindow_resync
+            )
+
+    def _openwindow_resync(self) -> bool:
+        self._openwindow_resync_id = None
+        self.resync_async()
+        return False
+
+    def _periodic_resync(self) -> bool:
+        self.resync_async()
+        return True
+
+    # ----------------------------
+    # Indexes
+    # ----------------------------
+    def _index(self, client: Dict[str, Any]) -> None:
+        addr = client["address"]
+        name = _class_of(client)
+        self._by_class.setdefault(name.lower(), set()).add(addr)
+        if name:
+            self._class_counts[name] = self._class_counts.get(name, 0) + 1
+        wid = (client.get("workspace") or {}).get("id")
+        if wid is not None:
+            self._by_workspace.setdefault(int(wid), set()).add(addr)
+        mid = client.get("monitor")
+        if mid is not None:
+            self._by_monitor.setdefault(int(mid), set()).add(addr)
+
+    def _unindex(self, client: Dict[str, Any]) -> None:
+        addr = client["address"]
+        name = _class_of(client)
+        self._discard(self._by_class, name.lower(), addr)
+        if name in self._class_counts:
+            self._class_counts[name] -= 1
+            if self._class_counts[name] <= 0:
+                del self._class_counts[name]
+        wid = (client.get("workspace") or {}).get("id")
+        if wid is not None:
+            self._discard(self._by_workspace, int(wid), addr)
+        mid = client.get("monitor")
+        if mid is not None:
+            self._discard(self._by_monitor, int(mid), addr)
+
+    @staticmethod
+    def _discard(index: Dict[Any, Set[str]], key: Any, addr: str) -> None:
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.discard(addr)
+            if not bucket:
+                del index[key]
+
+    def _add(self, client: Dict[str, Any]) -> None:
+        old = self._clients.get(client["address"])
+        if old is not None:
+            self._unindex(old)
+        self._clients[client["address"]] = client
+        self._index(client)
+
+    def _update_client(self, address: str, **fields: Any) -> None:
+        client = self._clients.get(address)
+        if client is None:
+            return
+        self._unindex(client)
+        client.update(fields)
+        self._index(client)
+
+    def _workspace_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        return next((w for w in self._workspaces.values() if w.get("name") == name), None)
+
+    def _monitor_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        return next((m for m in self._monitors.values() if m.get("name") == name), None)
+
+    # ----------------------------
+    # Events
+    # ----------------------------
+    def _applying(self, handler):
+        def apply(event: HyprlandEvent) -> None:
+            try:
+                handler(event.data)
+            except Exception as e:
+                # the periodic resync repairs whatever the event left behind
+                logger.debug(f"[HyprlandState] Cannot apply {event.name}: {e}")
+                return
+            self.emit("changed")
+
+        return apply
+
+    def _on_openwindow(self, data: List[str]) -> None:
+        # ADDRESS,WORKSPACENAME,CLASS,TITLE (title may contain commas)
+        addr = _address(data[0])
+        ws_name, cls = data[1], data[2]
+        title = ",".join(data[3:])
+        ws = self._workspace_by_name(ws_name) or {}
+        self._add(
+            {
+                "address": addr,
+                "mapped": True,
+                "hidden": False,
+                # unknown until the resync scheduled below
+                "at": None,
+                "size": None,
+                "workspace": {"id": ws.get("id"), "name": ws_name},
+                "floating": None,
+                "monitor": ws.get("monitorID"),
+                "class": cls,
+                "title": title,
+                "initialClass": cls,
+                "initialTitle": title,
+                "pid": -1,
+            }
+        )
+        if ws:
+            ws["windows"] = ws.get("windows", 0) + 1
+        self._schedule_openwindow_resync()
+
+    def _on_closewindow(self, data: List[str]) -> None:
+        addr = _address(data[0])
+        client = self._clients.pop(addr, None)
+        if client is None:
+            return
+        self._unindex(client)
+        wid = (client.get("workspace") or {}).get("id")
+        ws = self._workspaces.get(int(wid)) if wid is not None else None
+        if ws and ws.get("windows", 0) > 0:
+            ws["windows"] -= 1
+        if self._active_address == addr:
+            self._active_address = None
+
+    def _on_movewindow(self, data: List[str]) -> None:
+        # ADDRESS,WORKSPACEID,WORKSPACENAME
+        addr = _address(data[0])
+        wid, ws_name = int(data[1]), ",".join(data[2:])
+        client = self._clients.get(addr)
+        if client is None:
+            return
+        old_wid = (client.get("workspace") or {}).get("id")
+        old_ws = self._workspaces.get(int(old_wid)) if old_wid is not None else None
+        if old_ws and old_ws.get("windows", 0) > 0:
+            old_ws["windows"] -= 1
+        ws = self._workspaces.get(wid)
+        if ws is not None:
+            ws["windows"] = ws.get("windows", 0) + 1
+        self._update_client(
+            addr,
+            workspace={"id": wid, "name": ws_name},
+            monitor=(ws or {}).get("monitorID", client.get("monitor")),
+        )
+
+    def _on_floating(self, data: List[str]) -> None:
+        self._update_client(_address(data[0]), floating=data[1] == "1")
+
+    def _on_title(self, data: List[str]) -> None:
+        client = self._clients.get(_address(data[0]))
+        if client is not None:
+            client["title"] = ",".join(data[1:])
+
+    def _on_activewindow(self, data: List[str]) -> None:
+        raw = data[0] if data else ""
+        self._active_address = _address(raw) if raw.strip() else None
+
+    def _on_workspace(self, data: List[str]) -> None:
+        # ID,NAME on the focused monitor
+        mon = self.focused_monitor()
+        if mon is not None:
+            mon["activeWorkspace"] = {"id": int(data[0]), "name": ",".join(data[1:])}
+
+    def _on_focusedmon(self, data: List[str]) -> None:
+        # MONNAME,WORKSPACENAME
+        target = self._monitor_by_name(data[0])
+        if target is None:
+            return
+        for mon in self._monitors.values():
+            mon["focused"] = mon is target
+        ws = self._workspace_by_name(",".join(data[1:]))
+        if ws is not None:
+            target["activeWorkspace"] = {"id": ws["id"], "name": ws.get("name")}
+
+    def _on_createworkspace(self, data: List[str]) -> None:
+        wid = int(data[0])
+        mon = self.focused_monitor() or {}
+        self._workspaces.setdefault(
+            wid,
+            {
+                "id": wid,
+                "name": ",".join(data[1:]),
+                "monitor": mon.get("name", ""),
+                "monitorID": mon.get("id"),
+                "windows": 0,
+            },
+        )
+
+    def _on_destroyworkspace(self, data: List[str]) -> None:
+        self._workspaces.pop(int(data[0]), None)
+
+    def _on_moveworkspace(self, data: List[str]) -> None:
+        # ID,NAME,MONNAME
+        wid = int(data[0])
+        mon = self._monitor_by_name(data[-1])
+        ws = self._workspaces.get(wid)
+        if ws is None or mon is None:
+            return
+        ws["monitor"] = mon.get("name")
+        ws["monitorID"] = mon.get("id")
+        for addr in list(self._by_workspace.get(wid, ())):
+            self._update_client(addr, monitor=mon.get("id"))
+
+    def _on_renameworkspace(self, data: List[str]) -> None:
+        ws = self._workspaces.get(int(data[0]))
+        if ws is None:
+            return
+        ws["name"] = ",".join(data[1:])
+        for addr in self._by_workspace.get(ws["id"], ()):
+            self._clients[addr]["workspace"] = {"id": ws["id"], "name": ws["name"]}
@@ -0,0 +1,45 @@
+from fabric import Service, Signal
+from loguru import logger
+
+from utils.colors_parse import colors, theme_colors
+
+
+class ThemeService(Service):
+    """Active color theme. Swaps `utils.colors_parse.colors` and notifies SVG producers."""
+
+    @Signal
+    def colors_changed(self) -> None:
+        """Signal emitted after `colors` holds the new theme's table."""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, **kwargs):
+        if getattr(self, "_initialized", False):
+            return
+        super().__init__(**kwargs)
+        self._initialized = True
+        self.theme: str | None = None
+
+    def set_theme(self, theme: str) -> None:
+        if theme == self.theme:
+            return
+        try:
+            table = theme_colors(theme)
+        except Exception as e:
+            logger.error(f"[Theme] Cannot load colors for '{theme}': {e}")
+            return
+
+        first = self.theme is None
+        self.theme = theme
+        if table == colors:
+            return
+        colors.clear()
+        colors.update(table)
+        if not first:
+            logger.info(f"[Theme] Switched colors to '{theme}'.")
+        self.emit("colors-changed")
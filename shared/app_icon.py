@@ -1,22 +1,20 @@
-from typing import Optional, List, Dict, Tuple
+from typing import Optional, List
 from pathlib import Path
 import re
 
-from fabric.utils.helpers import get_desktop_applications, DesktopApp
+from fabric.utils import GLib
+from fabric.utils.helpers import DesktopApp
 from fabric.widgets.image import Image
 from fabric.widgets.box import Box
 
-from gi.repository import GLib, Gtk, GdkPixbuf  # type: ignore
+from gi.repository import Gtk, GdkPixbuf  # type: ignore
 
+from services.desktop_entries import DesktopEntry, DesktopEntryIndex
+from services.desktop_entries import normalize as _normalize
+from services.desktop_entries import token_set as _token_set
+from utils.app_resolution_cache import AppResolutionCache
 from utils.constants import Const
-
-
-def _normalize(s: str) -> str:
-    return re.sub(r"[^a-z0-9]+", "", (s or "").casefold())
-
-
-def _token_set(s: str) -> set:
-    return set(p for p in re.split(r"[^a-z0-9]+", (s or "").casefold()) if p)
+from utils.icon_cache import IconCache
 
 
 class AppIcon(Box):
@@ -25,6 +23,7 @@ class AppIcon(Box):
         app_name: str,
         include_hidden: bool = False,
         icon_size: int = 48,
+        lazy: bool = False,
         **kwargs,
     ):
         super().__init__(**kwargs)
@@ -32,26 +31,89 @@ class AppIcon(Box):
         self.query = (app_name or "").strip()
         self.include_hidden = include_hidden
         self.icon_size = int(icon_size or 48)
+        self._app: Optional[DesktopApp] = None
+        self._load_id: Optional[int] = None
+
+        # pixbufs are loaded at 1x (load_icon has no scale), so size alone keys them
+        key = (self.query, self.icon_size, include_hidden)
+        # lazy: placeholder now, resolve an uncached icon once the loop is idle
+        if lazy and not IconCache().contains(key):
+            self._set_pixbuf(None)
+            self._load_id = GLib.idle_add(
+                self._load_later, key, priority=GLib.PRIORITY_LOW
+            )
+            self.connect("destroy", self._on_destroy)
+        else:
+            self._set_pixbuf(IconCache().pixbuf(key, self._resolve_pixbuf))
+
+    @property
+    def app(self) -> Optional[DesktopApp]:
+        """DesktopApp the icon belongs to, looked up on first access"""
+        if self._app is None:
+            self._app = self._app_from_cache() or self._find_app()
+        return self._app
+
+    def _app_from_cache(self) -> Optional[DesktopApp]:
+        desktop_id = AppResolutionCache().get(self.query, "desktop_id")
+        if not desktop_id:
+            return None
+        for app in IconCache().applications(self.include_hidden):
+            info = getattr(app, "_app", None)
+            if info is not None and info.get_id() == desktop_id:
+                return app
+        return None
+
+    def _set_pixbuf(self, pixbuf: Optional[GdkPixbuf.Pixbuf]) -> None:
+        if pixbuf is not None:
+            self.children = Image(pixbuf=pixbuf)
+        else:
+            self.children = Image(
+                image_file=Const.PLACEHOLDER_IMAGE_GHOST.as_posix(), size=self.icon_size
+            )
 
-        self.app: Optional[DesktopApp] = self._find_app()
+        self.show_all()
+
+    def _load_later(self, key) -> bool:
+        self._load_id = None
+        pixbuf = IconCache().pixbuf(key, self._resolve_pixbuf)
+        if pixbuf is not None:
+            self._set_pixbuf(pixbuf)
+        return False
+
+    def _on_destroy(self, *_) -> None:
+        if self._load_id is not None:
+            GLib.source_remove(self._load_id)
+            self._load_id = None
+
+    def _resolve_pixbuf(self) -> Optional[GdkPixbuf.Pixbuf]:
+        cache = AppResolutionCache()
+        cached_icon = cache.get(self.query, "icon")
+        if cached_icon:
+            pixbuf = self._load_icon_pixbuf(cached_icon, self.icon_size)
+            if pixbuf is not None:
+                return pixbuf
+
+        self._app = self._find_app()
 
         pixbuf = None
+        icon_used: Optional[str] = None
 
-        if self.app:
+        if self._app:
             try:
-                pixbuf = self.app.get_icon_pixbuf(self.icon_size)
+                pixbuf = self._app.get_icon_pixbuf(self.icon_size)
+                icon_used = getattr(self._app, "icon_name", None)
             except Exception:
                 pixbuf = None
 
         if pixbuf is None:
             candidates = []
-            if self.app:
-                if getattr(self.app, "icon_name", None):
-                    candidates.append(self.app.icon_name)
-                if getattr(self.app, "name", None):
-                    candidates.append(self.app.name)
-                if getattr(self.app, "generic_name", None):
-                    candidates.append(self.app.generic_name)
+            if self._app:
+                if getattr(self._app, "icon_name", None):
+                    candidates.append(self._app.icon_name)
+                if getattr(self._app, "name", None):
+                    candidates.append(self._app.name)
+                if getattr(self._app, "generic_name", None):
+                    candidates.append(self._app.generic_name)
             candidates.append(self.query)
 
             icon_name = None
@@ -60,26 +122,27 @@ class AppIcon(Box):
                 if icon_name:
                     pixbuf = self._load_icon_pixbuf(icon_name, self.icon_size)
                     if pixbuf:
+                        icon_used = icon_name
                         break
                     icon_name = None
 
             if pixbuf is None:
-                desktop_path = self._get_desktop_file(self.query)
-                if desktop_path:
-                    icon_from_desktop = self._get_icon_from_desktop_file(desktop_path)
+                entry = self._get_desktop_entry(self.query)
+                if entry:
+                    icon_from_desktop = entry.icon
                     if icon_from_desktop:
                         pixbuf = self._load_icon_pixbuf(
                             icon_from_desktop, self.icon_size
                         )
+                        if pixbuf is not None:
+                            icon_used = icon_from_desktop
 
-        if pixbuf is not None:
-            self.children = Image(pixbuf=pixbuf)
-        else:
-            self.children = Image(
-                image_file=Const.PLACEHOLDER_IMAGE_GHOST.as_posix(), size=self.icon_size
-            )
-
-        self.show_all()
+        if pixbuf is not None and icon_used:
+            app_id = None
+            if self._app and getattr(self._app, "_app", None):
+                app_id = self._app._app.get_id()
+            cache.update(self.query, icon=icon_used, desktop_id=app_id)
+        return pixbuf
 
     def _find_app(self) -> Optional[DesktopApp]:
         matches = self._find_app_by_partial_name(self.query, self.include_hidden)
@@ -91,7 +154,7 @@ class AppIcon(Box):
         q = (query or "").casefold()
         found: List[DesktopApp] = []
 
-        for app in get_desktop_applications(include_hidden):
+        for app in IconCache().applications(include_hidden):
             parts = [
                 (app.name or ""),
                 (app.display_name or ""),
@@ -187,13 +250,11 @@ class AppIcon(Box):
             except Exception:
                 continue
 
-        desktop_file = self._get_desktop_file(app_id)
-        if desktop_file:
-            info = self._parse_desktop_file(desktop_file)
-            icon_from_desktop = info.get("Icon")
-            if icon_from_desktop:
-                return icon_from_desktop
-            wm = info.get("StartupWMClass")
+        entry = self._get_desktop_entry(app_id)
+        if entry:
+            if entry.icon:
+                return entry.icon
+            wm = entry.wm_class
             if wm:
                 try:
                     if theme.has_icon(wm):
@@ -209,34 +270,8 @@ class AppIcon(Box):
 
         return ""
 
-    def _parse_desktop_file(self, path: str) -> Dict[str, str]:
-        data: Dict[str, str] = {}
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                in_entry = False
-                for raw in f:
-                    line = raw.strip()
-                    if not line or line.startswith("#"):
-                        continue
-                    if line.startswith("["):
-                        in_entry = line.lower().startswith("[desktop entry")
-                        continue
-                    if not in_entry:
-                        continue
-                    if "=" in line:
-                        k, v = line.split("=", 1)
-                        data[k.strip()] = v.strip()
-        except Exception:
-            pass
-        return data
-
-    def _get_icon_from_desktop_file(self, path: str) -> str:
-        parsed = self._parse_desktop_file(path)
-        icon = parsed.get("Icon", "")
-        return "".join(icon.split()) if icon else ""
-
-    def _score_desktop_file(self, query: str, parsed: Dict[str, str]) -> float:
-        """Return a score [0..1] how well parsed .desktop matches query."""
+    def _score_entry(self, query: str, entry: DesktopEntry) -> float:
+        """Return a score [0..1] how well a desktop entry matches query."""
         if not query:
             return 0.0
 
@@ -244,93 +279,63 @@ class AppIcon(Box):
         q_tokens = _token_set(query)
 
         # prefer StartupWMClass exact or near match
-        wm = parsed.get("StartupWMClass", "")
-        if wm:
-            wm_norm = _normalize(wm)
-            if wm_norm and (
-                wm_norm == q_norm or wm_norm in q_norm or q_norm in wm_norm
-            ):
-                return 1.0
-            wm_tokens = _token_set(wm)
-            inter = q_tokens.intersection(wm_tokens)
-            if inter:
-                return 0.9
+        wm_norm = entry.wm_norm
+        if wm_norm and (wm_norm == q_norm or wm_norm in q_norm or q_norm in wm_norm):
+            return 1.0
+        if q_tokens.intersection(entry.wm_tokens):
+            return 0.9
 
         # prefer exact name match
-        name = parsed.get("Name", "")
-        if name:
-            name_norm = _normalize(name)
-            if name_norm and (
-                name_norm == q_norm or name_norm in q_norm or q_norm in name_norm
-            ):
-                return 0.95
+        name_norm = entry.name_norm
+        if name_norm and (
+            name_norm == q_norm or name_norm in q_norm or q_norm in name_norm
+        ):
+            return 0.95
 
         # Exec match by binary name
-        exec_line = parsed.get("Exec", "")
-        if exec_line:
-            exec_bin = exec_line.split()[0]
-            exec_base = Path(exec_bin).name
-            if _normalize(exec_base) and (
-                _normalize(exec_base) == q_norm
-                or _normalize(exec_base) in q_norm
-                or q_norm in _normalize(exec_base)
-            ):
-                return 0.93
-
-        # token overlap on Name/Icon/Keywords
-        fields = " ".join(
-            parsed.get(k, "")
-            for k in ("Name", "GenericName", "Keywords", "Comment", "Icon")
-        )
-        f_tokens = _token_set(fields)
+        exec_norm = entry.exec_norm
+        if exec_norm and (
+            exec_norm == q_norm or exec_norm in q_norm or q_norm in exec_norm
+        ):
+            return 0.93
+
+        # token overlap on Name/GenericName/Keywords/Comment/Icon
+        f_tokens = entry.tokens
         if not f_tokens:
             return 0.0
         inter = q_tokens.intersection(f_tokens)
         score = len(inter) / max(len(q_tokens.union(f_tokens)), 1)
         return float(score) * 0.8  # scale down
 
-    def _get_desktop_file(self, app_id: str) -> Optional[str]:
-        search_dirs = [Path(GLib.get_user_data_dir()) / "applications"]
-        search_dirs += [Path(d) / "applications" for d in GLib.get_system_data_dirs()]
-
+    def _get_desktop_entry(self, app_id: str) -> Optional[DesktopEntry]:
         query = (app_id or "").strip()
         if not query:
             return None
 
-        candidates: List[Path] = []
-        for dir_path in search_dirs:
-            if not dir_path.exists():
-                continue
-            try:
-                for f in dir_path.iterdir():
-                    if f.is_file():
-                        candidates.append(f)
-            except Exception:
-                continue
+        # an exact StartupWMClass / stem / Icon / Exec hit needs no scoring
+        index = DesktopEntryIndex()
+        exact = index.match(query)
+        if exact is not None:
+            return exact
 
-        best_score = 0.0
-        best_path: Optional[Path] = None
+        entries = index.entries()
 
-        # parse each desktop file once and score
-        for f in candidates:
-            try:
-                parsed = self._parse_desktop_file(str(f))
-            except Exception:
-                parsed = {}
-            score = self._score_desktop_file(query, parsed)
+        best_score = 0.0
+        best: Optional[DesktopEntry] = None
+        for entry in entries:
+            score = self._score_entry(query, entry)
             if score > best_score:
                 best_score = score
-                best_path = f
+                best = entry
 
         # accept if score reasonable
-        if best_score >= 0.25 and best_path:
-            return str(best_path)
+        if best_score >= 0.25 and best:
+            return best
 
         # fallback to filename partial match (old behaviour)
         q_lower = query.casefold()
-        for f in candidates:
-            name_no_ext = f.stem.casefold()
-            if q_lower in name_no_ext:
-                return str(f)
+        for entry in entries:
+            if q_lower in entry.stem.casefold():
+                return entry
 
         return None
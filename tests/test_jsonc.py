@@ -0,0 +1,148 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from utils.jsonc import JsoncParseError, _SpanIndex, jsonc
+
+
+class JsoncAppendTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "data.jsonc"
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def append(self, text: str, value) -> str:
+        self.path.write_text(text, encoding="utf-8")
+        self.assertTrue(jsonc.append(self.path, "pinned", value))
+        return self.path.read_text(encoding="utf-8")
+
+    def test_block_comment_only_array(self) -> None:
+        text = self.append('{"pinned": [ /* none */ ]}', 9)
+        self.assertEqual(text, '{"pinned": [ /* none */ 9]}')
+        self.assertEqual(jsonc.read(self.path), {"pinned": [9]})
+
+    def test_line_comment_only_array(self) -> None:
+        self.append('{"pinned": [ // none\n]}', "kitty")
+        self.assertEqual(jsonc.read(self.path), {"pinned": ["kitty"]})
+
+    def test_non_empty_array(self) -> None:
+        self.append('{"pinned": ["a" /* last */]}', "b")
+        self.assertEqual(jsonc.read(self.path), {"pinned": ["a", "b"]})
+
+
+CONFIG = """{
+  // dock
+  "dock": {
+    "size": 36, /* px */
+    "anchor": "bottom",
+    "pinned": ["kitty"],
+    "menu": {"open": false, "items": [1, 2]}
+  },
+  "theme": "dark", // trailing
+  "font": {"name": "Sans", "size": 11},
+}
+"""
+
+
+class JsoncSpanIndexTest(unittest.TestCase):
+    """Chained edits on one file, checked against a fresh parse of the text"""
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "config.jsonc"
+        self.path.write_text(CONFIG, encoding="utf-8")
+        self.expected = jsonc.loads(CONFIG)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def update(self, keypath: str, value) -> None:
+        self.assertTrue(jsonc.update(self.path, keypath, value))
+        d = self.expected
+        keys = keypath.split(".")
+        for k in keys[:-1]:
+            d = d[k]
+        d[keys[-1]] = value
+        self.check()
+
+    def check(self) -> None:
+        text = self.path.read_text(encoding="utf-8")
+        self.assertEqual(jsonc.loads(text), self.expected)
+        # every span the cached index resolves matches a rescan of the text
+        index = jsonc._index_for_path(self.path)
+        self.assertEqual(index.text, text)
+        fresh = _SpanIndex(text)
+        for keypath in fresh.spans:
+            self.assertEqual(index.get(keypath), fresh.get(keypath), keypath)
+
+    def test_edits_shift_later_values(self) -> None:
+        self.update("dock.size", 1234567)
+        self.update("dock.anchor", "left")
+        self.update("dock.size", 4)
+        self.update("theme", "a much longer theme name")
+        self.update("font.size", 9)
+        self.update("dock.anchor", "")
+        self.update("font.name", "Noto Sans Mono")
+        text = self.path.read_text(encoding="utf-8")
+        self.assertIn("// dock", text)
+        self.assertIn("/* px */", text)
+        self.assertIn("// trailing", text)
+
+    def test_replaced_object_is_rescanned(self) -> None:
+        self.update("dock.menu", {"open": True, "items": [], "title": "apps"})
+        self.update("dock.menu.title", "applications")
+        self.update("dock.menu.open", False)
+        self.update("dock.size", 48)
+        self.update("dock.menu", "off")
+        self.update("font.size", 12)
+
+    def test_appends_between_updates(self) -> None:
+        for name in ("firefox", "code", "thunar"):
+            self.assertTrue(jsonc.append(self.path, "dock.pinned", name))
+            self.expected["dock"]["pinned"].append(name)
+            self.check()
+            self.update("dock.anchor", name * 3)
+        self.update("dock.pinned", ["kitty"])
+        self.assertTrue(jsonc.append(self.path, "dock.pinned", "foot"))
+        self.expected["dock"]["pinned"].append("foot")
+        self.check()
+
+    def test_compaction_after_many_edits(self) -> None:
+        edits = _SpanIndex.COMPACT_EVERY * 2 + 5
+        for i in range(edits):
+            self.update("dock.size", 10 ** (i % 7))
+            self.update("theme", "t" * (i % 11))
+        index = jsonc._index_for_path(self.path)
+        self.assertLess(len(index.edits), _SpanIndex.COMPACT_EVERY)
+
+    def test_update_text_chain(self) -> None:
+        text = CONFIG
+        for keypath, value in (
+            ("dock.size", 100000),
+            ("dock.anchor", "top"),
+            ("dock.size", 1),
+            ("font.name", "Iosevka Term"),
+        ):
+            text = jsonc.update_text(text, keypath, value)
+            self.assertIsNotNone(text)
+        expected = jsonc.loads(CONFIG)
+        expected["dock"].update(size=1, anchor="top")
+        expected["font"]["name"] = "Iosevka Term"
+        self.assertEqual(jsonc.loads(text), expected)
+        self.assertIsNone(jsonc.update_text(text, "dock.missing", 1))
+
+
+class JsoncReadErrorTest(unittest.TestCase):
+    def test_syntax_error_is_reported(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "broken.jsonc"
+            path.write_text('{"a": 1,, }', encoding="utf-8")
+            with self.assertRaises(JsoncParseError) as ctx:
+                jsonc.read(path)
+            self.assertIn("JSON parse error", ctx.exception.pretty())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import atexit
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fabric.utils import GLib
+from loguru import logger
+
+from utils.constants import Const
+
+CACHE_FILE = Const.APP_CACHE_DIR / "app-resolution.json"
+CACHE_FORMAT = 1
+SAVE_DELAY_S = 2
+
+FIELDS = ("desktop_id", "name", "icon", "exec")
+
+
+def application_dirs() -> List[Path]:
+    dirs = [Path(GLib.get_user_data_dir()) / "applications"]
+    dirs += [Path(d) / "applications" for d in GLib.get_system_data_dirs()]
+    return dirs
+
+
+def _dirs_stamp() -> Dict[str, int]:
+    stamp: Dict[str, int] = {}
+    for d in application_dirs():
+        try:
+            stamp[str(d)] = os.stat(d).st_mtime_ns
+        except OSError:
+            continue
+    return stamp
+
+
+def _key(window_class: str) -> str:
+    return (window_class or "").strip().casefold()
+
+
+class AppResolutionCache:
+    """
+    Persistent window class -> (desktop id, display name, icon, exec) map.
+
+    Each resolver (AppNameResolver, AppIcon, DockStationActions) fills in the
+    fields it computed for a class, so after a restart the first lookup is a
+    dict hit instead of a fuzzy scan over every .desktop file. The whole map
+    is dropped when any applications directory's mtime changed (an app was
+    installed, removed or renamed). Stored in Const.APP_CACHE_DIR.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        if getattr(self, "_initialized", False):
+            return
+        self._initialized = True
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._stamp = _dirs_stamp()
+        self._save_id: Optional[int] = None
+        self._dirty = False
+        self._load()
+        atexit.register(self.save)
+
+    # ----------------------------
+    # API
+    # ----------------------------
+    def get(self, window_class: str, field: str) -> Optional[str]:
+        entry = self._entries.get(_key(window_class))
+        return entry.get(field) if entry else None
+
+    def update(self, window_class: str, **fields: Optional[str]) -> None:
+        key = _key(window_class)
+        if not key:
+            return
+        entry = self._entries.setdefault(key, {})
+        changed = False
+        for field, value in fields.items():
+            if field in FIELDS and value and entry.get(field) != value:
+                entry[field] = value
+                changed = True
+        if changed:
+            self._schedule_save()
+
+    def invalidate(self) -> None:
+        """Forget everything (applications changed under us)"""
+        self._entries.clear()
+        self._stamp = _dirs_stamp()
+        self._schedule_save()
+
+    # ----------------------------
+    # Persistence
+    # ----------------------------
+    def _load(self) -> None:
+        try:
+            data = json.loads(CACHE_FILE.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"[AppResolutionCache] Ignoring unreadable cache: {e}")
+            return
+        if data.get("format") != CACHE_FORMAT or data.get("dirs") != self._stamp:
+            # apps were (un)installed since: resolve everything afresh
+            self._dirty = True
+            return
+        entries = data.get("entries")
+        if isinstance(entries, dict):
+            self._entries = entries
+
+    def _schedule_save(self) -> None:
+        self._dirty = True
+        if self._save_id is None:
+            self._save_id = GLib.timeout_add_seconds(SAVE_DELAY_S, self._save_later)
+
+    def _save_later(self) -> bool:
+        self._save_id = None
+        self.save()
+        return False
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        data = {"format": CACHE_FORMAT, "dirs": self._stamp, "entries": self._entries}
+        tmp = CACHE_FILE.with_name(f".{CACHE_FILE.name}.{os.getpid()}.tmp")
+        try:
+            CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, CACHE_FILE)
+            self._dirty = False
+        except Exception as e:
+            logger.warning(f"[AppResolutionCache] Could not save: {e}")
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
@@ -1,14 +1,12 @@
 import re
 from pathlib import Path
+from typing import Dict
 
 from utils.constants import Const
 
-scss = Path(Const.STYLESHEET_SCSS_DIR / "_theme.scss").read_text()
-
 pattern = r"\$([\w-]+):\s*([^;]+);"
-matches = re.findall(pattern, scss)
 
-col = {name: value.strip() for name, value in matches}
+THEMES_DIR = Const.STYLESHEET_SCSS_DIR / "themes"
 
 
 def resolve_var(name: str, colors_dict: dict, seen=None) -> str | None:
@@ -28,4 +26,30 @@ def resolve_var(name: str, colors_dict: dict, seen=None) -> str | None:
     return val
 
 
-colors = {k: resolve_var(k, col) or col[k] for k in col}
+def parse_colors(scss: str) -> Dict[str, str]:
+    """`$name: value;` pairs of a theme file, with `$other` references resolved"""
+    col = {name: value.strip() for name, value in re.findall(pattern, scss)}
+    return {k: resolve_var(k, col) or col[k] for k in col}
+
+
+# theme name -> (theme file mtime_ns, color table)
+_theme_tables: Dict[str, tuple[int, Dict[str, str]]] = {}
+
+
+def theme_colors(theme: str) -> Dict[str, str]:
+    """Color table of `themes/<theme>.scss`, parsed once per file version"""
+    path = THEMES_DIR / f"{theme}.scss"
+    mtime = path.stat().st_mtime_ns
+    cached = _theme_tables.get(theme)
+    if cached is None or cached[0] != mtime:
+        cached = _theme_tables[theme] = (mtime, parse_colors(path.read_text()))
+    return cached[1]
+
+
+def available_themes() -> list[str]:
+    return sorted(p.stem for p in THEMES_DIR.glob("*.scss"))
+
+
+# Active colors. Swapped in place on theme change (services.theme.ThemeService),
+# so `from utils.colors_parse import colors` always sees the current theme.
+colors = parse_colors(Path(Const.STYLESHEET_SCSS_DIR / "_theme.scss").read_text())
@@ -1,9 +1,13 @@
 from __future__ import annotations
 from pathlib import Path
 import sys
-from typing import Any, Dict, Optional, Set
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+from contextlib import contextmanager
+import hashlib
+import json
+import marshal
 import tempfile
-import shutil
+import threading
 import os
 from loguru import logger
 
@@ -12,9 +16,10 @@ from utils.constants import Const
 
 try:
     from jsonschema import (  # type: ignore
-        validate as jsonschema_validate,
         ValidationError as JsonSchemaValidationError,
+        validators as jsonschema_validators,
     )
+    from jsonschema.exceptions import best_match as jsonschema_best_match  # type: ignore
 
     JSONSCHEMA_AVAILABLE = True
 except Exception:
@@ -25,20 +30,88 @@ class ConfigError(Exception):
     pass
 
 
+# (path, mtime_ns, size, inode) of a file that contributed to a merged config.
+# Missing files are recorded with -1 fields so their creation is noticed too.
+Fingerprint = Tuple[str, int, int, int]
+
+
+def _fingerprint(path: Path) -> Fingerprint:
+    try:
+        st = path.stat()
+    except OSError:
+        return (str(path), -1, -1, -1)
+    return (str(path), st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+# Process-wide merged config snapshots, shared by every ConfigurationHandler.
+# key: (user config, default config, schema) -> (fingerprints, merged config)
+_SNAPSHOTS: Dict[
+    Tuple[str, str, str], Tuple[Tuple[Fingerprint, ...], Dict[str, Any]]
+] = {}
+_SNAPSHOTS_LOCK = threading.Lock()
+
+# schema file digest -> compiled validator (schema checked once per content)
+_VALIDATORS: Dict[str, Any] = {}
+# (schema digest, merged config digest) pairs that already passed validation
+_VALIDATED: Set[Tuple[str, str]] = set()
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _file_digest(path: Path) -> str:
+    try:
+        return _digest(path.read_bytes())
+    except OSError:
+        return ""
+
+
+# On-disk merged config cache (APP_CACHE_DIR), reused across restarts while
+# every file it was built from still hashes the same. Bump on layout change.
+_DISK_CACHE_FORMAT = 1
+
+
+def _content_digest(obj: Any) -> str:
+    """Stable digest of a JSON-like value (key order independent)."""
+    return _digest(
+        json.dumps(
+            obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+        ).encode("utf-8")
+    )
+
+
 class ConfigurationHandler:
     """
     Configuration handler with:
      - default config merge
      - supports `import` keys (global and inside nested dicts)
-     - get_option / set_option using dot notation
-     - tries to use jsonc.update (preserve comments), fallback to full atomic write
+     - get_option / set_option / set_options using dot notation
+     - edits values in place (preserve comments), fallback to full rewrite;
+       either way one atomic, fsynced write per set_options() or transaction()
      - optional JSON Schema validation (if Const.DEFAULT_CONFIG_FILE_SCHEMA and jsonschema is installed)
+     - one process-wide merged snapshot, re-parsed only when a tracked file
+       (user, default, schema or any transitive import) changes on disk
+     - the merged+validated snapshot is also kept in Const.APP_CACHE_DIR, so a
+       cold start skips JSONC parsing and validation while no file hash changed
+
+    Values returned by get_option are shared with the snapshot: treat them as read-only.
 
     Strict behavior:
      - any JSON/JSONC parse error in user/default/imported/schema files -> pretty print error and exit immediately
     """
 
+    # Dotted subtrees a subclass caches on itself (e.g. "widgets.statusbar");
+    # a change to any of them on disk calls reload()
+    config_keys: Tuple[str, ...] = ()
+
     def __init__(self, config_file: Optional[Path] = None):
+        # Files read while building a merged snapshot (path -> fingerprint / content digest)
+        self._tracked: Optional[Dict[Path, Fingerprint]] = None
+        self._tracked_digests: Dict[Path, str] = {}
+        # Edits queued by an open transaction()
+        self._pending: Optional[Dict[str, Any]] = None
+
         # Runtime config file (user file)
         self.config_file: Path = Path(config_file or Const.APP_CONFIG_FILE)
         self.config_file = self.config_file.expanduser().resolve()
@@ -174,8 +247,22 @@ class ConfigurationHandler:
             return default
         return getattr(Const, "DEFAULT_CONFIG", {}) or {}
 
+    def _compiled_validator(self, schema_digest: str) -> Any:
+        """Validator for the schema file, compiled (and schema-checked) once per content digest."""
+        validator = _VALIDATORS.get(schema_digest)
+        if validator is None:
+            # strict load of schema file (parse errors -> exit)
+            schema = self._load_jsonc_strict(self._schema_path)  # type: ignore
+            cls = jsonschema_validators.validator_for(schema)  # type: ignore
+            cls.check_schema(schema)
+            validator = _VALIDATORS[schema_digest] = cls(schema)
+        return validator
+
     def _validate_schema(self, data: Dict[str, Any]) -> None:
-        """Optional JSON Schema validation if schema file present and jsonschema installed. Fail-fast on validation error."""
+        """
+        Optional JSON Schema validation if schema file present and jsonschema installed. Fail-fast on validation error.
+        Skipped when this exact merged config already passed against this exact schema.
+        """
         if (
             not JSONSCHEMA_AVAILABLE
             or not self._schema_path
@@ -183,9 +270,15 @@ class ConfigurationHandler:
         ):
             return
         try:
-            # strict load of schema file (parse errors -> exit)
-            schema = self._load_jsonc_strict(self._schema_path)
-            jsonschema_validate(instance=data, schema=schema)  # type: ignore
+            schema_digest = _digest(self._schema_path.read_bytes())
+            key = (schema_digest, _content_digest(data))
+            if key in _VALIDATED:
+                return
+            validator = self._compiled_validator(schema_digest)
+            error = jsonschema_best_match(validator.iter_errors(data))  # type: ignore
+            if error is not None:
+                raise error
+            _VALIDATED.add(key)
             return
         except JsonSchemaValidationError as e:  # type: ignore
             logger.critical(f"Configuration schema validation failed: {e.message}")
@@ -196,8 +289,8 @@ class ConfigurationHandler:
             logger.critical(f"Failed schema validation: {e}")
             sys.exit(1)
 
-    def _load_merged(self) -> Dict[str, Any]:
-        """Return merged config: DEFAULT_CONFIG <- user_config. Schema validation is strict."""
+    def _build_merged(self) -> Dict[str, Any]:
+        """Parse and merge DEFAULT_CONFIG <- user_config. Schema validation is strict."""
         default = self._load_default_config() or {}
         user = self._load_user_config() or {}
         merged = self._merge_dicts(default, user)
@@ -205,17 +298,142 @@ class ConfigurationHandler:
         self._validate_schema(merged)
         return merged
 
+    def _snapshot_key(self) -> Tuple[str, str, str]:
+        return (
+            str(self.config_file),
+            str(self._default_file or ""),
+            str(self._schema_path or ""),
+        )
+
+    def _load_merged(self) -> Dict[str, Any]:
+        """
+        Return the process-wide merged config snapshot.
+        Rebuilt only when the fingerprint of any file it was built from has changed.
+        """
+        key = self._snapshot_key()
+        with _SNAPSHOTS_LOCK:
+            cached = _SNAPSHOTS.get(key)
+            if cached is not None:
+                fingerprints, merged = cached
+                if all(_fingerprint(Path(fp[0])) == fp for fp in fingerprints):
+                    return merged
+
+            # stat/hash before reading: a write racing the parse leaves a stale
+            # fingerprint/digest behind, which forces a rebuild on the next call
+            self._tracked = {}
+            self._tracked_digests = {}
+            for path in (self.config_file, self._default_file, self._schema_path):
+                if path:
+                    self._track(path)
+            try:
+                merged = self._load_disk_cache()
+                if merged is None:
+                    merged = self._build_merged()
+                    self._store_disk_cache(merged)
+                _SNAPSHOTS[key] = (tuple(self._tracked.values()), merged)
+            finally:
+                self._tracked = None
+                self._tracked_digests = {}
+            return merged
+
+    def _track(self, path: Path) -> None:
+        self._tracked[path] = _fingerprint(path)  # type: ignore[index]
+        self._tracked_digests[path] = _file_digest(path)
+
+    # -------------------------
+    # On-disk snapshot cache
+    # -------------------------
+    def _disk_cache_path(self) -> Path:
+        name = _digest("\0".join(self._snapshot_key()).encode("utf-8"))
+        return Path(Const.APP_CACHE_DIR) / f"config-{name}.marshal"
+
+    def _load_disk_cache(self) -> Optional[Dict[str, Any]]:
+        """
+        Merged config from the previous run, if every file it was built from
+        (user, default, schema, imports) still has the same content digest.
+        """
+        try:
+            with open(self._disk_cache_path(), "rb") as f:
+                fmt, validated, files, merged = marshal.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable config cache: {e}")
+            return None
+        if fmt != _DISK_CACHE_FORMAT or validated != JSONSCHEMA_AVAILABLE:
+            return None
+        if not isinstance(merged, dict):
+            return None
+
+        fingerprints: Dict[Path, Fingerprint] = {}
+        for raw_path, digest in files:
+            path = Path(raw_path)
+            if path in self._tracked_digests:
+                current = self._tracked_digests[path]
+            else:
+                fingerprints[path] = _fingerprint(path)
+                current = _file_digest(path)
+            if current != digest:
+                return None
+        # imports are only known from the cache itself; track them on a hit
+        self._tracked.update(fingerprints)  # type: ignore[union-attr]
+        logger.debug("Loaded merged config from cache.")
+        return merged
+
+    def _store_disk_cache(self, merged: Dict[str, Any]) -> None:
+        path = self._disk_cache_path()
+        files = [(str(p), d) for p, d in self._tracked_digests.items()]
+        try:
+            data = marshal.dumps(
+                (_DISK_CACHE_FORMAT, JSONSCHEMA_AVAILABLE, files, merged)
+            )
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_fd, tmp_path = tempfile.mkstemp(prefix=path.name, dir=str(path.parent))
+        except Exception as e:
+            # only a cold-start optimisation; never fatal
+            logger.debug(f"Failed to write config cache: {e}")
+            return
+        try:
+            with os.fdopen(tmp_fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.debug(f"Failed to write config cache: {e}")
+            try:
+                os.unlink(tmp_path)
+            except Exception:
+                pass
+
+    @staticmethod
+    def invalidate_snapshots() -> None:
+        """Drop every cached merged config; the next get_option re-parses from disk."""
+        with _SNAPSHOTS_LOCK:
+            _SNAPSHOTS.clear()
+
     # -------------------------
     # Public API
     # -------------------------
+    def snapshot(self) -> Dict[str, Any]:
+        """Whole merged (default+user) config, as shared by every handler"""
+        return self._load_merged()
+
+    def tracked_files(self) -> list[Path]:
+        """Every file the last built snapshot was read from (user, default, schema, imports)"""
+        with _SNAPSHOTS_LOCK:
+            cached = _SNAPSHOTS.get(self._snapshot_key())
+        if cached is None:
+            return []
+        return [Path(fp[0]) for fp in cached[0]]
+
+    def reload(self) -> None:
+        """Re-read whatever this handler caches from config_keys. Subclasses override."""
+
     def get_option(self, key: str, default: Any = None) -> Any:
         """Get option using dot notation from merged (default+user) config"""
         if not key:
             return default
-        keys = key.split(".")
-        data = self._load_merged()
-        cur: Any = data
-        for k in keys:
+        cur: Any = self._load_merged()
+        for k in key.split("."):
             if isinstance(cur, dict) and k in cur:
                 cur = cur[k]
             else:
@@ -226,43 +444,110 @@ class ConfigurationHandler:
         """
         Set option using dot notation.
         Returns True if the on-disk user config file was changed.
-        Tries jsonc.update first (preserve comments). Falls back to full atomic write.
+        Inside transaction() the edit is only queued (returns True) and written on exit.
         """
         if not key:
             return False
+        if self._pending is not None:
+            self._pending[key] = value
+            return True
+        return self.set_options({key: value})
+
+    @contextmanager
+    def transaction(self) -> Iterator["ConfigurationHandler"]:
+        """
+        Batch set_option calls: every edit is applied in memory and the user
+        config is written (and snapshots invalidated) once when the block exits.
+        Nothing is written if the block raises. Nested transactions join the outer one.
+        """
+        if self._pending is not None:
+            yield self
+            return
+        self._pending = {}
+        try:
+            yield self
+            pending = self._pending
+        finally:
+            self._pending = None
+        if pending:
+            self.set_options(pending)
+
+    def set_options(self, options: Dict[str, Any]) -> bool:
+        """
+        Set several options (dot notation keys) with a single read and a single atomic write.
+        Keys present in the file are replaced in place (comments preserved); missing
+        keys fall back to rewriting the whole user config.
+        Returns True if the on-disk user config file was changed.
+        """
+        options = {k: v for k, v in options.items() if k}
+        if not options:
+            return False
 
-        # First: try in-place update via jsonc.update() (keeps comments)
         try:
-            ok = jsonc.update(self.config_file, key, value)
-            if ok:
-                logger.info(f"Updated config (in-place): {key} = {value}")
-                return True
+            text = self.config_file.read_text(encoding="utf-8")
         except Exception as e:
-            logger.debug(f"jsonc.update failed or not applicable: {e}")
-
-        # Fallback: modify user config dict and write atomically
-        # Use strict loader to ensure we don't overwrite a syntactically invalid file
-        user = self._load_user_config()
-        d = user
-        keys = key.split(".")
-        for k in keys[:-1]:
-            if k not in d or not isinstance(d[k], dict):
-                d[k] = {}
-            d = d[k]
-        if d.get(keys[-1]) == value:
+            logger.error(f"Failed to read config file: {e}")
+            return False
+
+        # First: in-place span edits (keep comments), all in memory
+        new_text = text
+        missing: Dict[str, Any] = {}
+        for key, value in options.items():
+            try:
+                edited = jsonc.update_text(new_text, key, value)
+            except Exception as e:
+                logger.debug(f"jsonc.update_text failed or not applicable: {e}")
+                edited = None
+            if edited is None:
+                missing[key] = value
+            else:
+                new_text = edited
+
+        # Fallback: modify the user config dict for keys that are not in the file yet
+        if missing:
+            try:
+                user = jsonc.loads(new_text) or {}
+            except json.JSONDecodeError as e:
+                # don't overwrite a syntactically invalid file
+                logger.error(f"Cannot set {', '.join(missing)}: config is not valid JSONC ({e})")
+                return False
+            user = self._resolve_imports_recursive(user, set(), self.config_file)
+            changed = False
+            for key, value in missing.items():
+                d = user
+                keys = key.split(".")
+                for k in keys[:-1]:
+                    if k not in d or not isinstance(d[k], dict):
+                        d[k] = {}
+                    d = d[k]
+                if d.get(keys[-1]) != value:
+                    d[keys[-1]] = value
+                    changed = True
+            if changed:
+                new_text = jsonc.dumps(user)
+
+        if new_text == text:
             logger.debug("No change in value; skip write.")
             return False
-        d[keys[-1]] = value
 
-        # atomic write: write to tmp file then move
+        if not self._write_atomic(new_text):
+            return False
+        self.invalidate_snapshots()
+        for key, value in options.items():
+            logger.info(f"Config written: {key} = {value}")
+        return True
+
+    def _write_atomic(self, text: str) -> bool:
+        """Write the user config via tmp file + fsync + rename (atomic on POSIX)."""
         tmp_fd, tmp_path = tempfile.mkstemp(
             prefix=self.config_file.name, dir=str(self.config_file.parent)
         )
-        os.close(tmp_fd)
         try:
-            jsonc.write(Path(tmp_path), user)
-            shutil.move(tmp_path, str(self.config_file))  # atomic replace on POSIX
-            logger.info(f"Config written: {key} = {value}")
+            with os.fdopen(tmp_fd, "w", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.config_file)
             return True
         except Exception as e:
             logger.error(f"Failed to write config file: {e}")
@@ -277,6 +562,8 @@ class ConfigurationHandler:
         Strict loader: on any parse error produce pretty output and exit immediately,
         mirroring behavior from your utils/config_handler.py.
         """
+        if self._tracked is not None and path not in self._tracked:
+            self._track(path)
         try:
             return jsonc.get_data(path)
         except JsoncParseError as e:
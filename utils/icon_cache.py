@@ -0,0 +1,95 @@
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional
+
+from fabric.utils.helpers import get_desktop_applications, DesktopApp
+from gi.repository import Gtk, GdkPixbuf  # type: ignore
+from loguru import logger
+
+# a few hundred small pixbufs: the dock, app browser and notifications together
+MAX_PIXBUFS = 512
+
+_ABSENT = object()
+
+
+class IconCache:
+    """
+    Process-wide LRU of resolved icon pixbufs, misses included.
+
+    Keys are whatever the caller resolves from (AppIcon uses
+    `(query, size, include_hidden)`); a `None` value remembers that
+    nothing was found so the next lookup skips the theme probes too. Pixbufs
+    are shared between widgets, so callers must not modify them. Everything
+    is dropped when the icon theme changes or desktop entries are
+    (un)installed, together with the cached `get_desktop_applications()`.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        if getattr(self, "_initialized", False):
+            return
+        self._initialized = True
+        self._pixbufs: "OrderedDict[Hashable, Optional[GdkPixbuf.Pixbuf]]" = (
+            OrderedDict()
+        )
+        self._apps: Dict[bool, List[DesktopApp]] = {}
+        self._watching = False
+        self.hits = 0
+        self.misses = 0
+
+    # ----------------------------
+    # API
+    # ----------------------------
+    def pixbuf(
+        self, key: Hashable, load: Callable[[], Optional[GdkPixbuf.Pixbuf]]
+    ) -> Optional[GdkPixbuf.Pixbuf]:
+        """Cached pixbuf (or miss) for `key`, calling `load()` only once"""
+        self._watch()
+        value = self._pixbufs.get(key, _ABSENT)
+        if value is not _ABSENT:
+            self._pixbufs.move_to_end(key)
+            self.hits += 1
+            return value  # type: ignore[return-value]
+
+        self.misses += 1
+        value = load()
+        self._pixbufs[key] = value
+        if len(self._pixbufs) > MAX_PIXBUFS:
+            self._pixbufs.popitem(last=False)
+        return value
+
+    def contains(self, key: Hashable) -> bool:
+        return key in self._pixbufs
+
+    def applications(self, include_hidden: bool = False) -> List[DesktopApp]:
+        """`get_desktop_applications()`, enumerated once per change"""
+        self._watch()
+        apps = self._apps.get(include_hidden)
+        if apps is None:
+            apps = self._apps[include_hidden] = list(
+                get_desktop_applications(include_hidden) or []
+            )
+        return apps
+
+    def clear(self, *_) -> None:
+        if self._pixbufs or self._apps:
+            logger.debug(f"[IconCache] Dropping {len(self._pixbufs)} icons")
+        self._pixbufs.clear()
+        self._apps.clear()
+
+    # ----------------------------
+    # Invalidation
+    # ----------------------------
+    def _watch(self) -> None:
+        if self._watching:
+            return
+        self._watching = True
+        from services.desktop_entries import DesktopEntryIndex
+
+        Gtk.IconTheme.get_default().connect("changed", self.clear)  # type: ignore
+        DesktopEntryIndex().connect("changed", self.clear)
@@ -1,10 +1,164 @@
 import json
 import re
 from pathlib import Path
-from typing import Any, List
+from typing import Any, Dict, List, Tuple
 from .decorators import singletonclass
 
 
+# Whitespace and comments (possessive, so scanning is linear even on bad input)
+_WS = r"(?:[ \t\r\n]++|//[^\n]*+|/\*.*?\*/)*+"
+
+# One left-to-right scan: the possessive prefix swallows everything that is
+# plain JSON (strings included, so "//" inside a value is kept) and each match
+# stops at the next piece of JSONC noise: a comment (group 1), a trailing comma
+# (group 2), or anything unparseable / end of text (neither group -> stop).
+_NOISE_RE = re.compile(
+    r'(?:[^"/,]++|"[^"\\]*+(?:\\.[^"\\]*+)*+"|/(?![/*])|,(?!' + _WS + r"[\]}]))*+"
+    r"(?:(//[^\n]*+|/\*.*?\*/)|(,)|[\s\S]|\Z)",
+    re.DOTALL,
+)
+_NOT_NEWLINE_RE = re.compile(r"[^\n]")
+
+# JSONC tokens for the span index; whitespace and comments are yielded too
+# (and skipped by the caller) so strings containing "//" stay intact
+_TOKEN_RE = re.compile(
+    r'\s++|//[^\n]*+|/\*.*?\*/|"[^"\\]*+(?:\\.[^"\\]*+)*+"'
+    r'|[{}\[\]:,]|[^\s{}\[\]:,"/]++|.',
+    re.DOTALL,
+)
+
+KeyPath = Tuple[str, ...]
+Span = Tuple[int, int]
+
+
+def _first_token(text: str, pos: int) -> str:
+    """First token at or after `pos` that is not whitespace or a comment"""
+    for m in _TOKEN_RE.finditer(text, pos):
+        tok = m.group()
+        if not (tok[0].isspace() or tok[:2] in ("//", "/*")):
+            return tok
+    return ""
+
+
+def _scan_spans(text: str, pos: int, path: KeyPath | None) -> Dict[KeyPath, Span]:
+    """
+    Index the JSONC value starting at `pos`: every object member reachable from
+    it through objects only maps its key path (rooted at `path`) to the
+    (start, end) offsets of its value. Array items are not indexed.
+    Lenient: unexpected tokens are skipped, duplicate keys keep the first one.
+    """
+    spans: Dict[KeyPath, Span] = {}
+    # open containers: (bracket, key path or None, start offset)
+    stack: list[tuple[str, KeyPath | None, int]] = []
+    want = "value"
+    vpath = path
+    key = ""
+    for m in _TOKEN_RE.finditer(text, pos):
+        tok = m.group()
+        lead = tok[0]
+        if lead.isspace() or tok[:2] in ("//", "/*"):
+            continue
+        if lead in "}]":
+            if not stack or stack[-1][0] != ("{" if lead == "}" else "["):
+                continue
+            bracket, cpath, start = stack.pop()
+            if cpath is not None:
+                spans.setdefault(cpath, (start, m.end()))
+            if not stack:
+                break
+            want = "sep"
+        elif want == "key":
+            if lead == '"':
+                try:
+                    key = json.loads(tok)
+                except Exception:
+                    key = tok.strip('"')
+                want = "colon"
+        elif want == "colon":
+            if tok == ":":
+                parent = stack[-1][1]
+                vpath = None if parent is None else parent + (key,)
+                want = "value"
+            else:
+                want = "key"
+        elif want == "value":
+            if lead in "{[":
+                stack.append((lead, vpath, m.start()))
+                want = "key" if lead == "{" else "value"
+                vpath = None
+            elif tok not in ",:":
+                if vpath is not None:
+                    spans.setdefault(vpath, (m.start(), m.end()))
+                if not stack:
+                    break
+                want = "sep"
+        elif tok == ",":
+            want = "key" if stack[-1][0] == "{" else "value"
+            vpath = None
+    return spans
+
+
+class _SpanIndex:
+    """
+    Key path -> value offsets for one JSONC text, built in a single scan and
+    kept valid across edits. Edits are logged instead of rewriting every
+    offset: a lookup replays only the edits made after its span was recorded,
+    and only the replaced value is rescanned. The log is folded back into the
+    spans every COMPACT_EVERY edits, so repeated edits never re-tokenise the file.
+    """
+
+    COMPACT_EVERY = 64
+
+    __slots__ = ("text", "spans", "edits")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        # key path -> (start, end, number of edits already applied to it)
+        self.spans: Dict[KeyPath, tuple[int, int, int]] = {
+            p: (s, e, 0) for p, (s, e) in _scan_spans(text, 0, ()).items()
+        }
+        # (start, end, length delta) of each replace(), oldest first
+        self.edits: list[tuple[int, int, int]] = []
+
+    def _resolve(self, s: int, e: int, gen: int) -> Span | None:
+        for a, b, delta in self.edits[gen:]:
+            if e <= a:
+                continue
+            if s >= b:
+                s, e = s + delta, e + delta
+            elif s <= a and e >= b and (s, e) != (a, b):
+                e += delta
+            else:
+                return None  # replaced (or inside what was replaced)
+        return (s, e)
+
+    def get(self, path: KeyPath) -> Span | None:
+        entry = self.spans.get(path) if path else None
+        if entry is None:
+            return None
+        return self._resolve(*entry)
+
+    def replace(self, a: int, b: int, new: str, path: KeyPath | None = None) -> None:
+        """Replace text[a:b] with `new`; `path` names the value being replaced, if any."""
+        self.text = self.text[:a] + new + self.text[b:]
+        self.edits.append((a, b, len(new) - (b - a)))
+        gen = len(self.edits)
+        if path is not None:
+            for p, (s, e) in _scan_spans(self.text, a, path).items():
+                self.spans[p] = (s, e, gen)
+        if gen >= self.COMPACT_EVERY:
+            self._compact()
+
+    def _compact(self) -> None:
+        spans = {}
+        for p, entry in self.spans.items():
+            span = self._resolve(*entry)
+            if span is not None:
+                spans[p] = (span[0], span[1], 0)
+        self.spans = spans
+        self.edits = []
+
+
 class JsoncParseError(Exception):
     def __init__(
         self,
@@ -81,18 +235,15 @@ class jsonc:
     def read(self, path: Path | str) -> dict:
         path = Path(path)
         raw = path.read_text(encoding="utf-8")
-        if not raw.strip():
-            return {}
-        clean = self._strip_comments(raw)
-        clean = self._remove_trailing_commas(clean)
         try:
-            data = self.loads(clean)
+            data = self.loads(raw)
         except json.JSONDecodeError as e:
-            snippet = self._format_error_snippet(clean, e.lineno, e.colno, 2)
-            hints = self._diagnose_json_error(clean, e.lineno, e.colno, e.msg)
+            # noise is blanked in place, so positions are valid in the raw text
+            snippet = self._format_error_snippet(raw, e.lineno, e.colno, 2)
+            hints = self._diagnose_json_error(raw, e.lineno, e.colno, e.msg)
             raise JsoncParseError(path, e.lineno, e.colno, e.msg, snippet, hints)
         if isinstance(data, dict):
-            return self._decode_u_escapes_any(data)
+            return data
         return {}
 
     def get_path(
@@ -112,18 +263,23 @@ class jsonc:
             return {}
         return self.read(p)
 
+    def update_text(self, text: str, keypath: str, new_value: Any) -> str | None:
+        """
+        Replace the value at `keypath` inside JSONC `text`, keeping comments and
+        layout. Returns the new text, or None when the key is not present.
+        Feeding the returned text back in reuses its span index (no rescan).
+        """
+        index = self._index_for_text(text)
+        return index.text if self._set_in_index(index, keypath, new_value) is not None else None
+
     def update(self, path: Path | str, keypath: str, new_value: Any) -> bool:
         path = Path(path)
-        text = path.read_text(encoding="utf-8")
-        span = self._find_value_span_jsonc(text, keypath.split("."))
-        if span:
-            v_start, v_end = span
-            serialized = self._serialize_json_literal(new_value)
-            new_text = text[:v_start] + serialized + text[v_end:]
-            if new_text != text:
-                path.write_text(new_text, encoding="utf-8")
-                return True
-            return False
+        index = self._index_for_path(path)
+        changed = self._set_in_index(index, keypath, new_value)
+        if changed is not None:
+            if changed:
+                self._write_indexed(path, index)
+            return changed
         data = self.get_data(path)
         d = data
         keys = keypath.split(".")
@@ -138,19 +294,18 @@ class jsonc:
         return True
 
     def append(self, path: Path, keypath: str, value: Any) -> bool:
-        text = path.read_text(encoding="utf-8")
+        path = Path(path)
+        index = self._index_for_path(path)
         segs = keypath.split(".")
-        span = self._find_value_span_jsonc(text, segs)
-        if span:
+        span = index.get(tuple(segs))
+        if span and index.text[span[0]] == "[":
             start, end = span
-            j = self._skip_ws_and_comments(text, start)
-            if j < len(text) and text[j] == "[":
-                serialized = self._serialize_json_literal(value)
-                new_text = self._append_into_array_literal(text, j, end, serialized)
-                if new_text != text:
-                    path.write_text(new_text, encoding="utf-8")
-                    return True
-                return False
+            serialized = self._serialize_json_literal(value)
+            empty = _first_token(index.text, start + 1) == "]"
+            insert = serialized if empty else ", " + serialized
+            index.replace(end - 1, end - 1, insert)
+            self._write_indexed(path, index)
+            return True
         data = self.get_data(path)
         d = data
         keys = segs
@@ -166,12 +321,16 @@ class jsonc:
         self.write(path, data)
         return True
 
-    def loads(self, content: str) -> dict:
-        if not content.strip():
+    def loads(self, content: str) -> Any:
+        clean = self._strip_noise(content)
+        if not clean.strip():
             return {}
-        clean = self._strip_comments(content)
-        clean = self._remove_trailing_commas(clean)
-        return json.loads(clean)
+        data = json.loads(clean)
+        # literal "\\uXXXX" sequences survive JSON unescaping; only walk the
+        # result when the source can actually contain one
+        if "\\\\u" in content or "\\u005c" in content.lower():
+            return self._decode_u_escapes_any(data)
+        return data
 
     def length(self, data: dict) -> int:
         return len(data)
@@ -195,34 +354,32 @@ class jsonc:
 
         return json.dumps(content, indent=indent, ensure_ascii=False, default=default)
 
-    def _strip_comments(self, raw: str) -> str:
-        import io
-
-        output = io.StringIO()
-        inside_str = False
-        prev_char = ""
-        for line in raw.splitlines():
-            new_line = ""
-            i = 0
-            while i < len(line):
-                ch = line[i]
-                if ch == '"' and prev_char != "\\":
-                    inside_str = not inside_str
-                if (
-                    not inside_str
-                    and ch == "/"
-                    and i + 1 < len(line)
-                    and line[i + 1] == "/"
-                ):
-                    break
-                new_line += ch
-                prev_char = ch
-                i += 1
-            output.write(new_line + "\n")
-        return output.getvalue()
-
-    def _remove_trailing_commas(self, s: str) -> str:
-        return re.sub(r",(\s*[\]\}])", r"\1", s)
+    def _strip_noise(self, raw: str) -> str:
+        """
+        Blank out comments and trailing commas in a single regex pass.
+        Replacements keep the exact length (and newlines) of what they cover,
+        so json.loads error positions still point into the original text.
+        """
+        pieces: list[str] = []
+        last = 0
+        for m in _NOISE_RE.finditer(raw):
+            comment, comma = m.group(1), m.group(2)
+            if comment is not None:
+                pieces.append(raw[last : m.start(1)])
+                if "\n" in comment:
+                    pieces.append(_NOT_NEWLINE_RE.sub(" ", comment))
+                else:
+                    pieces.append(" " * len(comment))
+            elif comma is not None:
+                pieces.append(raw[last : m.start(2)])
+                pieces.append(" ")
+            else:
+                break
+            last = m.end()
+        if not pieces:
+            return raw
+        pieces.append(raw[last:])
+        return "".join(pieces)
 
     def _serialize_json_literal(self, v: Any) -> str:
         if isinstance(v, str):
@@ -235,203 +392,50 @@ class jsonc:
             return "null"
         return json.dumps(v, ensure_ascii=False, separators=(",", ":"))
 
-    def _find_value_span_jsonc(self, s: str, segs: list[str]) -> tuple[int, int] | None:
-        n = len(s)
-
-        def skip_ws_and_comments(j: int) -> int:
-            return self._skip_ws_and_comments(s, j)
-
-        def scan_string(j: int) -> int:
-            assert s[j] == '"'
-            j += 1
-            while j < n:
-                ch = s[j]
-                if ch == "\\":
-                    j += 2
-                    continue
-                if ch == '"':
-                    return j + 1
-                j += 1
-            return j
-
-        def read_string_value(j: int) -> tuple[str, int]:
-            j0 = j
-            j = scan_string(j)
-            raw = s[j0:j]
-            try:
-                val = json.loads(raw)
-            except Exception:
-                val = raw.strip('"')
-            return val, j
-
-        def find_value_end(j: int) -> int:
-            j = skip_ws_and_comments(j)
-            if j >= n:
-                return j
-            ch = s[j]
-            if ch == '"':
-                return scan_string(j)
-            if ch == "{":
-                depth = 0
-                k = j
-                in_str = False
-                esc = False
-                in_line_comment = False
-                while k < n:
-                    c = s[k]
-                    if in_line_comment:
-                        if c == "\n":
-                            in_line_comment = False
-                        k += 1
-                        continue
-                    if not in_str:
-                        if c == "/" and k + 1 < n and s[k + 1] == "/":
-                            in_line_comment = True
-                            k += 2
-                            continue
-                        if c == "{":
-                            depth += 1
-                        elif c == "}":
-                            depth -= 1
-                            if depth == 0:
-                                return k + 1
-                        elif c == '"':
-                            in_str = True
-                    else:
-                        if not esc and c == '"':
-                            in_str = False
-                            esc = False
-                        elif c == "\\" and not esc:
-                            esc = True
-                            k += 1
-                            continue
-                        else:
-                            esc = False
-                    k += 1
-                return k
-            if ch == "[":
-                depth = 0
-                k = j
-                in_str = False
-                esc = False
-                in_line_comment = False
-                while k < n:
-                    c = s[k]
-                    if in_line_comment:
-                        if c == "\n":
-                            in_line_comment = False
-                        k += 1
-                        continue
-                    if not in_str:
-                        if c == "/" and k + 1 < n and s[k + 1] == "/":
-                            in_line_comment = True
-                            k += 2
-                            continue
-                        if c == "[":
-                            depth += 1
-                        elif c == "]":
-                            depth -= 1
-                            if depth == 0:
-                                return k + 1
-                        elif c == '"':
-                            in_str = True
-                    else:
-                        if not esc and c == '"':
-                            in_str = False
-                            esc = False
-                        elif c == "\\" and not esc:
-                            esc = True
-                            k += 1
-                            continue
-                        else:
-                            esc = False
-                    k += 1
-                return k
-            k = j
-            while k < n and s[k] not in ",}\n]":
-                k += 1
-            return k
-
-        def find_in_object(j: int, key: str) -> tuple[int, int] | None:
-            j += 1
-            while True:
-                j = skip_ws_and_comments(j)
-                if j >= n:
-                    return None
-                if s[j] == "}":
-                    return None
-                if s[j] != '"':
-                    j += 1
-                    continue
-                kname, j2 = read_string_value(j)
-                j = skip_ws_and_comments(j2)
-                if j >= n or s[j] != ":":
-                    j += 1
-                    continue
-                j += 1
-                if kname == key:
-                    v_start = skip_ws_and_comments(j)
-                    v_end = find_value_end(v_start)
-                    return (v_start, v_end)
-                v_start = skip_ws_and_comments(j)
-                v_end = find_value_end(v_start)
-                j = v_end
-                while j < n and s[j] not in ",}":
-                    j += 1
-                if j < n and s[j] == ",":
-                    j += 1
-                    continue
-                if j < n and s[j] == "}":
-                    return None
-
-        i = self._skip_ws_and_comments(s, 0)
-        if i >= n or s[i] != "{":
+    # ---------------------------------------------------------------------
+    # Span index (comment-preserving edits)
+    # ---------------------------------------------------------------------
+    _text_index: _SpanIndex | None = None
+    # path -> ((mtime_ns, size, inode) as last read/written, index of that text)
+    _path_indexes: Dict[Path, tuple[tuple[int, int, int], _SpanIndex]] = {}
+
+    def _index_for_text(self, text: str) -> _SpanIndex:
+        index = self._text_index
+        if index is None or (index.text is not text and index.text != text):
+            index = self._text_index = _SpanIndex(text)
+        return index
+
+    def _index_for_path(self, path: Path) -> _SpanIndex:
+        st = path.stat()
+        stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+        cached = self._path_indexes.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        index = _SpanIndex(path.read_text(encoding="utf-8"))
+        self._path_indexes[path] = (stamp, index)
+        return index
+
+    def _write_indexed(self, path: Path, index: _SpanIndex) -> None:
+        try:
+            path.write_text(index.text, encoding="utf-8")
+            st = path.stat()
+        except Exception:
+            self._path_indexes.pop(path, None)
+            raise
+        self._path_indexes[path] = ((st.st_mtime_ns, st.st_size, st.st_ino), index)
+
+    def _set_in_index(self, index: _SpanIndex, keypath: str, value: Any) -> bool | None:
+        """Set `keypath` in place; None when missing, else whether the text changed."""
+        path = tuple(keypath.split("."))
+        span = index.get(path)
+        if span is None:
             return None
-        cur = i
-        for idx, seg in enumerate(segs):
-            span = find_in_object(cur, seg)
-            if span is None:
-                return None
-            v_start, v_end = span
-            if idx == len(segs) - 1:
-                return (v_start, v_end)
-            j = self._skip_ws_and_comments(s, v_start)
-            if j >= n or s[j] != "{":
-                return None
-            cur = j
-        return None
-
-    def _skip_ws_and_comments(self, s: str, j: int) -> int:
-        n = len(s)
-        in_line_comment = False
-        while j < n:
-            ch = s[j]
-            if in_line_comment:
-                if ch == "\n":
-                    in_line_comment = False
-                j += 1
-                continue
-            if ch in " \t\r\n":
-                j += 1
-                continue
-            if ch == "/" and j + 1 < n and s[j + 1] == "/":
-                in_line_comment = True
-                j += 2
-                continue
-            break
-        return j
-
-    def _append_into_array_literal(
-        self, s: str, arr_start: int, arr_end: int, item: str
-    ) -> str:
-        assert s[arr_start] == "["
-        assert s[arr_end - 1] == "]"
-        j = self._skip_ws_and_comments(s, arr_start + 1)
-        if j < arr_end and s[j] == "]":
-            insert = item
-            return s[: arr_end - 1] + insert + s[arr_end - 1 :]
-        insert = ", " + item
-        return s[: arr_end - 1] + insert + s[arr_end - 1 :]
+        start, end = span
+        serialized = self._serialize_json_literal(value)
+        if index.text[start:end] == serialized:
+            return False
+        index.replace(start, end, serialized, path)
+        return True
 
     def _format_error_snippet(
         self, text: str, lineno: int, colno: int, context: int = 2
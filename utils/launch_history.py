@@ -0,0 +1,108 @@
+import atexit
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+from fabric.utils import GLib
+from loguru import logger
+
+from utils.constants import Const
+
+HISTORY_FILE = Const.APP_CACHE_DIR / "app-launches.json"
+SAVE_DELAY_S = 2
+# a launch counts half as much after this many days
+HALF_LIFE_DAYS = 14.0
+
+
+class LaunchHistory:
+    """
+    How often and how recently each application was launched from the app
+    browser, keyed by desktop id. `score()` is the launch count decayed by
+    the age of the last launch; search uses it to order equally good
+    matches. Stored in Const.APP_CACHE_DIR.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        if getattr(self, "_initialized", False):
+            return
+        self._initialized = True
+        # desktop id -> [launch count, last launch (unix time)]
+        self._launches: Dict[str, List[float]] = {}
+        self._save_id: Optional[int] = None
+        self._dirty = False
+        self._load()
+        atexit.register(self.save)
+
+    # ----------------------------
+    # API
+    # ----------------------------
+    def record(self, key: str) -> None:
+        if not key:
+            return
+        entry = self._launches.setdefault(key, [0, 0.0])
+        entry[0] += 1
+        entry[1] = time.time()
+        self._schedule_save()
+
+    def score(self, key: str, now: Optional[float] = None) -> float:
+        entry = self._launches.get(key)
+        if not entry:
+            return 0.0
+        age_days = max(0.0, ((now or time.time()) - entry[1]) / 86400)
+        return entry[0] * 0.5 ** (age_days / HALF_LIFE_DAYS)
+
+    def scores(self) -> Dict[str, float]:
+        now = time.time()
+        return {key: self.score(key, now) for key in self._launches}
+
+    # ----------------------------
+    # Persistence
+    # ----------------------------
+    def _load(self) -> None:
+        try:
+            data = json.loads(HISTORY_FILE.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"[LaunchHistory] Ignoring unreadable history: {e}")
+            return
+        if isinstance(data, dict):
+            self._launches = {
+                key: [int(v[0]), float(v[1])]
+                for key, v in data.items()
+                if isinstance(v, list) and len(v) == 2
+            }
+
+    def _schedule_save(self) -> None:
+        self._dirty = True
+        if self._save_id is None:
+            self._save_id = GLib.timeout_add_seconds(SAVE_DELAY_S, self._save_later)
+
+    def _save_later(self) -> bool:
+        self._save_id = None
+        self.save()
+        return False
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        tmp = HISTORY_FILE.with_name(f".{HISTORY_FILE.name}.{os.getpid()}.tmp")
+        try:
+            HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(self._launches), encoding="utf-8")
+            os.replace(tmp, HISTORY_FILE)
+            self._dirty = False
+        except Exception as e:
+            logger.warning(f"[LaunchHistory] Could not save: {e}")
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
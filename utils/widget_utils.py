@@ -7,13 +7,10 @@ from typing import (
     Callable,
     Tuple,
 )
-from fabric.utils import Gtk, bulk_connect, Gdk
+from fabric.utils import GLib, Gtk, bulk_connect, Gdk
 from fabric.utils.helpers import Gtk
-from fabric.hyprland.service import Hyprland
 from typing import Callable
-
-
-hypr = Hyprland()
+from services.hyprland_events import HyprlandEventHub
 
 
 def set_cursor_now(widget, cursor_name: str | None):
@@ -90,10 +87,11 @@ def event_close_popup(
         "openWindow",
         "closeWindow",
     ]
+    hub = HyprlandEventHub()
     for e in events:
         if e == ignore_event:
             continue
-        hypr.connect(f"event::{e}", callback)
+        hub.subscribe(e, lambda *_: callback())
 
 
 def click_widget(widget: Gtk.Widget, callback: Callable):
@@ -189,3 +187,44 @@ def check_internet(timeout: float = 0.5) -> bool:
         return True
     except OSError:
         return False
+
+
+def connect_while_alive(
+    widget: Gtk.Widget, obj: Any, signal: str, callback: Callable
+) -> int:
+    """Connect `callback` to `obj`'s `signal` until `widget` is destroyed"""
+    handler_id = obj.connect(signal, callback)
+
+    def disconnect(*_) -> None:
+        try:
+            obj.disconnect(handler_id)
+        except Exception:
+            pass
+
+    widget.connect("destroy", disconnect)
+    return handler_id
+
+
+def timeout_while_alive(
+    widget: Gtk.Widget, interval: int, callback: Callable[[], Any], seconds=False
+) -> None:
+    """
+    Repeating GLib timeout (milliseconds, or seconds when `seconds`) that runs
+    while `callback` returns True and is removed when `widget` is destroyed
+    """
+    source: dict[str, Optional[int]] = {"id": None}
+
+    def tick() -> bool:
+        if callback():
+            return True
+        source["id"] = None
+        return False
+
+    def remove(*_) -> None:
+        if source["id"] is not None:
+            GLib.source_remove(source["id"])
+            source["id"] = None
+
+    add = GLib.timeout_add_seconds if seconds else GLib.timeout_add
+    source["id"] = add(interval, tick)
+    widget.connect("destroy", remove)
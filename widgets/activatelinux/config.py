@@ -3,6 +3,11 @@ from utils.constants import Const
 
 
 class ConfigHandlerActivateLinux(ConfigurationHandler):
+    config_keys = ("widgets.activatelinux",)
+
     def __init__(self):
         super().__init__(Const.APP_CONFIG_FILE)
+        self.reload()
+
+    def reload(self) -> None:
         self.config = self.get_option("widgets.activatelinux")
@@ -43,3 +43,9 @@ else:
                 exclusivity="normal",
                 child=box,
             )
+
+        def on_config_reload(self) -> bool:
+            self.layer = self.confh.config["layer"]
+            self.anchor = self.confh.config["anchor"]
+            self.margin = self.confh.config["margin"]
+            return True
@@ -2,6 +2,11 @@ from utils.configuration_handler import ConfigurationHandler
 
 
 class ConfigHandlerWidgets(ConfigurationHandler):
+    config_keys = ("global",)
+
     def __init__(self):
         super().__init__()
+        self.reload()
+
+    def reload(self) -> None:
         self.config = self.get_option("global")
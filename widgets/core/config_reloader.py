@@ -0,0 +1,183 @@
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Optional, Set
+
+from fabric.utils import GLib
+from gi.repository import Gio  # type: ignore
+from loguru import logger
+
+from utils.configuration_handler import ConfigurationHandler
+
+if TYPE_CHECKING:
+    from .widgets_handler import WidgetsHandler
+
+# editors emit several events per save (truncate, write, rename...); coalesce them
+DEBOUNCE_MS = 50
+
+IGNORED_EVENTS = {
+    Gio.FileMonitorEvent.ATTRIBUTE_CHANGED,
+    Gio.FileMonitorEvent.PRE_UNMOUNT,
+    Gio.FileMonitorEvent.UNMOUNTED,
+}
+
+_MISSING = object()
+
+
+def _subtree(data: Any, key: str) -> Any:
+    cur = data
+    for k in key.split("."):
+        if not isinstance(cur, dict) or k not in cur:
+            return _MISSING
+        cur = cur[k]
+    return cur
+
+
+class ConfigReloader:
+    """
+    Watch the user config and every file it imports, and on change re-merge the
+    config and notify only the windows whose config subtrees actually differ.
+
+    A window takes part by having a `confh` (ConfigurationHandler with
+    `config_keys`) and an `on_config_reload()` hook returning True when the new
+    options were applied live. Changes that cannot be applied in place (a
+    widget's `enabled` flag, a hook returning False) go to `on_restart_required`.
+    """
+
+    def __init__(self, widgets_handler: "WidgetsHandler") -> None:
+        self.widgets_handler = widgets_handler
+        self.confh: ConfigurationHandler = widgets_handler.confh
+        self.on_restart_required: Optional[Callable[[], None]] = None
+
+        self._monitors: Dict[Path, Gio.FileMonitor] = {}
+        self._pending: Optional[int] = None
+        self._previous: Dict[str, Any] = self.confh.snapshot()
+        self._global_listeners: list[Callable[[], None]] = []
+
+    # ----------------------------
+    # Subscriptions
+    # ----------------------------
+    def connect_global(self, callback: Callable[[], None]) -> None:
+        """Call `callback` after the `global` subtree changed (fonts, theme, stylesheet)"""
+        self._global_listeners.append(callback)
+
+    # ----------------------------
+    # File monitoring
+    # ----------------------------
+    def start(self) -> None:
+        self._sync_monitors(self.confh.tracked_files())
+
+    def stop(self) -> None:
+        for monitor in self._monitors.values():
+            monitor.cancel()
+        self._monitors.clear()
+        if self._pending is not None:
+            GLib.source_remove(self._pending)
+            self._pending = None
+
+    def _sync_monitors(self, paths: Iterable[Path]) -> None:
+        wanted = set(paths)
+        for path in list(self._monitors):
+            if path not in wanted:
+                self._monitors.pop(path).cancel()
+        for path in wanted - set(self._monitors):
+            try:
+                monitor = Gio.File.new_for_path(str(path)).monitor_file(
+                    Gio.FileMonitorFlags.WATCH_MOVES, None
+                )
+            except Exception as e:
+                logger.warning(f"[ConfigReloader] Cannot watch {path}: {e}")
+                continue
+            monitor.connect("changed", self._on_file_changed)
+            self._monitors[path] = monitor
+
+    def _on_file_changed(self, _monitor, _file, _other, event) -> None:
+        if event in IGNORED_EVENTS:
+            return
+        if self._pending is not None:
+            GLib.source_remove(self._pending)
+        self._pending = GLib.timeout_add(DEBOUNCE_MS, self._reload)
+
+    # ----------------------------
+    # Reload + diff
+    # ----------------------------
+    def _reload(self) -> bool:
+        self._pending = None
+        try:
+            current = self.confh.snapshot()
+        except SystemExit:
+            # parse/schema error mid-edit: keep running on the previous config
+            logger.warning("[ConfigReloader] Config is invalid, keeping previous one.")
+            return False
+        finally:
+            self._sync_monitors(self.confh.tracked_files())
+
+        previous, self._previous = self._previous, current
+        if current is previous:
+            return False
+
+        changed = self._changed_keys(previous, current)
+        if not changed:
+            return False
+        logger.info(f"[ConfigReloader] Changed: {', '.join(sorted(changed))}")
+
+        if self._needs_restart(previous, current, changed):
+            self._request_restart()
+            return False
+
+        if "global" in changed:
+            self.confh.reload()
+            for callback in self._global_listeners:
+                try:
+                    callback()
+                except Exception:
+                    logger.exception("[ConfigReloader] global listener failed")
+
+        for window in self.widgets_handler.windows:
+            confh = getattr(window, "confh", None)
+            hook = getattr(window, "on_config_reload", None)
+            if confh is None or hook is None:
+                continue
+            if not changed.intersection(getattr(confh, "config_keys", ())):
+                continue
+            name = type(window).__name__
+            try:
+                confh.reload()
+                applied = hook()
+            except Exception:
+                logger.exception(f"[ConfigReloader] {name} failed to reload")
+                applied = False
+            if applied is False:
+                logger.info(f"[ConfigReloader] {name} cannot apply changes live.")
+                self._request_restart()
+                return False
+        return False
+
+    def _changed_keys(
+        self, previous: Dict[str, Any], current: Dict[str, Any]
+    ) -> Set[str]:
+        keys = {"global"}
+        for data in (previous, current):
+            widgets = data.get("widgets")
+            if isinstance(widgets, dict):
+                keys.update(f"widgets.{name}" for name in widgets)
+        return {k for k in keys if _subtree(previous, k) != _subtree(current, k)}
+
+    def _needs_restart(
+        self, previous: Dict[str, Any], current: Dict[str, Any], changed: Set[str]
+    ) -> bool:
+        # windows are only constructed for widgets enabled at startup
+        for key in changed:
+            if not key.startswith("widgets."):
+                continue
+            old = _subtree(previous, key)
+            new = _subtree(current, key)
+            old_enabled = old.get("enabled") if isinstance(old, dict) else None
+            new_enabled = new.get("enabled") if isinstance(new, dict) else None
+            if old_enabled != new_enabled:
+                return True
+        return False
+
+    def _request_restart(self) -> None:
+        if self.on_restart_required is None:
+            logger.warning("[ConfigReloader] Restart required to apply the new config.")
+            return
+        self.on_restart_required()
@@ -1,54 +1,252 @@
 from pathlib import Path
 from typing import TYPE_CHECKING
+import hashlib
+import shutil
 import tempfile
+import threading
 import os
 from dartsass._main import _dart_sass_path, compile
 from utils.constants import Const
 from loguru import logger
-from fabric.utils import idle_add, Gtk, Gdk
+from fabric.utils import idle_add, Gtk, Gdk, GLib
+from gi.repository import Gio  # type: ignore
+from services.theme import ThemeService
+from utils.colors_parse import available_themes
 
 if TYPE_CHECKING:
     from .widgets_handler import WidgetsHandler
 
+# compiled CSS per distinct SCSS input (theme/font switches hit the cache too)
+CSS_CACHE_DIR = Const.APP_CACHE_DIR / "stylesheet"
+CSS_CACHE_KEEP = 16
+
+# written from config by set_fonts / set_colorscheme, hashed via their inputs
+GENERATED_PARTIALS = {"_font.scss", "_theme.scss"}
+
+MAIN_PRIORITY = Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION + 100
+USER_PRIORITY = MAIN_PRIORITY + 1
+
+# other themes are precompiled this long after startup, one at a time
+PRECOMPILE_DELAY_S = 10
+
+# editors emit several events per save; coalesce before reloading user css
+USER_RELOAD_DEBOUNCE_MS = 50
+
+USER_TEMPLATE = (
+    "/* User overrides for yourbar\n"
+    "   Add CSS rules here to override defaults.\n"
+    "   Example:\n"
+    "   .statusbar { background: #ff0000; }\n"
+    "*/\n\n"
+)
+
 
 class Stylesheet:
     """
-    Compile SCSS -> CSS, append user overrides (if provided), and apply final CSS to GTK via CssProvider.
+    Compile SCSS -> CSS and apply it to GTK via CssProvider; user overrides (if provided)
+    get their own higher-priority provider, reloaded alone whenever the file is saved.
     If the config's stylesheet_file is empty ("" or None) we IGNORE user overrides.
+    Compiled CSS is cached in CSS_CACHE_DIR by the hash of every .scss input,
+    theme and font, so dart-sass only runs when the stylesheet actually changed.
+    Bundles for the other themes are precompiled one at a time in low-priority
+    idle time after startup, so switching `theme` at runtime is usually a provider
+    swap plus a ThemeService colors-changed; a theme not built yet compiles then.
     """
 
     def __init__(self, widget_handler: "WidgetsHandler") -> None:
         self.widget_handler = widget_handler
         self.confh = widget_handler.confh
+        self._provider: Gtk.CssProvider | None = None
+        self._user_provider: Gtk.CssProvider | None = None
+        self._user_path: Path | None = None
+        self._user_monitor: Gio.FileMonitor | None = None
+        self._user_pending: int | None = None
+        # scss digest -> compiled css (bundles used or precompiled this session)
+        self._bundles: dict[str, str] = {}
+        self._bundles_lock = threading.Lock()
+        self.theme_service = ThemeService()
 
         # Clear theme flags early (optional)
         self._clear_gtk_theme()
         # self.load_default_css()
 
+        self.reload()
+        GLib.timeout_add_seconds(
+            PRECOMPILE_DELAY_S, self._precompile_themes, priority=GLib.PRIORITY_LOW
+        )
+
+    def reload(self) -> None:
+        """(Re)build the stylesheet from the current `global` config and swap it in."""
         # Set font and colorscheme
         self.set_fonts()
         self.set_colorscheme()
 
-        # Compile SCSS -> produce Const.STYLESHEET_MAIN (expected)
+        # Compiled CSS from the cache, or SCSS -> Const.STYLESHEET_MAIN on a miss
+        main_css = self._compiled_css(self.confh.config["theme"])
+
+        # Main css straight from memory, then the (separately watched) user overrides
+        self._apply_main_css(main_css)
+        self._sync_user_stylesheet()
+
+        # regenerate colors used outside CSS (svg indicators, battery...)
+        self.theme_service.set_theme(self.confh.config["theme"])
+
+    # ----------------------------
+    # SCSS compile
+    # ----------------------------
+    def _scss_digest(self, theme: str) -> str:
+        """Hash of every .scss input for `theme` (theme, font and sass binary included)."""
+        h = hashlib.blake2b(digest_size=16)
+        for part in (
+            theme,
+            self.confh.config["font"],
+            self.confh.config["font-size"],
+            _dart_sass_path,
+        ):
+            h.update(f"{part}\0".encode("utf-8"))
+        root = Path(Const.STYLESHEET_SCSS_DIR)
+        for path in sorted(root.rglob("*.scss")):
+            if path.parent == root and path.name in GENERATED_PARTIALS:
+                continue
+            h.update(path.relative_to(root).as_posix().encode("utf-8") + b"\0")
+            h.update(path.read_bytes() + b"\0")
+        return h.hexdigest()
+
+    def _cached_css(self, digest: str) -> str | None:
+        with self._bundles_lock:
+            css = self._bundles.get(digest)
+        if css is not None:
+            return css
+        cached = CSS_CACHE_DIR / f"{digest}.css"
+        if not cached.is_file():
+            return None
+        try:
+            css = cached.read_text(encoding="utf-8")
+            os.utime(cached)  # keep recently used entries on prune
+        except Exception as e:
+            logger.warning(f"Failed reading cached stylesheet {cached}: {e}")
+            return None
+        with self._bundles_lock:
+            self._bundles[digest] = css
+        return css
+
+    def _compiled_css(self, theme: str) -> str:
+        """Compiled main CSS: cached bundle when the SCSS inputs are unchanged, else run dart-sass."""
+        try:
+            digest = self._scss_digest(theme)
+        except Exception as e:
+            logger.warning(f"Failed to hash SCSS inputs: {e}")
+            digest = None
+
+        if digest is not None:
+            css = self._cached_css(digest)
+            if css is not None:
+                logger.info("Loaded compiled stylesheet from cache.")
+                return css
+
         try:
             self._scss_compile()
         except Exception as e:
             logger.error(f"SCSS compilation failed: {e}")
 
-        # Build combined css (main + user if present) and apply to GTK on the main loop
+        main_css_path = Path(Const.STYLESHEET_MAIN)
+        if not main_css_path.exists():
+            logger.warning(f"Compiled main stylesheet not found: {main_css_path}")
+            return ""
+        try:
+            main_css = main_css_path.read_text(encoding="utf-8")
+        except Exception as e:
+            logger.warning(f"Failed reading main stylesheet {main_css_path}: {e}")
+            return ""
+
+        if digest is not None and main_css:
+            self._store_bundle(digest, main_css)
+        return main_css
+
+    def _precompile_themes(self) -> bool:
+        """Queue the other themes for `_precompile_next`, once, after startup."""
+        active = self.confh.config["theme"]
+        pending = [theme for theme in available_themes() if theme != active]
+        if pending:
+            self._precompile_next(pending, self._font_scss())
+        return False
+
+    def _precompile_next(self, pending: list[str], font_scss: str) -> bool:
+        """Build the next uncached theme off the main loop, then yield to idle."""
+        while pending:
+            theme = pending.pop(0)
+            try:
+                digest = self._scss_digest(theme)
+            except Exception:
+                continue
+            if self._cached_css(digest) is None:
+                break
+        else:
+            return False
+
+        def worker():
+            try:
+                self._ensure_sass_executable()
+                self._store_bundle(digest, self._compile_theme(theme, font_scss))
+                logger.debug(f"Precompiled stylesheet for theme '{theme}'.")
+            except Exception as e:
+                logger.warning(f"Failed to precompile theme '{theme}': {e}")
+            if pending:
+                GLib.idle_add(
+                    self._precompile_next,
+                    pending,
+                    font_scss,
+                    priority=GLib.PRIORITY_LOW,
+                )
+
+        threading.Thread(target=worker, daemon=True).start()
+        return False
+
+    def _compile_theme(self, theme: str, font_scss: str) -> str:
+        """Compile the stylesheet for `theme` in a temporary copy of the SCSS tree."""
+        with tempfile.TemporaryDirectory(prefix="moonlight-scss-") as tmp:
+            root = Path(tmp) / "scss"
+            shutil.copytree(Const.STYLESHEET_SCSS_DIR, root)
+            (root / "_font.scss").write_text(font_scss)
+            (root / "_theme.scss").write_text(
+                (root / "themes" / f"{theme}.scss").read_text()
+            )
+            out = Path(tmp) / "main.css"
+            compile(filenames=((root / "import.scss").as_posix(), out.as_posix()))
+            return out.read_text(encoding="utf-8")
+
+    def _store_bundle(self, digest: str, css: str) -> None:
+        with self._bundles_lock:
+            self._bundles[digest] = css
+        self._store_cached_css(CSS_CACHE_DIR / f"{digest}.css", css)
 
+    def _store_cached_css(self, cached: Path, css: str) -> None:
         try:
-            combined_path = self._build_combined_css()
-            # schedule apply on the GTK main loop (idle)
-            self._apply_provider_from_file(combined_path)
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            tmp_fd, tmp_path = tempfile.mkstemp(prefix=cached.name, dir=cached.parent)
+            with os.fdopen(tmp_fd, "w", encoding="utf-8") as f:
+                f.write(css)
+            os.replace(tmp_path, cached)
         except Exception as e:
-            logger.exception(f"Failed to build/apply combined stylesheet: {e}")
+            logger.warning(f"Failed to cache compiled stylesheet: {e}")
+            return
 
-    # ----------------------------
-    # SCSS compile
-    # ----------------------------
-    def _scss_compile(self) -> None:
-        """Compile SCSS to CSS using Dart Sass (dartsass.compile wrapper)."""
+        # prune least recently used entries
+        def mtime(p: Path) -> float:
+            try:
+                return p.stat().st_mtime
+            except OSError:
+                return 0.0
+
+        entries = sorted(cached.parent.glob("*.css"), key=mtime, reverse=True)
+        for old in entries[CSS_CACHE_KEEP:]:
+            try:
+                old.unlink()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _ensure_sass_executable() -> None:
         sass_bin = Path(_dart_sass_path)
         if not os.access(sass_bin, os.X_OK):
             try:
@@ -57,6 +255,10 @@ class Stylesheet:
             except Exception as e:
                 logger.warning(f"Failed to chmod sass binary: {e}")
 
+    def _scss_compile(self) -> None:
+        """Compile SCSS to CSS using Dart Sass (dartsass.compile wrapper)."""
+        self._ensure_sass_executable()
+
         try:
             compile(
                 filenames=(
@@ -70,15 +272,10 @@ class Stylesheet:
             raise
 
     # ----------------------------
-    # Build combined CSS
+    # User overrides
     # ----------------------------
-    def _build_combined_css(self) -> Path:
-        """
-        Read compiled main CSS and user overrides (if configured and valid),
-        produce a combined temporary CSS file. Returns path to that temp file.
-        """
-
-        # --- determine user override path (if any) ---
+    def _user_stylesheet_path(self) -> Path | None:
+        """Configured user stylesheet, created from a template if missing. None -> no overrides."""
         conf = getattr(self.confh, "config", None)
         raw_user = None
         if isinstance(conf, dict):
@@ -86,128 +283,147 @@ class Stylesheet:
 
         # If user didn't provide a path or provided empty string -> ignore overrides
         if not raw_user or (isinstance(raw_user, str) and raw_user.strip() == ""):
-            user_path = None
             logger.debug(
                 "No user stylesheet configured (empty or missing) -> skipping user overrides."
             )
-        else:
-            user_path = Path(raw_user).expanduser()
+            return None
 
-        user_css = ""
-        # If user_path present, validate and ensure file exists (or create template)
-        if user_path:
-            if user_path.exists() and user_path.is_dir():
-                logger.warning(f"User stylesheet is a directory, ignoring: {user_path}")
-                user_path = None
-            else:
-                # ensure parent dir exists
-                user_path.parent.mkdir(parents=True, exist_ok=True)
-                if not user_path.exists():
-                    # create template file
-                    template = (
-                        "/* User overrides for yourbar\n"
-                        "   Add CSS rules here to override defaults.\n"
-                        "   Example:\n"
-                        "   .statusbar { background: #ff0000; }\n"
-                        "*/\n\n"
-                    )
-                    try:
-                        user_path.write_text(template, encoding="utf-8")
-                        logger.info(f"Created user stylesheet template: {user_path}")
-                    except Exception as e:
-                        logger.warning(
-                            f"Unable to create user stylesheet template {user_path}: {e}"
-                        )
-                        user_path = None
-
-            # read user css if file present and readable
-            if user_path and user_path.exists() and user_path.is_file():
-                try:
-                    user_css = user_path.read_text(encoding="utf-8")
-                except Exception as e:
-                    logger.warning(f"Failed reading user stylesheet {user_path}: {e}")
-                    user_css = ""
+        user_path = Path(raw_user).expanduser()
+        if user_path.exists() and user_path.is_dir():
+            logger.warning(f"User stylesheet is a directory, ignoring: {user_path}")
+            return None
 
-        # Read compiled main CSS (produced by SCSS compile)
-        main_css_path = Path(Const.STYLESHEET_MAIN)
-        if not main_css_path.exists():
-            logger.warning(f"Compiled main stylesheet not found: {main_css_path}")
-            main_css = ""
-        else:
+        # ensure parent dir exists
+        user_path.parent.mkdir(parents=True, exist_ok=True)
+        if not user_path.exists():
             try:
-                main_css = main_css_path.read_text(encoding="utf-8")
+                user_path.write_text(USER_TEMPLATE, encoding="utf-8")
+                logger.info(f"Created user stylesheet template: {user_path}")
             except Exception as e:
-                logger.warning(f"Failed reading main stylesheet {main_css_path}: {e}")
-                main_css = ""
+                logger.warning(
+                    f"Unable to create user stylesheet template {user_path}: {e}"
+                )
+                return None
+        return user_path
+
+    def _sync_user_stylesheet(self) -> None:
+        """(Re)attach the file monitor to the configured user stylesheet and load it."""
+        user_path = self._user_stylesheet_path()
+        if user_path != self._user_path:
+            if self._user_monitor is not None:
+                self._user_monitor.cancel()
+                self._user_monitor = None
+            self._user_path = user_path
+            if user_path is not None:
+                try:
+                    self._user_monitor = Gio.File.new_for_path(
+                        str(user_path)
+                    ).monitor_file(Gio.FileMonitorFlags.WATCH_MOVES, None)
+                    self._user_monitor.connect("changed", self._on_user_stylesheet_changed)
+                except Exception as e:
+                    logger.warning(f"Cannot watch user stylesheet {user_path}: {e}")
+        self._reload_user_css()
 
-        # Combine: main first; append user overrides only if user_css not empty
-        if user_css and user_css.strip():
-            combined = f"{main_css}\n\n/* ---- User overrides: {user_path} ---- */\n{user_css}\n"
-        else:
-            combined = main_css
+    def _on_user_stylesheet_changed(self, _monitor, _file, _other, event) -> None:
+        if event == Gio.FileMonitorEvent.ATTRIBUTE_CHANGED:
+            return
+        if self._user_pending is not None:
+            GLib.source_remove(self._user_pending)
+        self._user_pending = GLib.timeout_add(
+            USER_RELOAD_DEBOUNCE_MS, self._reload_user_css
+        )
 
-        # Write combined to an atomic temp file and return its Path
-        tmp_fd, tmp_path = tempfile.mkstemp(prefix="yourbar_combined_", suffix=".css")
-        os.close(tmp_fd)
-        tmp_path = Path(tmp_path)
-        try:
-            tmp_path.write_text(combined, encoding="utf-8")
-        except Exception as e:
-            logger.error(f"Failed to write combined CSS to {tmp_path}: {e}")
-            raise
+    def _reload_user_css(self) -> bool:
+        self._user_pending = None
+        user_css = ""
+        if self._user_path is not None and self._user_path.is_file():
+            try:
+                user_css = self._user_path.read_text(encoding="utf-8")
+            except Exception as e:
+                logger.warning(f"Failed reading user stylesheet {self._user_path}: {e}")
 
-        return tmp_path
+        if user_css.strip():
+            provider = self._make_provider(user_css)
+            if provider is not None:
+                self._user_provider = self._swap_provider(
+                    self._user_provider, provider, USER_PRIORITY
+                )
+                logger.info(f"Applied user stylesheet: {self._user_path}")
+        elif self._user_provider is not None:
+            self._user_provider = self._swap_provider(
+                self._user_provider, None, USER_PRIORITY
+            )
+        return False
 
-    def set_fonts(self):
+    def _font_scss(self) -> str:
         font = self.confh.config["font"]
         font_size = self.confh.config["font-size"]
 
-        style = f"""
+        return f"""
         * {{
           font-family: {font};
           font-size: {font_size}px;
         }}
         """
 
-        Path(Const.STYLESHEET_SCSS_DIR / "_font.scss").write_text(style)
+    def set_fonts(self):
+        self._write_if_changed(
+            Const.STYLESHEET_SCSS_DIR / "_font.scss", self._font_scss()
+        )
 
     def set_colorscheme(self):
         colorscheme = Path(self.confh.config["theme"])
         theme = Const.STYLESHEET_SCSS_DIR / "themes" / f"{colorscheme}.scss"
-        Path(Const.STYLESHEET_SCSS_DIR / "_theme.scss").write_text(theme.read_text())
+        self._write_if_changed(
+            Const.STYLESHEET_SCSS_DIR / "_theme.scss", theme.read_text()
+        )
+
+    @staticmethod
+    def _write_if_changed(path: Path, content: str) -> None:
+        """Write a generated partial only when its content differs (keeps mtimes stable)"""
+        try:
+            if path.read_text() == content:
+                return
+        except OSError:
+            pass
+        path.write_text(content)
 
     # ----------------------------
     # Apply CSS to GTK
     # ----------------------------
-    def _apply_provider_from_file(self, css_path: Path) -> None:
-        """
-        Load CSS from a file into a CssProvider and add it to the screen.
-        This function is intended to be called on the GTK main loop (via idle_add).
-        """
-        try:
-            css_bytes = css_path.read_bytes()
-        except Exception as e:
-            logger.error(f"Failed to read combined CSS {css_path}: {e}")
-            return
-
+    def _make_provider(self, css: str) -> Gtk.CssProvider | None:
         provider = Gtk.CssProvider()
         try:
-            provider.load_from_data(css_bytes)  # type: ignore
+            provider.load_from_data(css.encode("utf-8"))  # type: ignore
         except Exception as e:
             logger.error(f"CssProvider failed to load data: {e}")
-            return
-
+            return None
+        return provider
+
+    def _swap_provider(
+        self,
+        old: Gtk.CssProvider | None,
+        new: Gtk.CssProvider | None,
+        priority: int,
+    ) -> Gtk.CssProvider | None:
+        """Replace `old` with `new` on the default screen; returns the provider now installed."""
         screen = Gdk.Screen.get_default()  # type: ignore
         if screen is None:
             logger.warning("No Gdk.Screen available; cannot apply stylesheet.")
-            return
+            return old
 
-        Gtk.StyleContext.add_provider_for_screen(  # type: ignore
-            screen,
-            provider,
-            Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION + 100,
-        )
-        logger.info("Applied combined stylesheet to screen.")
+        if old is not None:
+            Gtk.StyleContext.remove_provider_for_screen(screen, old)  # type: ignore
+        if new is not None:
+            Gtk.StyleContext.add_provider_for_screen(screen, new, priority)  # type: ignore
+        return new
+
+    def _apply_main_css(self, main_css: str) -> None:
+        provider = self._make_provider(main_css)
+        if provider is None:
+            return
+        self._provider = self._swap_provider(self._provider, provider, MAIN_PRIORITY)
+        logger.info("Applied main stylesheet to screen.")
 
     # ----------------------------
     # Optional helpers
@@ -6,16 +6,19 @@ from loguru import logger
 from ..initialization import WIDGETS
 from .config import ConfigHandlerWidgets
 from .stylesheet import Stylesheet
+from .config_reloader import ConfigReloader
 
 
 class WidgetsHandler:
     def __init__(self) -> None:
         Const.APP_PID_FILE.write_text(str(os.getpid()))
         self.confh = ConfigHandlerWidgets()
-        Stylesheet(self)
+        self.stylesheet = Stylesheet(self)
         modules = [m for m in WIDGETS if m is not None]
         self.windows = self._load_enabled_modules(modules)
         self.app = Application(Const.APP_NAME, *self.windows)
+        self.reloader = ConfigReloader(self)
+        self.reloader.connect_global(self.stylesheet.reload)
 
     def _load_enabled_modules(self, modules: list) -> list:
         loaded = []
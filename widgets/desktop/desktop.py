@@ -42,6 +42,7 @@ else:
             )
 
             self.confh = config_handler
+            self._tools_config = self.confh.config["tools"]
             self.grid = GridConfig(cols=91, rows=51, cell_w=20, cell_h=20, gap=1)
 
             self.grid_overlay = GridOverlay(self.grid)
@@ -54,3 +55,7 @@ else:
             self.root.move(widget, widget._grid_x, widget._grid_y)
 
             self.toolbutton = ToolButton(self)
+
+        def on_config_reload(self) -> bool:
+            # the tool button is built once from `tools`, nothing else is cached
+            return self.confh.config["tools"] == self._tools_config
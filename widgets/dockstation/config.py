@@ -4,8 +4,13 @@ from .modules.anchors import ANCH_DICT
 
 
 class ConfigHandlerDockStation(ConfigurationHandler):
+    config_keys = ("widgets.dockstation",)
+
     def __init__(self):
         super().__init__()
+        self.reload()
+
+    def reload(self) -> None:
         cfg = self.get_option("widgets.dockstation") or {}
         self.config: Dict[str, Any] = cfg if isinstance(cfg, dict) else {}
         self.orientation = "v" if self.is_vertical() else "h"
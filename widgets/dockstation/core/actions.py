@@ -1,13 +1,11 @@
-import re
-import shlex
-import threading
-import configparser
-from pathlib import Path
 from typing import TYPE_CHECKING
+from loguru import logger
 from utils.constants import Const
 from utils.jsonc import jsonc
 
-from fabric.utils import exec_shell_command_async, GLib
+from services.desktop_entries import DesktopEntryIndex
+from services.hyprland_dispatch import dispatch
+from utils.app_resolution_cache import AppResolutionCache
 
 if TYPE_CHECKING:
     from ..dock import DockStation
@@ -16,147 +14,109 @@ if TYPE_CHECKING:
 class DockStationActions:
     def __init__(self, dockstation: "DockStation"):
         self.dockstation = dockstation
-        self._cache: dict[str, str] = {}
+        self._cache = AppResolutionCache()
 
     def _get_focused(self) -> str:
-        return self.dockstation.hypr.data_activewindow().get("address")  # type: ignore
+        return (self.dockstation.hypr.state.active_client() or {}).get("address")  # type: ignore
 
     def _normalize(self, name: str) -> str:
         return name.strip().lower().replace(" ", "").replace("-", "").replace("_", "")
 
     def _resolve_exec(self, app: str) -> str:
         norm_app = self._normalize(app)
-        if norm_app in self._cache:
-            return self._cache[norm_app]
-
-        search_paths = [
-            Const.HOME / ".local/share/applications",
-            Path("/usr/share/applications"),
-        ]
-
-        for sp in search_paths:
-            if not sp.exists():
+        cached = self._cache.get(app, "exec")
+        if cached:
+            return cached
+
+        index = DesktopEntryIndex()
+        exact = index.match(app, lambda entry: bool(entry.exec_cmd))
+        if exact is not None:
+            self._cache.update(app, exec=exact.exec_cmd, desktop_id=exact.id)
+            return exact.exec_cmd
+
+        for entry in index.entries():
+            cmd = entry.exec_cmd
+            if not cmd:
                 continue
-            for file in sp.glob("*.desktop"):
-                try:
-                    cp = configparser.ConfigParser(interpolation=None)
-                    cp.read(file, encoding="utf-8")
-                    if "Desktop Entry" not in cp:
-                        continue
-                    entry = cp["Desktop Entry"]
-
-                    name = entry.get("Name", "")
-                    wmclass = entry.get("StartupWMClass", "")
-                    exec_cmd = entry.get("Exec", "")
-
-                    if not exec_cmd:
-                        continue
-
-                    exec_cmd = re.sub(r"\s+%[fFuUdDnNickvm]", "", exec_cmd).strip()
-                    cmd = shlex.split(exec_cmd)[0]
-
-                    if wmclass and self._normalize(wmclass) == norm_app:
-                        self._cache[norm_app] = cmd
-                        return cmd
-
-                    if name and norm_app in self._normalize(name):
-                        self._cache[norm_app] = cmd
-                        return cmd
-
-                    if norm_app in self._normalize(file.stem):
-                        self._cache[norm_app] = cmd
-                        return cmd
-
-                except Exception:
-                    continue
-
-        self._cache[norm_app] = app
+            if (
+                (entry.wm_class and self._normalize(entry.wm_class) == norm_app)
+                or (entry.name and norm_app in self._normalize(entry.name))
+                or norm_app in self._normalize(entry.stem)
+            ):
+                self._cache.update(app, exec=cmd, desktop_id=entry.id)
+                return cmd
+
+        self._cache.update(app, exec=app)
         return app
 
-    def handle_app(self, app: str, instances: list[dict]):
+    def _handle_app_dispatchers(self, app: str, instances: list[dict]) -> list[str]:
+        """Dispatchers that launch `app`, or focus its next instance"""
         if not instances:
-            cmd = self._resolve_exec(app)
-            threading.Thread(
-                target=exec_shell_command_async,
-                args=(f"nohup setsid {cmd} >/dev/null 2>&1 &",),
-                daemon=True,
-            ).start()
-        else:
-            focused = self._get_focused()
-            idx = next(
-                (
-                    i
-                    for i, inst in enumerate(instances)
-                    if inst.get("address") == focused
-                ),
-                -1,
-            )
-            next_inst = instances[(idx + 1) % len(instances)]
-            exec_shell_command_async(
-                f"hyprctl dispatch focuswindow address:{next_inst['address']}"
-            )
+            # the compositor spawns it: no fork/exec (or thread) on our side
+            return [f"exec {self._resolve_exec(app)}"]
+        focused = self._get_focused()
+        idx = next(
+            (i for i, inst in enumerate(instances) if inst.get("address") == focused),
+            -1,
+        )
+        next_inst = instances[(idx + 1) % len(instances)]
+        return [f"focuswindow address:{next_inst['address']}"]
+
+    def handle_app(self, app: str, instances: list[dict]):
+        dispatch(*self._handle_app_dispatchers(app, instances))
 
     def move_to_workspace(self, app: str, ws: int):
         instances = self.dockstation.hypr.windows_for_app(app)
-        self.handle_app(app, instances)
-        exec_shell_command_async(f"hyprctl dispatch movetoworkspace {ws}")
+        dispatch(
+            *self._handle_app_dispatchers(app, instances),
+            f"movetoworkspace {ws}",
+        )
 
     def fullscreen_app(self, app: str):
         instances = self.dockstation.hypr.windows_for_app(app)
-        for inst in instances:
-            exec_shell_command_async(
-                f"hyprctl dispatch fullscreen address:{inst['address']}"
-            )
+        dispatch(*(f"fullscreen address:{inst['address']}" for inst in instances))
 
     def toggle_floating_app(self, app: str):
         instances = self.dockstation.hypr.windows_for_app(app)
-        for inst in instances:
-            exec_shell_command_async(
-                f"hyprctl dispatch togglefloating address:{inst['address']}"
-            )
+        dispatch(*(f"togglefloating address:{inst['address']}" for inst in instances))
 
     def fullscreen_window(self, window: dict):
         address = window.get("address")
         if address:
-            exec_shell_command_async(f"hyprctl dispatch fullscreen address:{address}")
+            dispatch(f"fullscreen address:{address}")
 
     def toggle_floating_window(self, window: dict):
         address = window.get("address")
         if address:
-            exec_shell_command_async(
-                f"hyprctl dispatch togglefloating address:{address}"
-            )
+            dispatch(f"togglefloating address:{address}")
 
     def move_window_to_workspace(self, window: dict, ws: int):
         address = window.get("address")
         if not address:
-            print("No address in window:", window)
+            logger.debug(f"[DockStationActions] No address in window: {window}")
             return
 
-        import shlex
-
-        safe_address = shlex.quote(address)
-        exec_shell_command_async(f"hyprctl dispatch focuswindow address:{safe_address}")
-        GLib.timeout_add(
-            50,
-            lambda: exec_shell_command_async(
-                f"hyprctl dispatch movetoworkspace address:{safe_address} {ws}"
-            ),
+        # one batch: focus and move are applied back to back, no timer between them
+        dispatch(
+            f"focuswindow address:{address}",
+            f"movetoworkspace {ws},address:{address}",
         )
 
     def close_window(self, window: dict):
         address = window.get("address")
         if address:
-            exec_shell_command_async(f"hyprctl dispatch closewindow address:{address}")
+            dispatch(f"closewindow address:{address}")
 
     def close_app(self, ws: int, app: str):
         instances = self.dockstation.hypr.windows_for_app(app)
+        addresses = []
         for w in instances:
             ws_val = w.get("workspace")
             if isinstance(ws_val, dict):
                 ws_val = ws_val.get("id", 1)
-            if ws_val == ws:
-                self.close_window(w)
+            if ws_val == ws and w.get("address"):
+                addresses.append(w["address"])
+        dispatch(*(f"closewindow address:{a}" for a in addresses))
 
     def pin_unpin(self, app: str) -> None:
         old = list(self.dockstation.items.pinned)
@@ -176,4 +136,4 @@ class DockStationActions:
     def focus_window(self, window: dict):
         address = window.get("address")
         if address:
-            exec_shell_command_async(f"hyprctl dispatch focuswindow address:{address}")
+            dispatch(f"focuswindow address:{address}")
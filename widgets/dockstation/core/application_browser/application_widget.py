@@ -49,6 +49,7 @@ class ApplicationBrowserWidget(Revealer):
     def on_show(self, hamburger=None):
         self.dockstation.exclusivity = "none"
 
+        self.app_browser.populate_all_apps()
         self.show()
         if self._show_timeout_id is not None:
             GLib.source_remove(self._show_timeout_id)
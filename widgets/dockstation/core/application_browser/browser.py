@@ -3,19 +3,28 @@ from fabric.widgets.box import Box
 from fabric.widgets.button import Button
 from fabric.widgets.flowbox import FlowBox
 from fabric.widgets.scrolledwindow import ScrolledWindow
-from fabric.utils import GLib, get_desktop_applications, DesktopApp
+from fabric.utils import GLib, DesktopApp
 from fabric.widgets.label import Label
 
 from .button_handler import ButtonHandler
+from .search_index import AppSearchIndex
 
 from .search_icon import search_icon
 from shared.animated_entry import Entry
+from utils.icon_cache import IconCache
+from utils.launch_history import LaunchHistory
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, Tuple
 
 if TYPE_CHECKING:
     from ...dock import DockStation
 
+# ranking a query takes well under a millisecond; this only batches keystrokes
+SEARCH_DEBOUNCE_MS = 40
+# buttons created per frame while the grid is being filled
+POPULATE_BATCH = 16
+PREWARM_DELAY_S = 5
+
 
 class ApplicationBrowser(Box):
     def __init__(self, dockstation: "DockStation"):
@@ -41,6 +50,8 @@ class ApplicationBrowser(Box):
 
         self.search_timer = None
         self.current_search_query = ""
+        # app index -> position in the results, None when not searching
+        self._rank: Optional[Dict[int, int]] = None
 
         self.search_entry.connect("changed", self.on_search_changed)
 
@@ -86,6 +97,7 @@ class ApplicationBrowser(Box):
         )
 
         self.app_box.set_filter_func(self._flowbox_filter)
+        self.app_box.set_sort_func(self._flowbox_sort)
 
         if self.dockstation.confh.is_vertical():
 
@@ -105,29 +117,61 @@ class ApplicationBrowser(Box):
         if self.dockstation.confh.is_vertical():
             self.dockstation.main_box.connect("size-allocate", resize_scroll)  # type: ignore
 
-        self.all_apps: list[DesktopApp] = get_desktop_applications() or []
+        # filled on first open (or prewarm): startup cost must not grow with
+        # the number of installed applications
+        self.all_apps: list[DesktopApp] = []
+        self.search_index = AppSearchIndex(self.all_apps)
         self.filtered_apps: list[DesktopApp] = []
         self.items: list[Button] = []
         self.selected_index: int = -1
-
-        self.populate_all_apps()
+        self._pending_apps: Optional[Iterator[Tuple[int, DesktopApp]]] = None
 
         self.add(self.scroll)
 
+        if self.dockstation.confh.config.get("app-browser-prewarm", False):
+            GLib.timeout_add_seconds(PREWARM_DELAY_S, self._prewarm)
+
     # --- создание кнопок один раз ---
     def populate_all_apps(self):
-        self.items = []
-        for index, app in enumerate(self.all_apps):
+        """Start filling the grid, POPULATE_BATCH buttons per frame (idempotent)"""
+        if self._pending_apps is not None or self.items:
+            return
+        self.all_apps = IconCache().applications()
+        self.search_index = AppSearchIndex(self.all_apps)
+        if self.current_search_query:
+            self.filter(self.current_search_query)
+        self._pending_apps = enumerate(self.all_apps)
+        self._schedule_batch()
+
+    def _prewarm(self) -> bool:
+        GLib.idle_add(self.populate_all_apps, priority=GLib.PRIORITY_LOW)
+        return False
+
+    def _schedule_batch(self):
+        # on the frame clock while visible, in idle time while hidden
+        if self.app_box.get_mapped():
+            self.app_box.add_tick_callback(lambda *_: self._add_batch())
+        else:
+            GLib.idle_add(self._add_batch, priority=GLib.PRIORITY_LOW)
+
+    def _add_batch(self) -> bool:
+        if self._pending_apps is None:
+            return False
+        for index, app in self._pending_apps:
             handler = ButtonHandler(self, app, index)
             btn = handler.btn
 
             btn._app_data = app
+            btn._app_index = index
 
             self.app_box.add(btn)
-            btn.show()
+            btn.show_all()
             self.items.append(btn)
-
-        self.app_box.show_all()
+            if len(self.items) % POPULATE_BATCH == 0:
+                self._schedule_batch()
+                return False
+        self._pending_apps = None
+        return False
 
     def on_search_changed(self, widget):
         if self.search_timer:
@@ -137,65 +181,53 @@ class ApplicationBrowser(Box):
                 pass
             self.search_timer = None
 
-        self.search_timer = GLib.timeout_add(150, self._perform_filter)
+        self.search_timer = GLib.timeout_add(SEARCH_DEBOUNCE_MS, self._perform_filter)
 
     def _perform_filter(self):
-        self.current_search_query = (
-            (self.search_entry.get_text() or "").strip().casefold()
-        )
-        try:
-            self.app_box.invalidate_filter()
-        except Exception:
-            self._fallback_manual_filter()
+        self.filter(self.search_entry.get_text() or "")
         self.search_timer = None
         return False
 
-    def _flowbox_filter(self, flowbox_child):
-        if not self.current_search_query:
+    def _matches(self, btn) -> bool:
+        if self._rank is None:
             return True
+        return getattr(btn, "_app_index", None) in self._rank
 
+    def _position(self, btn) -> int:
+        index = getattr(btn, "_app_index", 0)
+        if self._rank is None:
+            return index
+        return self._rank.get(index, len(self._rank) + index)
+
+    def _flowbox_filter(self, flowbox_child):
         try:
             btn = flowbox_child.get_child()
         except Exception:
             btn = flowbox_child
+        return self._matches(btn)
 
-        if not hasattr(btn, "_app_data"):
-            return False
-
-        app = btn._app_data
-
-        parts = []
-        for attr in ("display_name", "name", "generic_name", "executable"):
-            val = getattr(app, attr, None)
-            if val:
-                parts.append(str(val))
-        search_target = " ".join(parts).casefold()
-
-        return self.current_search_query in search_target
+    def _flowbox_sort(self, child_a, child_b):
+        a = self._position(child_a.get_child())
+        b = self._position(child_b.get_child())
+        return (a > b) - (a < b)
 
     def _fallback_manual_filter(self):
-        q = self.current_search_query
         for btn in self.items:
-            app = getattr(btn, "_app_data", None)
-            if app is None:
-                btn.hide()
-                continue
-
-            parts = []
-            for attr in ("display_name", "name", "generic_name", "executable"):
-                val = getattr(app, attr, None)
-                if val:
-                    parts.append(str(val))
-            search_target = " ".join(parts).casefold()
-
-            if not q or q in search_target:
+            if self._matches(btn):
                 btn.show()
             else:
                 btn.hide()
 
     def filter(self, query: str):
         self.current_search_query = (query or "").strip().casefold()
+        ranked = self.search_index.search(
+            self.current_search_query, LaunchHistory().scores()
+        )
+        self._rank = (
+            None if ranked is None else {index: pos for pos, index in enumerate(ranked)}
+        )
         try:
+            self.app_box.invalidate_sort()
             self.app_box.invalidate_filter()
         except Exception:
             self._fallback_manual_filter()
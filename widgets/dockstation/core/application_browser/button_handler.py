@@ -2,8 +2,10 @@ from typing import TYPE_CHECKING, Optional
 from fabric.utils import DesktopApp
 from fabric.widgets.button import Button
 from shared.app_icon import AppIcon
+from utils.launch_history import LaunchHistory
 from utils.widget_utils import setup_cursor_hover
 from ..dock_items.appcontextmenu import AppContextMenu
+from .search_index import app_key
 
 if TYPE_CHECKING:
     from .browser import ApplicationBrowser
@@ -29,7 +31,7 @@ class ButtonHandler:
             h_expand=True,
             v_expand=False,
             style_classes=["dockstation-btn-appbrowser"],
-            child=AppIcon(app_name=str(display_name), icon_size=48),
+            child=AppIcon(app_name=str(display_name), icon_size=48, lazy=True),
             tooltip_text=str(description),
         )
         setup_cursor_hover(btn)
@@ -55,6 +57,7 @@ class ButtonHandler:
                 self.app_browser.dockstation.actions.handle_app(
                     str(self.app.icon_name), []
                 )
+                LaunchHistory().record(app_key(self.app))
             except Exception:
                 pass
             try:
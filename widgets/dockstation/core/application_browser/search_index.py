@@ -0,0 +1,199 @@
+import re
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Set
+
+# the attributes the browser has always searched, title first
+SEARCH_FIELDS = ("display_name", "name", "generic_name", "executable")
+# longer query words are looked up by this prefix, then verified
+MAX_PREFIX = 16
+
+# shorter queries would match nearly every title as a subsequence
+SUBSEQUENCE_MIN = 3
+
+_WORD_RE = re.compile(r"[^\W_]+")
+_EMPTY: FrozenSet[int] = frozenset()
+
+
+def app_key(app: Any) -> str:
+    """Desktop id of a DesktopApp, or its name when it has none"""
+    info = getattr(app, "_app", None)
+    try:
+        desktop_id = info.get_id() if info is not None else None
+    except Exception:
+        desktop_id = None
+    return str(desktop_id or getattr(app, "name", "") or "")
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _grams(text: str) -> Set[str]:
+    """Every 1, 2 and 3 character substring"""
+    return {text[i : i + n] for n in (1, 2, 3) for i in range(len(text) - n + 1)}
+
+
+def _is_subsequence(needle: str, haystack: str) -> bool:
+    it = iter(haystack)
+    return all(c in it for c in needle)
+
+
+class AppSearchIndex:
+    """
+    Ranked search over a list of DesktopApps, built once per app-list load.
+
+    Each app's fields are casefolded once and posted under every word
+    prefix, title prefix and 1-3 character gram, so most queries are answered
+    by set intersections; only longer substrings and title subsequences are
+    verified app by app, and only on the apps the postings leave. Results
+    are ordered by match quality (exact field, title prefix, word prefix,
+    substring, subsequence of the title), then by launch score, then by
+    title length. A query that extends the previous one only looks at its
+    matches.
+    """
+
+    def __init__(self, apps: Sequence[Any]) -> None:
+        self.apps = list(apps)
+        self.keys = [app_key(app) for app in self.apps]
+        self.titles: List[str] = []
+        self._haystacks: List[str] = []
+        self._exact: Dict[str, Set[int]] = {}
+        self._title_prefixes: Dict[str, Set[int]] = {}
+        self._prefixes: Dict[str, Set[int]] = {}
+        self._grams: Dict[str, Set[int]] = {}
+        self._title_chars: Dict[str, Set[int]] = {}
+        self._by_key: Dict[str, List[int]] = {}
+        self._all: FrozenSet[int] = frozenset(range(len(self.apps)))
+
+        for index, app in enumerate(self.apps):
+            self._add(index, app)
+
+        # order among equally good, never launched matches
+        by_length = sorted(self._all, key=lambda i: (len(self.titles[i]), i))
+        self._order = [0] * len(self.apps)
+        for position, index in enumerate(by_length):
+            self._order[index] = position
+
+        self._last_query = ""
+        self._last_matches = self._all
+
+    def __len__(self) -> int:
+        return len(self.apps)
+
+    def _add(self, index: int, app: Any) -> None:
+        fields = []
+        for attr in SEARCH_FIELDS:
+            value = getattr(app, attr, None)
+            if value:
+                fields.append(" ".join(str(value).casefold().split()))
+        title = fields[0] if fields else ""
+        haystack = "\n".join(fields)
+
+        self.titles.append(title)
+        self._haystacks.append(haystack)
+        self._by_key.setdefault(self.keys[index], []).append(index)
+
+        for field in set(fields):
+            self._exact.setdefault(field, set()).add(index)
+        for n in range(1, min(len(title), MAX_PREFIX) + 1):
+            self._title_prefixes.setdefault(title[:n], set()).add(index)
+        for word in set(_WORD_RE.findall(haystack)):
+            for n in range(1, min(len(word), MAX_PREFIX) + 1):
+                self._prefixes.setdefault(word[:n], set()).add(index)
+        for gram in _grams(haystack):
+            self._grams.setdefault(gram, set()).add(index)
+        for char in set(title):
+            self._title_chars.setdefault(char, set()).add(index)
+
+    # ----------------------------
+    # Queries
+    # ----------------------------
+    def search(
+        self, query: str, scores: Optional[Dict[str, float]] = None
+    ) -> Optional[List[int]]:
+        """
+        Indices into `apps` of every match, best first. `scores` maps
+        `app_key()` to a launch score. None for an empty query (show all).
+        """
+        q = " ".join((query or "").casefold().split())
+        if not q:
+            self._last_query, self._last_matches = "", self._all
+            return None
+
+        # whatever matches q also matched any prefix of it (subsequences
+        # are only looked for from SUBSEQUENCE_MIN characters on)
+        pool = self._all
+        if (
+            self._last_query
+            and q.startswith(self._last_query)
+            and len(self._last_query.replace(" ", "")) >= SUBSEQUENCE_MIN
+        ):
+            pool = self._last_matches
+
+        exact = pool & self._exact.get(q, _EMPTY)
+        prefix = self._title_prefix_matches(q, pool) - exact
+        words = self._word_matches(q, pool) - exact - prefix
+        substrings = self._substring_matches(q, pool) - exact - prefix - words
+        subsequences = self._subsequence_matches(
+            q, pool - exact - prefix - words - substrings
+        )
+
+        scored: Dict[int, float] = {}
+        for key, score in (scores or {}).items():
+            if score > 0:
+                for index in self._by_key.get(key, ()):
+                    scored[index] = score
+
+        result: List[int] = []
+        for tier in (exact, prefix, words, substrings, subsequences):
+            launched = tier.intersection(scored)
+            if launched:
+                result += sorted(
+                    launched, key=lambda i: (-scored[i], self._order[i])
+                )
+                tier = tier - launched
+            result += sorted(tier, key=self._order.__getitem__)
+
+        self._last_query, self._last_matches = q, frozenset(result)
+        return result
+
+    def _title_prefix_matches(self, q: str, pool: FrozenSet[int]) -> FrozenSet[int]:
+        hits = pool & self._title_prefixes.get(q[:MAX_PREFIX], _EMPTY)
+        if len(q) > MAX_PREFIX:
+            hits = frozenset(i for i in hits if self.titles[i].startswith(q))
+        return hits
+
+    def _word_matches(self, q: str, pool: FrozenSet[int]) -> FrozenSet[int]:
+        """Apps with a word starting with each query word"""
+        hits = pool
+        for word in q.split(" "):
+            hits = hits & self._prefixes.get(word[:MAX_PREFIX], _EMPTY)
+            if len(word) > MAX_PREFIX:
+                pattern = re.compile(r"(?<![^\W_])" + re.escape(word))
+                hits = frozenset(i for i in hits if pattern.search(self._haystacks[i]))
+            if not hits:
+                break
+        return hits
+
+    def _substring_matches(self, q: str, pool: FrozenSet[int]) -> FrozenSet[int]:
+        if len(q) <= 3:
+            # a gram posting is exact
+            return pool & self._grams.get(q, _EMPTY)
+        candidates = pool
+        for gram in _trigrams(q):
+            candidates = candidates & self._grams.get(gram, _EMPTY)
+            if not candidates:
+                return _EMPTY
+        return frozenset(i for i in candidates if q in self._haystacks[i])
+
+    def _subsequence_matches(self, q: str, pool: FrozenSet[int]) -> FrozenSet[int]:
+        needle = q.replace(" ", "")
+        if len(needle) < SUBSEQUENCE_MIN:
+            return _EMPTY
+        candidates = pool
+        for char in set(needle):
+            candidates = candidates & self._title_chars.get(char, _EMPTY)
+            if not candidates:
+                return _EMPTY
+        return frozenset(
+            i for i in candidates if _is_subsequence(needle, self.titles[i])
+        )
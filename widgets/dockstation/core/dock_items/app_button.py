@@ -2,7 +2,7 @@ from typing import TYPE_CHECKING
 from fabric.widgets.box import Box
 from fabric.widgets.button import Button
 from fabric.utils import Gdk, GLib, idle_add
-from utils.widget_utils import set_cursor_now, setup_cursor_hover
+from utils.widget_utils import connect_while_alive, set_cursor_now, setup_cursor_hover
 from .wiggle_anims import Wiggle
 from .appcontextmenu import AppContextMenu
 from .button_handler import ButtonHandler
@@ -56,6 +56,19 @@ class DockAppButton:
         GLib.idle_add(_do_grab)
         return False
 
+    def _on_destroy(self, btn):
+        self._wiggle.cancel()  # type: ignore
+        if self._long_press_handle:
+            GLib.source_remove(self._long_press_handle)
+            self._long_press_handle = None
+        for which in ("top", "bottom", "start", "end"):
+            handle_name = f"_anim_handle_margin_{which}"
+            handle = getattr(btn, handle_name, None)
+            if handle:
+                GLib.source_remove(handle)
+                setattr(btn, handle_name, None)
+        self.appcontextmenu.menu.destroy()  # type: ignore
+
     def make_btn(self, app_name: str, icon, indicator):
         self.app_name = app_name
         inner = Box(
@@ -83,10 +96,13 @@ class DockAppButton:
             | Gdk.EventMask.LEAVE_NOTIFY_MASK  # type: ignore
         )
 
-        self.dockstation.main_event.connect(
+        connect_while_alive(
+            self.btn,
+            self.dockstation.main_event,
             "leave-notify-event",
             lambda: self.buttonh._on_leave(widget=self.btn),  # type: ignore
         )
+        self.btn.connect("destroy", self._on_destroy)
         self.btn.connect("button-press-event", self.buttonh.on_press)
         self.btn.connect("button-release-event", self.buttonh.on_release)
         self.btn.connect("enter-notify-event", self.dockstation.tools.hover_enter)
@@ -12,6 +12,7 @@ from utils.widget_utils import setup_cursor_hover
 from .pinned_unpinned_anims import PinAnimator
 from ..hamburger import HamburgerDrawing
 from utils.colors_parse import colors
+from services.theme import ThemeService
 
 
 if TYPE_CHECKING:
@@ -55,11 +56,19 @@ class DockStationItems(Box):
         self.pin_animator = PinAnimator(self)
         self.line_widget = None
         self.buttons: dict[str, Button] = {}
+        # window count each button's indicator currently shows
+        self._counts: dict[str, int] = {}
         self._dragging_mode = False
 
-        events = ["openwindow", "closewindow"]
-        for e in events:
-            self.dockstation.hypr.hyprctl.connect(f"event::{e}", self._update)
+        # a workspace restore opens dozens of windows: rebuild once per frame
+        self.dockstation.hypr.events.subscribe_coalesced(
+            ["openwindow", "closewindow"],
+            lambda _events: self._update_idle(full_build=True),
+            widget=self,
+            name="DockStationItems",
+        )
+        # indicators are svg strings with the theme color baked in
+        ThemeService().colors_changed.connect(lambda *_: self._update())
         self._update(full_build=True)
 
     def _create_button(self, app_name: str, count: int, icon_size: int) -> Button:
@@ -74,6 +83,7 @@ class DockStationItems(Box):
             indicator=indicator,
         )
         self.buttons[app_name] = btn
+        self._counts[app_name] = count
         setup_cursor_hover(btn)
         return btn
 
@@ -96,63 +106,74 @@ class DockStationItems(Box):
         except Exception:
             pass
 
-    def _clear_container(self):
-        for child in list(self.get_children()):
-            self.remove(child)
+    def _sync_indicator(self, name: str, btn: Button, count: int):
+        # re-rendering the svg is the costly part: skip unchanged counts
+        if self._counts.get(name) != count:
+            self._counts[name] = count
+            self._set_indicator(btn, count)
+
+    def _get_line_widget(self) -> Box:
+        if not self.line_widget:
+            self.line_widget = Box(name="dockstation-line")
+
+            if self.dockstation.confh.is_vertical():
+                self.line_widget.add_style_class("dockstation-line-vertical")
+        return self.line_widget
+
+    def _reconcile(self, desired: list):
+        # make the children exactly `desired`, touching only what differs:
+        # no clear-and-refill, no show_all() over the whole dock
+        wanted = set(desired)
+        current = []
+        for child in self.get_children():
+            if child in wanted:
+                current.append(child)
+            else:
+                self.remove(child)
+
+        for position, widget in enumerate(desired):
+            if widget.get_parent() is not self:
+                self.add(widget)
+                widget.show_all()
+                current.append(widget)
+            if current[position] is not widget:
+                self.reorder_child(widget, position)
+                current.remove(widget)
+                current.insert(position, widget)
+
+        if not self.get_visible():
+            self.show()
 
     def _rebuild_default(self, windows_counts: dict, icon_size: int):
-        self._clear_container()
-        self.add(self.hamburger_widget)
+        desired = [self.hamburger_widget]
         active = [name for name, c in windows_counts.items() if c > 0]
         for name in active:
-            btn = self._ensure_button(name, windows_counts.get(name, 0), icon_size)
-            if btn.get_parent() is None:
-                self.add(btn)
-            self._set_indicator(btn, windows_counts.get(name, 0))
-            btn.set_visible(True)
+            count = windows_counts.get(name, 0)
+            btn = self._ensure_button(name, count, icon_size)
+            self._sync_indicator(name, btn, count)
+            desired.append(btn)
         if active and self.pinned:
-            if not self.line_widget:
-                self.line_widget = Box(name="dockstation-line")
-
-                if self.dockstation.confh.is_vertical():
-                    self.line_widget.add_style_class("dockstation-line-vertical")
-
-            if self.line_widget.get_parent() is None:
-                self.add(self.line_widget)
-
-            self.line_widget.set_visible(True)
+            line = self._get_line_widget()
+            line.set_visible(True)
+            desired.append(line)
         for p in self.pinned:
             if p not in active:
-                btn = self._ensure_button(p, windows_counts.get(p, 0), icon_size)
-                if btn.get_parent() is None:
-                    self.add(btn)
-                self._set_indicator(btn, windows_counts.get(p, 0))
-                btn.set_visible(True)
-        # hide any other buttons not in active/pinned
-        shown = set(active) | set(self.pinned)
-        for name, btn in list(self.buttons.items()):
-            if name not in shown and btn.get_parent() is not None:
-                try:
-                    self.remove(btn)
-                except Exception:
-                    pass
+                count = windows_counts.get(p, 0)
+                btn = self._ensure_button(p, count, icon_size)
+                self._sync_indicator(p, btn, count)
+                desired.append(btn)
+        # any other buttons (not active/pinned) leave the box
+        self._reconcile(desired)
 
     def _rebuild_dragging(self, windows_counts: dict, icon_size: int):
-        self._clear_container()
+        desired = []
         for p in self.pinned:
-            btn = self._ensure_button(p, windows_counts.get(p, 0), icon_size)
-            if btn.get_parent() is None:
-                self.add(btn)
-            self._set_indicator(btn, windows_counts.get(p, 0))
-            btn.set_visible(True)
-        # hide any other buttons not in pinned
-        shown = set(self.pinned)
-        for name, btn in list(self.buttons.items()):
-            if name not in shown and btn.get_parent() is not None:
-                try:
-                    self.remove(btn)
-                except Exception:
-                    pass
+            count = windows_counts.get(p, 0)
+            btn = self._ensure_button(p, count, icon_size)
+            self._sync_indicator(p, btn, count)
+            desired.append(btn)
+        # only pinned buttons can be dragged around
+        self._reconcile(desired)
         if self.line_widget:
             try:
                 self.line_widget.set_visible(False)
@@ -167,7 +188,6 @@ class DockStationItems(Box):
         if dragging != self._dragging_mode:
             self._dragging_mode = dragging
             self._update(full_build=True)
-        self.show_all()
 
     def _update(self, full_build=False):
         GLib.idle_add(self._update_idle, full_build)
@@ -185,18 +205,17 @@ class DockStationItems(Box):
                 self._rebuild_dragging(windows_counts, icon_size)
             else:
                 self._rebuild_default(windows_counts, icon_size)
-            self.show_all()
             return
-        # otherwise update indicators only
+        # otherwise redraw indicators only (e.g. the theme color changed)
         for name, btn in self.buttons.items():
             count = windows_counts.get(name, 0)
+            self._counts[name] = count
             self._set_indicator(btn, count)
         if self.line_widget:
             self.line_widget.set_visible(
                 not dragging
                 and any(windows_counts.get(a, 0) > 0 for a in windows_counts)
             )
-        self.show_all()
 
     def get_current_order(self) -> list[str]:
         order = []
@@ -69,6 +69,15 @@ class Wiggle:
             GLib.source_remove(self.fade_id)
         self.fade_id = GLib.timeout_add(20, self._fade_to_zero)
 
+    def cancel(self):
+        """Remove pending timers without easing back, for a destroyed button"""
+        self.is_wiggling = False
+        for attr in ("tick_id", "fade_id"):
+            source = getattr(self, attr)
+            if source:
+                GLib.source_remove(source)
+                setattr(self, attr, None)
+
     def _fade_to_zero(self):
         done = all(abs(v) < 0.4 for v in self._margins.values())
         if done:
@@ -21,6 +21,8 @@ else:
     class DockStation(Window):
         def __init__(self):
             self.confh = config_handler
+            # layout and hover wiring are decided once from these
+            self._layout_options = self._get_layout_options()
             self.actions = DockStationActions(self)
             self.tools = DockStationTools(self)
             self.hypr = Hypr(self)
@@ -36,16 +38,7 @@ else:
 
             self.main_event = EventBox(child=EventBox(child=self.main_box))
             self.hover_line = EventBox(name="dockstation-hover-line")
-            if self.confh.is_vertical():
-                self.hover_line.set_size_request(
-                    self.confh.config["hover"]["thickness"],
-                    self.confh.config["hover"]["max-width"],
-                )
-            else:
-                self.hover_line.set_size_request(
-                    self.confh.config["hover"]["max-width"],
-                    self.confh.config["hover"]["thickness"],
-                )
+            self._size_hover_line()
             super().__init__(
                 name="dockstation",
                 anchor=self.confh.config["anchor"],
@@ -109,3 +102,30 @@ else:
                     hamburger=self.items.hamburger
                 ),
             )
+
+        def _get_layout_options(self) -> tuple:
+            return (
+                self.confh.config["anchor"],
+                self.confh.config["auto-hide"],
+                self.confh.orientation,
+            )
+
+        def _size_hover_line(self):
+            hover = self.confh.config["hover"]
+            if self.confh.is_vertical():
+                self.hover_line.set_size_request(hover["thickness"], hover["max-width"])
+            else:
+                self.hover_line.set_size_request(hover["max-width"], hover["thickness"])
+
+        def on_config_reload(self) -> bool:
+            if self._get_layout_options() != self._layout_options:
+                return False
+            self.layer = self.confh.config["layer"]
+            self.margin = self.confh.config["margin"]
+            self._size_hover_line()
+            # icon size is baked into each button
+            for btn in self.items.buttons.values():
+                btn.destroy()
+            self.items.buttons.clear()
+            self.items._update(full_build=True)
+            return True
@@ -104,15 +104,10 @@ class WindowPreviewPopup(Window):
                 self._screenshots_by_app.pop(app, None)
 
     def _get_current_workspace_id(self) -> Optional[int]:
-        monitors = self.conf.hypr.data_monitors() or {}
-        for m in monitors.values():
-            raw = m.get("raw") or {}
-            if raw.get("focused"):
-                aw = raw.get("activeWorkspace") or {}
-                wid = aw.get("id")
-                if wid is not None:
-                    return int(wid)
-        aw = self.conf.hypr.data_activewindow() or {}
+        wid = self.conf.hypr.state.active_workspace_id()
+        if wid is not None:
+            return wid
+        aw = self.conf.hypr.state.active_client() or {}
         ws = (aw.get("workspace") or {}) or {}
         wid = ws.get("id")
         if wid is not None:
@@ -185,8 +180,9 @@ class WindowPreviewPopup(Window):
         self._watchers[path] = source_id
 
     def screenshot(self, name: str) -> Optional[Dict[int, str]]:
+        # grim needs current window geometry, which only a resync provides
+        clients = self.conf.hypr.data_clients(fresh=True)
         self.sync_with_clients()
-        clients = self.conf.hypr.data_clients()
         wc = self.conf.hypr.windows_and_counts()
         count = wc.get(name, 0)
         if count == 0:
@@ -1,6 +1,7 @@
-from fabric.hyprland import Hyprland
-from typing import TYPE_CHECKING, Dict, Any
-import json
+from services.hyprland_events import HyprlandEventHub
+from services.hyprland_query import HyprlandQuery
+from services.hyprland_state import HyprlandState
+from typing import TYPE_CHECKING, Callable, Dict, Any
 
 if TYPE_CHECKING:
     from ..dock import DockStation
@@ -9,42 +10,29 @@ if TYPE_CHECKING:
 class Hypr:
     def __init__(self, dockstation: "DockStation"):
         self.dockstation = dockstation
-        self.hyprctl = Hyprland()
-
-    def _send_json(self, cmd: str) -> dict | None:
-        reply = Hyprland.send_command(cmd)
-        if not reply.reply:
-            return None
-        return json.loads(reply.reply.decode())
+        self.events = HyprlandEventHub()
+        self.state = HyprlandState()
+        self.query = HyprlandQuery()
 
     def windows_for_app(self, app_name: str) -> list[dict]:
-        instances: list[dict] = []
-        for client in self.data_clients() or []:
-            name = client.get("initialClass") or client.get("class") or ""
-            if name.lower() == app_name.lower():
-                instances.append(client)
-        return instances
+        return self.state.clients_for_class(app_name)
 
-    def data_activewindow(self) -> Dict[str, Any]:
-        data = self._send_json("j/activewindow")
-        return data or {}
+    def data_activewindow(self, callback: Callable[[Dict[str, Any]], None]) -> None:
+        # live query: auto-hide needs the current geometry, which no event reports
+        self.query.query("j/activewindow", lambda data: callback(data or {}))
 
-    def data_clients(self) -> list[dict]:
-        data = self._send_json("j/clients")
-        return data if isinstance(data, list) else []
+    def data_clients(self, fresh: bool = False) -> list[dict]:
+        """Mirrored clients; `fresh` resyncs first (e.g. for up to date geometry)"""
+        if fresh:
+            self.state.resync()
+        return self.state.clients()
 
     def windows_and_counts(self) -> dict[str, int]:
-        counts: dict[str, int] = {}
-        for client in self.data_clients():
-            name = client.get("initialClass") or client.get("class") or ""
-            if not name:
-                continue
-            counts[name] = counts.get(name, 0) + 1
-        return counts
+        return self.state.class_counts()
 
     def data_monitors(self) -> Dict[int, Dict[str, Any]]:
-        raw = self._send_json("j/monitors")
-        if not isinstance(raw, list):
+        raw = self.state.monitors()
+        if not raw:
             return {}
         monitors: Dict[int, Dict[str, Any]] = {}
         for m in raw:
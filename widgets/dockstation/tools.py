@@ -1,10 +1,12 @@
 from typing import TYPE_CHECKING, Literal, Optional, Dict, Any, Tuple
-from fabric.hyprland import Hyprland
 from fabric.utils.helpers import GLib
 from fabric.widgets.box import Box
 
 from .modules.anchors import ANCH_DICT
 
+# events after which monitor geometry may differ
+MONITOR_EVENTS = ("monitoradded", "monitoraddedv2", "monitorremoved", "configreloaded")
+
 if TYPE_CHECKING:
     from .dock import DockStation
 
@@ -15,9 +17,11 @@ class DockStationTools:
         self.is_hidden = True
         self._hide_timeout: Optional[int] = None
         self._hover_timeout: Optional[int] = None
-        self.hypr = Hyprland()
         self.is_hover = False
         self.anchor_position_dict = ANCH_DICT
+        # monitor id -> dock rect; monitors change rarely, the active window often
+        self._dock_rects: Dict[int, Tuple[int, int, int, int]] = {}
+        self._dock_thickness: Optional[Tuple[int, int]] = None
 
     def _cancel_hide(self):
         if self._hide_timeout:
@@ -99,6 +103,25 @@ class DockStationTools:
         )
 
     def _get_dock_rect(self, monitor_id: int) -> Tuple[int, int, int, int]:
+        rect = self._dock_rects.get(int(monitor_id))
+        if rect is None:
+            rect = self._compute_dock_rect(monitor_id)
+            # nothing to cache until the mirror knows the monitors
+            if self.dockstation.hypr.state.monitors():
+                self._dock_rects[int(monitor_id)] = rect
+        return rect
+
+    def invalidate_dock_rects(self, *_) -> None:
+        self._dock_rects.clear()
+
+    def _on_main_box_allocated(self, *_) -> None:
+        # the dock rect depends on the box thickness (icon size, item count)
+        thickness = self._get_main_box_size()
+        if thickness != self._dock_thickness:
+            self._dock_thickness = thickness
+            self._dock_rects.clear()
+
+    def _compute_dock_rect(self, monitor_id: int) -> Tuple[int, int, int, int]:
         mons = self.dockstation.hypr.data_monitors()
         mon = mons.get(int(monitor_id)) if mons else None
         if not mon:
@@ -156,8 +179,7 @@ class DockStationTools:
             w_h = int(w.get("height", w.get("h", 0)) or 0)
         return x, y, w_w, w_h
 
-    def _check_and_toggle(self):
-        aw = self.dockstation.hypr.data_activewindow()
+    def _check_and_toggle(self, aw: dict):
         if not aw:
             self.toggle("show")
             return
@@ -174,15 +196,29 @@ class DockStationTools:
         self.toggle("hide")
 
     def auto_hide(self) -> None:
-        def check(*_):
+        hypr = self.dockstation.hypr
+
+        def on_active_window(aw: dict):
             try:
-                self._check_and_toggle()
+                self._check_and_toggle(aw)
             except Exception:
-                if self.dockstation.hypr.data_activewindow() != {}:
-                    self.toggle("hide")
+                self.toggle("hide" if aw else "show")
 
-                else:
-                    self.toggle("show")
+        def check(*_):
+            if hypr.state.active_address() is None:
+                on_active_window({})
+                return
+            aw = hypr.state.active_client()
+            # floating windows move without events: only they need live geometry,
+            # and a window opened since the last resync has none in the mirror
+            if aw is None or aw.get("floating") is not False:
+                hypr.data_activewindow(on_active_window)
+                return
+            on_active_window(aw)
+
+        hypr.events.subscribe_many(MONITOR_EVENTS, self.invalidate_dock_rects)
+        hypr.state.monitors_changed.connect(self.invalidate_dock_rects)
+        self.dockstation.main_box.connect("size-allocate", self._on_main_box_allocated)
 
         events = [
             "activewindowv2",
@@ -190,8 +226,10 @@ class DockStationTools:
             "openwindow",
             "closewindow",
         ]
-        for e in events:
-            self.dockstation.hypr.hyprctl.connect(f"event::{e}", check)
+        # one decision per frame however many of these a burst contains
+        self.dockstation.hypr.events.subscribe_coalesced(
+            events, check, widget=self.dockstation, name="DockStationTools.auto_hide"
+        )
 
         GLib.idle_add(check)
 
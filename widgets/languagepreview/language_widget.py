@@ -4,9 +4,7 @@ from fabric.utils.helpers import GLib
 from fabric.widgets.box import Box
 from fabric.widgets.label import Label
 from fabric.widgets.wayland import WaylandWindow as Window
-from fabric.hyprland.service import Hyprland, HyprlandEvent
-from fabric.hyprland.widgets import HyprlandLanguage
-from .hypr_state import HyprState
+from services.hyprland_keyboard import KeyboardState, norm
 from .config import ConfigHandlerLanguagePreview
 
 config_handler = ConfigHandlerLanguagePreview()
@@ -34,9 +32,7 @@ else:
             self.replacer = {
                 k.lower(): v for k, v in (self.confh.config["replacer"] or {}).items()
             }
-            self.hypr = Hyprland()
-            self.hypr_language = HyprlandLanguage()
-            self.state = HyprState(self.hypr)
+            self.keyboard = KeyboardState()
             self._hide_timeout_id: int | None = None
             self._call_id: int = 0
             self._last_active_value: str | None = None
@@ -56,26 +52,7 @@ else:
                 v_align="center",
             )
             self.items: dict[str, tuple[Box, Label, Label]] = {}
-            short_raw_list = self.state.get_layouts()
-            short_codes = [self.state.norm(s) for s in short_raw_list]
-            self.full_map = self.state.build_fullname_map(
-                short_raw_list, self.default_fullnames
-            )
-            for raw, code in zip(short_raw_list, short_codes):
-                short_text = self.replacer.get(code, code)
-                short_lbl = Label(label=short_text, name=f"lp-short-{code}")
-                pretty_fallback = raw.strip().replace("_", " ").title()
-                full_text = (
-                    self.full_map.get(code)
-                    or self.default_fullnames.get(code)
-                    or pretty_fallback
-                )
-                full_lbl = Label(label=full_text, name=f"lp-full-{code}")
-                wrapper = Box(name=f"lp-item-{code}", orientation="v")
-                wrapper.add(short_lbl)
-                wrapper.add(full_lbl)
-                self.items[code] = (wrapper, short_lbl, full_lbl)
-                self.result_box.add(wrapper)
+            self.full_map: dict[str, str] = {}
             self.lang_box.add(self.result_box)
             super().__init__(
                 name="language-preview",
@@ -88,9 +65,22 @@ else:
                 h_align="center",
                 child=self.lang_box,
             )
-            self.hypr_language.layout_changed.connect(self.on_layout_change)
-            # self.hypr_language.connect("notify::language", self.on_layout_change)
+            self.keyboard.layout_changed.connect(self.on_layout_change)
+            self.keyboard.changed.connect(lambda *_: self._rebuild_items())
             self.hide()
+            if self.keyboard.ready:
+                self._rebuild_items()
+
+        def on_config_reload(self) -> bool:
+            self.default_fullnames = self.confh.config["default-fullnames"]
+            self.replacer = {
+                k.lower(): v for k, v in (self.confh.config["replacer"] or {}).items()
+            }
+            self.margin = self.confh.config["margin"]
+            self.layer = self.confh.config["layer"]
+            self.anchor = self.confh.config["anchor"]
+            self._rebuild_items()
+            return True
 
         def _set_label_text(self, lbl: Label, text: str) -> None:
             for setter in (
@@ -115,11 +105,9 @@ else:
 
             self.items = {}
 
-            short_raw_list = self.state.get_layouts()
-            short_codes = [self.state.norm(s) for s in short_raw_list]
-            self.full_map = self.state.build_fullname_map(
-                short_raw_list, self.default_fullnames
-            )
+            short_raw_list = self.keyboard.layouts()
+            short_codes = [norm(s) for s in short_raw_list]
+            self.full_map = self.keyboard.fullname_map(self.default_fullnames)
 
             for raw, code in zip(short_raw_list, short_codes):
                 short_text = self.replacer.get(code, code)
@@ -213,14 +201,14 @@ else:
             return max(base_score, alias_score)
 
         def update_active(self, active_raw: str | None) -> None:
-            current_layouts_raw = self.state.get_layouts()
-            current_layouts_norm = [self.state.norm(s) for s in current_layouts_raw]
+            current_layouts_raw = self.keyboard.layouts()
+            current_layouts_norm = [norm(s) for s in current_layouts_raw]
 
             if set(current_layouts_norm) != set(self.items.keys()):
                 self._rebuild_items()
 
-            current_full = active_raw or self.state.get_active_keymap()
-            current_norm = self.state.norm(current_full)
+            current_full = active_raw or self.keyboard.active_keymap()
+            current_norm = norm(current_full)
 
             best_locale = None
             best_score = 0
@@ -269,7 +257,7 @@ else:
                 active_value = None
 
             now = time.monotonic()
-            active_norm = self.state.norm(active_value if active_value else "")
+            active_norm = norm(active_value if active_value else "")
 
             if (
                 active_norm
@@ -281,8 +269,8 @@ else:
                 return False
 
             self._last_event_ts = now
-            self._last_active_value = active_norm or self.state.norm(
-                self.state.get_active_keymap()
+            self._last_active_value = active_norm or norm(
+                self.keyboard.active_keymap()
             )
 
             self._call_id += 1
@@ -3,7 +3,11 @@ from utils.constants import Const
 
 
 class ConfigHandlerNotification(ConfigurationHandler):
+    config_keys = ("widgets.notification",)
+
     def __init__(self):
         super().__init__()
+        self.reload()
 
+    def reload(self) -> None:
         self.config = self.get_option("widgets.notification")
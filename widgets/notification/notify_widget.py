@@ -36,3 +36,10 @@ else:
                 all_visible=True,
                 child=self.main_box,
             )
+
+        def on_config_reload(self) -> bool:
+            # everything else is read from confh.config per notification
+            self.margin = self.confh.config["margin"]
+            self.anchor = self.confh.config["anchor"]
+            self.layer = self.confh.config["layer"]
+            return True
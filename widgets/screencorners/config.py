@@ -2,7 +2,12 @@ from utils.configuration_handler import ConfigurationHandler
 
 
 class ConfigHandlerScreenCorners(ConfigurationHandler):
+    config_keys = ("widgets.screencorners", "widgets.statusbar")
+
     def __init__(self):
         super().__init__()
+        self.reload()
+
+    def reload(self) -> None:
         self.config = self.get_option("widgets.screencorners")
         self.config_statusbar = self.get_option("widgets.statusbar")
@@ -22,28 +22,42 @@ else:
                 exclusivity=self.exclusivity_handler(),
                 style="background: none;",
                 pass_through=True,
-                child=Box(
-                    orientation="v",
-                    children=[
-                        Box(
-                            children=[
-                                self.make_corner("top-left"),
-                                Box(h_expand=True),
-                                self.make_corner("top-right"),
-                            ]
-                        ),
-                        Box(v_expand=True),
-                        Box(
-                            children=[
-                                self.make_corner("bottom-left"),
-                                Box(h_expand=True),
-                                self.make_corner("bottom-right"),
-                            ]
-                        ),
-                    ],
-                ),
+                child=self._make_corners(),
             )
 
+        def _make_corners(self) -> Box:
+            return Box(
+                orientation="v",
+                children=[
+                    Box(
+                        children=[
+                            self.make_corner("top-left"),
+                            Box(h_expand=True),
+                            self.make_corner("top-right"),
+                        ]
+                    ),
+                    Box(v_expand=True),
+                    Box(
+                        children=[
+                            self.make_corner("bottom-left"),
+                            Box(h_expand=True),
+                            self.make_corner("bottom-right"),
+                        ]
+                    ),
+                ],
+            )
+
+        def on_config_reload(self) -> bool:
+            """Corner size and exclusivity (follows the statusbar) are applied in place."""
+            old = self.get_child()
+            if old is not None:
+                self.remove(old)
+                old.destroy()
+            self.add(self._make_corners())
+            self.exclusivity = self.exclusivity_handler()
+            self.show_all()
+            return True
+
         def make_corner(self, orientation) -> Box:
             return Box(
                 h_expand=False,
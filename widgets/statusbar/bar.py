@@ -21,16 +21,41 @@ else:
                 layer="top",
                 anchor=self.confh.anchor(),
                 exclusivity="auto",
-                style="background:none;" if self.confh.config["transparent"] else "",
+                style=self._style(),
                 margin=self.confh.config["margin"],
-                child=CenterBox(
-                    name="statusbar-layouts",
-                    orientation=self.confh.orientation,  # type: ignore
-                    start_children=self.modules.start_modules(),
-                    center_children=self.modules.center_modules(),
-                    end_children=self.modules.end_modules(),
-                ),
+                child=self._make_layouts(),
                 style_classes="statusbar-vertical"
                 if self.confh.orientation == "v"
                 else "",
             )
+
+        def _style(self) -> str:
+            return "background:none;" if self.confh.config["transparent"] else ""
+
+        def _make_layouts(self) -> CenterBox:
+            return CenterBox(
+                name="statusbar-layouts",
+                orientation=self.confh.orientation,  # type: ignore
+                start_children=self.modules.start_modules(),
+                center_children=self.modules.center_modules(),
+                end_children=self.modules.end_modules(),
+            )
+
+        def on_config_reload(self) -> bool:
+            """Rebuild the module layout in place from the reloaded config."""
+            old = self.get_child()
+            self.modules = ModuleManager(self)
+            if old is not None:
+                self.remove(old)
+                old.destroy()
+            self.add(self._make_layouts())
+
+            self.anchor = self.confh.anchor()
+            self.margin = self.confh.config["margin"]
+            self.set_style(self._style())
+            if self.confh.orientation == "v":
+                self.add_style_class("statusbar-vertical")
+            else:
+                self.remove_style_class("statusbar-vertical")
+            self.show_all()
+            return True
@@ -2,9 +2,13 @@ from utils.configuration_handler import ConfigurationHandler
 
 
 class ConfigHandlerStatusBar(ConfigurationHandler):
+    config_keys = ("widgets.statusbar",)
+
     def __init__(self):
         super().__init__()
+        self.reload()
 
+    def reload(self) -> None:
         self.config = self.get_option("widgets.statusbar")
         self.config_modules = self.config["modules"]
         self.orientation = "v" if self.is_vertical() else "h"
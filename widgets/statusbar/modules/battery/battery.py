@@ -5,6 +5,8 @@ from fabric.widgets.svg import Svg
 from .battery_svg_draw import BatteryHelper
 from fabric.utils.helpers import idle_add
 from fabric.widgets.eventbox import EventBox
+from services.theme import ThemeService
+from utils.widget_utils import connect_while_alive
 
 if TYPE_CHECKING:
     from ...bar import StatusBar
@@ -25,11 +27,15 @@ class BatteryWidget(Box):
         if self.confh.is_vertical():
             self.add_style_class("statusbar-battery-vertical")
 
-        self.battery_helper = BatteryHelper()
+        self.battery_helper = BatteryHelper(self)
         self.battery_cfg = self.confh.config_modules["battery"]
 
         idle_add(self.update)
-        self.battery_helper.battery_service.changed.connect(self.update)
+        connect_while_alive(
+            self, self.battery_helper.battery_service, "changed", self.update
+        )
+        # connected after BatteryHelper's handler, so current_svg is already redrawn
+        connect_while_alive(self, ThemeService(), "colors-changed", self.update)
 
     def update(self):
         percent = int(
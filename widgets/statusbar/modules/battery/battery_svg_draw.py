@@ -1,13 +1,21 @@
 from typing import Optional
 from utils.colors_parse import colors
 from services.battery import BatteryService, DeviceState
+from services.theme import ThemeService
+from utils.widget_utils import connect_while_alive
 
 
 class BatteryHelper:
-    def __init__(self) -> None:
+    def __init__(self, owner) -> None:
+        # `owner` is the widget whose destruction ends the subscriptions
         self.current_svg: Optional[str] = None
         self.battery_service = BatteryService()
-        self.battery_service.changed.connect(self.on_battery_changed)
+        connect_while_alive(
+            owner, self.battery_service, "changed", self.on_battery_changed
+        )
+        connect_while_alive(
+            owner, ThemeService(), "colors-changed", self.on_battery_changed
+        )
         self.update_svg()
 
     def battery_svg(self, battery_percent: int) -> str:
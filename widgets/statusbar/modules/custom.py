@@ -1,10 +1,10 @@
 import shlex
-from fabric.utils.helpers import exec_shell_command_async, GLib
+from fabric.utils.helpers import exec_shell_command_async
 from fabric.widgets.box import Box
 from fabric.widgets.label import Label
 from fabric.widgets.button import Button
 from typing import TYPE_CHECKING
-from utils.widget_utils import setup_cursor_hover
+from utils.widget_utils import setup_cursor_hover, timeout_while_alive
 
 if TYPE_CHECKING:
     from ..bar import StatusBar
@@ -122,6 +122,6 @@ class CustomWidget(Box):
         update_label()
 
         if has_placeholder and cmd and interval > 0:
-            GLib.timeout_add_seconds(interval, update_label)
+            timeout_while_alive(self, interval, update_label, seconds=True)
 
         self.show_all()
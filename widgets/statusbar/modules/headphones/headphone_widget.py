@@ -6,7 +6,7 @@ from fabric.widgets.svg import Svg
 from services.audio_status_provider import AudioStatusProvider
 from services.headset import HeadsetService
 from fabric.audio.service import Audio
-from utils.widget_utils import setup_cursor_hover
+from utils.widget_utils import connect_while_alive, setup_cursor_hover
 from .icon_handler import HeadphoneIoncs
 from .status import HeadphoneStatus
 
@@ -32,12 +32,11 @@ class HeadphoneWidget(Box):
         self.icon_handler = HeadphoneIoncs(self)
         self.svg: Optional[Svg] = None
         idle_add(self._refresh)
-        self.headset.changed.connect(lambda *a, **k: idle_add(self._refresh))
-        self.provider.changed.connect(lambda *a, **k: idle_add(self._refresh))
+        refresh = lambda *a, **k: idle_add(self._refresh)  # noqa: E731
+        connect_while_alive(self, self.headset, "changed", refresh)
+        connect_while_alive(self, self.provider, "changed", refresh)
         if hasattr(self.audio, "microphone_changed"):
-            self.audio.microphone_changed.connect(
-                lambda *a, **k: idle_add(self._refresh)
-            )
+            connect_while_alive(self, self.audio, "microphone-changed", refresh)
 
     def _refresh(self):
         for child in list(self.get_children()):
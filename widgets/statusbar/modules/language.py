@@ -1,11 +1,9 @@
-from utils.jsonc import jsonc
-from fabric.hyprland.widgets import HyprlandLanguage
 from fabric.widgets.box import Box
 from fabric.widgets.label import Label
 from fabric.widgets.button import Button
 
-from fabric.utils.helpers import exec_shell_command_async, exec_shell_command
-from utils.widget_utils import setup_cursor_hover, merge
+from services.hyprland_keyboard import KeyboardState
+from utils.widget_utils import connect_while_alive, setup_cursor_hover, merge
 
 from typing import TYPE_CHECKING
 
@@ -48,30 +46,25 @@ class LanguageWidget(Box):
         setup_cursor_hover(self.button, "pointer")
         self.children = [self.button]
 
-        self.kb_devices = self.get_keyboard_devices()
-        self.hlanguage = HyprlandLanguage()
+        self.keyboard = KeyboardState()
 
         self._on_language_switch()
-        self.hlanguage.layout_changed.connect(self._on_language_switch)
-
-    def get_keyboard_devices(self):
-        try:
-            out = exec_shell_command("hyprctl devices -j")
-            kb = jsonc.loads(f"{out}").get("keyboards", [])
-            return [d["name"] for d in kb]
-        except Exception:
-            return []
+        connect_while_alive(
+            self, self.keyboard, "layout-changed", self._on_language_switch
+        )
+        connect_while_alive(
+            self, self.keyboard, "changed", lambda *_: self._on_language_switch()
+        )
 
     def on_clicked(self, *args):
-        self._on_language_switch()
-        for device in self.kb_devices:
-            exec_shell_command_async(f"hyprctl switchxkblayout {device} next")
+        # the label follows from the resulting activelayout event
+        self.keyboard.switch_next()
 
     def _on_language_switch(self, *args):
         if len(args) >= 2:
             lang = args[1]
         else:
-            lang = self.hlanguage.get_label()  # fallback
+            lang = self.keyboard.active_keymap()  # fallback
 
         lang = self.replace_map.get(lang, lang)
 
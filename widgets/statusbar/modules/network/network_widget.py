@@ -7,12 +7,13 @@ from fabric.widgets.box import Box
 from fabric.widgets.button import Button
 from fabric.widgets.svg import Svg
 from fabric.widgets.label import Label
-from fabric.utils import GLib, idle_add, exec_shell_command_async
+from fabric.utils import idle_add, exec_shell_command_async
 
 from services.network import NetworkService, NM  # type: ignore
 from .network_indicator_handler import NetworkIndicatorHandler
 from .network_utils import check_internet, setup_cursor_hover, get_network_info_str
 from utils.constants import Const
+from utils.widget_utils import connect_while_alive, timeout_while_alive
 
 if TYPE_CHECKING:
     from ...bar import StatusBar
@@ -64,7 +65,10 @@ class NetworkWidget(Box):
         )
         setup_cursor_hover(self.btn)
         self.add(self.btn)
-        self.network_service.device_ready.connect(self._on_device_ready)
+        connect_while_alive(
+            self, self.network_service, "device-ready", self._on_device_ready
+        )
+        self.connect("destroy", self._on_destroy)
 
     # ---------------- Device Handlers ----------------
     def _on_device_ready(self, *_):
@@ -72,12 +76,15 @@ class NetworkWidget(Box):
         wifi_device = self.network_service.wifi_device._device  # type: ignore
         if not client or not wifi_device:
             return
-        client.connect("notify::wireless-enabled", self._wifi_enabled_handler)
-        client.connect("notify::primary-connection", self._primary_device_handler)
-        client.connect("notify::connectivity", self._internet_connection_handler)
-        wifi_device.connect("notify::state", self._device_state_handler)
-        wifi_device.connect("notify::active-access-point", self._on_active_ap_change)
-        GLib.timeout_add_seconds(3, self._periodic_internet_check)
+        for obj, signal, handler in (
+            (client, "notify::wireless-enabled", self._wifi_enabled_handler),
+            (client, "notify::primary-connection", self._primary_device_handler),
+            (client, "notify::connectivity", self._internet_connection_handler),
+            (wifi_device, "notify::state", self._device_state_handler),
+            (wifi_device, "notify::active-access-point", self._on_active_ap_change),
+        ):
+            connect_while_alive(self, obj, signal, handler)
+        timeout_while_alive(self, 3, self._periodic_internet_check, seconds=True)
 
         # Initial update
         self._wifi_enabled_handler(client, None)
@@ -85,6 +92,14 @@ class NetworkWidget(Box):
         self._internet_connection_handler(client, None)
         self._on_active_ap_change(wifi_device)
 
+    def _on_destroy(self, *_):
+        if getattr(self, "_ap_signal", None):
+            try:
+                self._ap.disconnect(self._ap_signal)
+            except Exception:
+                pass
+            self._ap_signal = None
+
     def _device_state_handler(self, device, _pspec):
         self._schedule_internet_check()
         self._schedule_update()
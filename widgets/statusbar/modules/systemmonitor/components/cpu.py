@@ -1,10 +1,10 @@
 import psutil
-from gi.repository import GLib  # type: ignore
 from fabric.widgets.box import Box
 from fabric.widgets.stack import Stack
 from fabric.widgets.label import Label
 from fabric.widgets.circularprogressbar import CircularProgressBar
 from fabric.widgets.revealer import Revealer
+from utils.widget_utils import timeout_while_alive
 
 
 class Cpu(Box):
@@ -48,7 +48,7 @@ class Cpu(Box):
 
         self.children = Stack(children=cpu_box)
 
-        GLib.timeout_add(100, self._update_cpu)
+        timeout_while_alive(self, 100, self._update_cpu)
 
     def _update_cpu(self):
         percent = psutil.cpu_percent(interval=None)
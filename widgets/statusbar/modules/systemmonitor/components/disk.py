@@ -1,10 +1,10 @@
 import psutil
-from gi.repository import GLib  # type: ignore
 from fabric.widgets.box import Box
 from fabric.widgets.stack import Stack
 from fabric.widgets.label import Label
 from fabric.widgets.circularprogressbar import CircularProgressBar
 from fabric.widgets.revealer import Revealer
+from utils.widget_utils import timeout_while_alive
 
 
 class Disk(Box):
@@ -47,7 +47,8 @@ class Disk(Box):
         )
         self.children = Stack(children=disk_box)
 
-        GLib.timeout_add(10000, self._update_disk)  # Обновляем раз в 10 секунд
+        # Обновляем раз в 10 секунд
+        timeout_while_alive(self, 10000, self._update_disk)
 
     def _update_disk(self):
         usage = psutil.disk_usage(self.path)
@@ -1,10 +1,10 @@
 import psutil
-from gi.repository import GLib  # type: ignore
 from fabric.widgets.box import Box
 from fabric.widgets.stack import Stack
 from fabric.widgets.label import Label
 from fabric.widgets.circularprogressbar import CircularProgressBar
 from fabric.widgets.revealer import Revealer
+from utils.widget_utils import timeout_while_alive
 
 
 class Ram(Box):
@@ -47,7 +47,7 @@ class Ram(Box):
 
         self.children = Stack(children=ram_box)
 
-        GLib.timeout_add(1000, self._update_ram)
+        timeout_while_alive(self, 1000, self._update_ram)
 
     def _update_ram(self):
         mem = psutil.virtual_memory()
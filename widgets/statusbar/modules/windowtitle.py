@@ -4,7 +4,8 @@ from types import SimpleNamespace
 from fabric.widgets.box import Box
 from fabric.widgets.image import Image
 from fabric.widgets.label import Label
-from fabric.hyprland.service import Hyprland, HyprlandEvent
+from fabric.hyprland.service import HyprlandEvent
+from services.hyprland_events import HyprlandEventHub
 from fabric.utils.helpers import idle_add
 
 from shared.app_icon import AppIcon
@@ -49,7 +50,7 @@ class WindowTitleWidget(Box):
             size=self.conf_icon_size,
         )
 
-        def on_active_window(_, event: HyprlandEvent):
+        def on_active_window(event: HyprlandEvent):
             raw_class = event.data[0]
             raw_title = event.data[1]
 
@@ -62,11 +63,16 @@ class WindowTitleWidget(Box):
                 size=self.conf_icon_size,
             )
 
-        self.hypr = Hyprland()
-        self.hypr.connect("event::activewindow", callback=on_active_window)
+        # only the latest focus change of a burst is worth rendering
+        HyprlandEventHub().subscribe_coalesced(
+            ["activewindow"],
+            lambda events: on_active_window(events[-1]),
+            widget=self,
+            name="WindowTitleWidget",
+        )
 
         dummy_event = SimpleNamespace(data=["", ""])
-        idle_add(lambda: on_active_window(None, dummy_event))  # type: ignore
+        idle_add(lambda: on_active_window(dummy_event))  # type: ignore
 
         self.show_all()
 
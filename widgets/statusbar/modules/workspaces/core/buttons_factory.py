@@ -3,9 +3,9 @@ from fabric.hyprland.widgets import WorkspaceButton
 from utils.widget_utils import setup_cursor_hover
 from fabric.widgets.label import Label
 from fabric.widgets.box import Box
-from fabric.hyprland import Hyprland
+from services.hyprland_events import HyprlandEventHub
+from services.hyprland_query import HyprlandQuery
 from fabric.utils import GLib
-import json
 
 
 class ButtonsFactory:
@@ -29,7 +29,8 @@ class ButtonsFactory:
         self.magic_icon = magic_icon
         self.bind_preview = bind_preview
         self.magic_button: Optional[Box] = None
-        self.hypr = Hyprland(commands_only=False)
+        self.events = HyprlandEventHub()
+        self.query = HyprlandQuery()
 
         if self.magic_enabled:
             self._init_magic_button()
@@ -46,29 +47,34 @@ class ButtonsFactory:
         )
         if self.bind_preview:
             self.bind_preview(self.magic_button)
-        if not self._magic_has_windows():
-            self.magic_button.hide()
+        self.magic_button.hide()
+        self._update_magic_visibility()
 
     def _connect_events(self) -> None:
-        for ev in (
-            "workspace",
-            "activewindow",
-            "closewindow",
-            "openwindow",
-            "movewindow",
-            "focusedmon",
-        ):
-            self.hypr.connect(f"event::{ev}", self._on_event)
-
-    def _on_event(self, *_):
-        GLib.idle_add(self._update_magic_visibility)
+        self.events.subscribe_coalesced(
+            (
+                "workspace",
+                "activewindow",
+                "closewindow",
+                "openwindow",
+                "movewindow",
+                "focusedmon",
+            ),
+            lambda _events: self._update_magic_visibility(),
+            widget=self.magic_button,
+            name="ButtonsFactory.magic",
+        )
 
     def _update_magic_visibility(self) -> bool:
         if not self.magic_button:
             return False
-        self.magic_button.set_visible(self._magic_has_windows())
+        self.query.query("j/workspaces", self._on_workspaces)
         return False
 
+    def _on_workspaces(self, workspaces) -> None:
+        if self.magic_button:
+            self.magic_button.set_visible(self._magic_has_windows(workspaces))
+
     def label_for(self, i: int) -> str:
         if i < 0:
             return str(self.magic_icon)
@@ -76,12 +82,9 @@ class ButtonsFactory:
             return ""
         return self.numbering[i - 1] if i - 1 < len(self.numbering) else str(i)
 
-    def _magic_has_windows(self) -> bool:
+    def _magic_has_windows(self, workspaces) -> bool:
         try:
-            reply = Hyprland.send_command("j/workspaces")
-            if not reply.reply:
-                return False
-            for ws in json.loads(reply.reply.decode()):
+            for ws in workspaces or []:
                 if (
                     ws.get("id") == -98
                     and ws.get("windows", 0) > 0
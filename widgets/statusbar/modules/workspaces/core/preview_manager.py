@@ -1,6 +1,5 @@
 from typing import TYPE_CHECKING, Optional, Literal
 from fabric.utils.helpers import GLib
-from fabric.hyprland.service import Hyprland
 
 from ..modules.preview import WorkspacesPreview
 
@@ -33,7 +32,6 @@ class PreviewManager:
 
         self.confh = workspaces_widget.confh
 
-        self.hypr = Hyprland()
         self.popup: Optional[WorkspacesPreview] = None
 
         if enabled: